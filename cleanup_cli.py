@@ -0,0 +1,159 @@
+# cleanup_cli.py
+"""
+Headless prefix cleanup, sharing the engine behind the Cleanup tab.
+
+Usage:
+    python -m cleanup_cli PATH [PATH ...] [--category "Audio Prefixes"] [--prefix BP_] [--delete] [--json]
+
+Without --delete this is a dry run that only reports what would be removed.
+This module must not import tkinter (or anything that does) so it starts fast and runs without a display.
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.constants import PREFIXES
+from utils.cleanup_engine import ScanWorker, DeleteWorker, format_size, plan_deletion
+from utils.scan_index import ScanIndex
+
+
+def drain(worker_queue):
+    """Returns every message currently in a worker's queue."""
+    messages = []
+    while not worker_queue.empty():
+        messages.append(worker_queue.get_nowait())
+    return messages
+
+
+def process_root(root, prefixes, delete=False, index=None, rebuild=False):
+    """Scans one root and optionally deletes what matched. Returns a JSON-friendly result dict."""
+    result = {
+        "root": root,
+        "scanned_files": 0,
+        "assets": [],
+        "total_files": 0,
+        "total_size": 0,
+        "errors": [],
+        "deleted": 0,
+        "removed_folders": [],
+        "failed": [],
+        "pruned_folders": 0
+    }
+    if not os.path.isdir(root):
+        result["errors"].append(f"Not a folder: {root}")
+        return result
+
+    scan_worker = ScanWorker(root, prefixes, index=index, rebuild=rebuild)
+    # Run on this thread, roots are already spread over the pool
+    scan_worker.run()
+
+    directories = {}
+    bundles = []
+    for message in drain(scan_worker.queue):
+        if message[0] == "batch":
+            bundles.extend(message[1])
+        elif message[0] == "error":
+            result["errors"].append(message[1])
+        elif message[0] == "done":
+            result["scanned_files"] = message[2]
+            directories = message[3]
+
+    bundles.sort(key=lambda bundle: bundle["path"])
+    result["assets"] = [
+        {"path": bundle["path"], "prefix": bundle["prefix"], "files": bundle["files"], "size": bundle["size"]}
+        for bundle in bundles
+    ]
+    result["total_files"] = sum(len(bundle["files"]) for bundle in bundles)
+    result["total_size"] = sum(bundle["size"] for bundle in bundles)
+
+    if not delete or not bundles:
+        return result
+
+    subtrees, loose_bundles = plan_deletion(scan_worker.folder_path, bundles, directories)
+    delete_worker = DeleteWorker(scan_worker.folder_path, subtrees, loose_bundles)
+    delete_worker.run()
+    for message in drain(delete_worker.queue):
+        if message[0] == "progress":
+            _, _, _, deleted, failed, removed_dirs = message
+            result["deleted"] += len(deleted) + sum(len(dir_bundles) for _, dir_bundles in removed_dirs)
+            result["removed_folders"].extend(dir_path for dir_path, _ in removed_dirs)
+            result["failed"].extend({"path": bundle["path"], "error": error} for bundle, error in failed)
+        elif message[0] == "done":
+            result["pruned_folders"] = message[2]
+    return result
+
+
+def print_report(result, delete):
+    print(f"{result['root']}")
+    for error in result["errors"]:
+        print(f"  Error: {error}")
+    print(f"  Scanned {result['scanned_files']} files, matched {len(result['assets'])} assets "
+          f"({result['total_files']} files, {format_size(result['total_size'])})")
+    if not delete:
+        for asset in result["assets"]:
+            print(f"  Would delete: {asset['path']} ({len(asset['files'])} files, {format_size(asset['size'])})")
+        return
+    for dir_path in result["removed_folders"]:
+        print(f"  Removed folder: {dir_path}")
+    for failure in result["failed"]:
+        print(f"  Failed to delete {failure['path']}: {failure['error']}")
+    print(f"  Deleted {result['deleted']} assets, {len(result['failed'])} failed, "
+          f"{result['pruned_folders']} empty folders removed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m cleanup_cli",
+        description="Delete prefixed Unreal Engine assets (with their .uexp/.ubulk files) from one or more mod folders."
+    )
+    parser.add_argument("roots", nargs="*", help="Mod folders to clean up. Several folders are processed concurrently.")
+    parser.add_argument("--category", action="append", default=[], help="Prefix category to include (repeatable). See --list-categories.")
+    parser.add_argument("--prefix", action="append", default=[], help="Extra prefix to include (repeatable).")
+    parser.add_argument("--delete", action="store_true", help="Actually delete the matches. Without it this is a dry run.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    parser.add_argument("--workers", type=int, default=4, help="How many folders to process at once (default 4).")
+    parser.add_argument("--no-index", action="store_true", help="Don't use or update the scan index.")
+    parser.add_argument("--full-rescan", action="store_true", help="Rebuild the scan index for these folders.")
+    parser.add_argument("--list-categories", action="store_true", help="List the prefix categories and exit.")
+    parser.add_argument("--verbose", action="store_true", help="Log every deleted file to stderr.")
+    args = parser.parse_args(argv)
+
+    if args.list_categories:
+        for category, prefixes in PREFIXES.items():
+            print(f"{category}: {' '.join(prefixes)}")
+        return 0
+    if not args.roots:
+        parser.error("at least one folder is required")
+
+    unknown = [category for category in args.category if category not in PREFIXES]
+    if unknown:
+        parser.error(f"unknown categories: {', '.join(unknown)} (see --list-categories)")
+
+    # Every category unless narrowed down
+    categories = args.category or list(PREFIXES)
+    prefixes = list(dict.fromkeys([prefix for category in categories for prefix in PREFIXES[category]] + args.prefix))
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format='%(levelname)s - %(message)s')
+
+    index = None if args.no_index else ScanIndex()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        results = list(pool.map(
+            lambda root: process_root(root, prefixes, delete=args.delete, index=index, rebuild=args.full_rescan),
+            args.roots
+        ))
+
+    if args.json:
+        json.dump({"dry_run": not args.delete, "prefixes": prefixes, "results": results}, sys.stdout, indent=4)
+        print()
+    else:
+        for result in results:
+            print_report(result, args.delete)
+
+    return 1 if any(result["errors"] or result["failed"] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
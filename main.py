@@ -1,7 +1,10 @@
 # main.py
 import tkinter as tk
+import multiprocessing
 from app import UEFileDeleterApp
 
 if __name__ == "__main__":
+    # WAV conversion and loudness analysis run on process pools, which need this in the packaged .exe
+    multiprocessing.freeze_support()
     app = UEFileDeleterApp()
     app.mainloop()
\ No newline at end of file
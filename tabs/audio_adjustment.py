@@ -3,9 +3,44 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
 import logging
-import csv
+import queue
+import pathlib
+import webbrowser
 from utils.tooltip import ToolTip
-
+from utils.log_console import LogConsole
+from utils.wwise_ids import load_index
+from utils.rename_engine import AUDIO_EXTENSIONS, RenamePlanWorker, RenameWorker, find_audio_folders
+from utils.rename_planner import plan_renames, rename_no_replace
+from utils.rename_journal import RenameJournal
+from utils.rename_report import RenameReport
+from utils.wwise_search_panel import WwiseSearchPanel
+from utils.loudness_panel import LoudnessPanel
+from utils.duration_panel import DurationPanel
+from utils.media_inventory_panel import MediaInventoryPanel
+from utils.walker import list_dir
+from utils.audio_matcher import MIN_SCORE, MatchWorker, copy_no_replace, plan_copies
+from utils.wav_conform import BIT_DEPTHS, DEFAULT_SPEC, SAMPLE_RATES, ConformWorker
+
+ALL_LANGUAGES = "All Languages"
+
+# Channel choices for the WAV target, None keeps each file's own layout
+CHANNEL_OPTIONS = {"Mono": 1, "Stereo": 2, "Keep": None}
+
+# The search panel falls back to the tables shipped with the tool until other CSVs are selected.
+# Found from this file rather than the working directory, which depends on how the tool was started.
+UTILS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils")
+BUNDLED_CSVS = {
+    "Media": os.path.join(UTILS_DIR, "WWiseAudioMedia.csv"),
+    "Localized": os.path.join(UTILS_DIR, "WWiseAudioLocalizedMedia.csv")
+}
+
+# Wording for the two directions of the rename actions
+RENAME_WORDS = {
+    "rename": {"verb": "rename", "past": "Renamed", "title": "Renaming", "noun": "renaming", "status": "Renaming files..."},
+    "revert": {"verb": "revert", "past": "Reverted", "title": "Reversion", "noun": "reversion", "status": "Reverting file names..."},
+    "undo": {"verb": "undo", "past": "Restored", "title": "Undo", "noun": "undo", "status": "Undoing the last batch..."},
+    "match": {"verb": "copy", "past": "Copied", "title": "Matching", "noun": "matching", "status": "Copying matched files..."}
+}
 class AudioAdjustmentTab(ttk.Frame):
     """
     A tab to assist with audio file renaming and organization.
@@ -18,11 +53,32 @@ class AudioAdjustmentTab(ttk.Frame):
         self.last_media_csv_path = last_media_csv_path
         self.last_localized_csv_path = last_localized_csv_path
         self.file_list = []
-        self.id_to_name_map = {}
-        self.name_to_id_map = {}
+        # Background workers for the plan and rename phases, only one runs at a time
+        self.plan_worker = None
+        self.rename_worker = None
+        self.match_worker = None
+        self.conform_worker = None
+        # The planned renames waiting for the WAV conversion to finish
+        self.pending_moves = []
+        # Where matched replacement files go, {"Media": [folders], "Localized": [folders]}
+        self.match_folders = {}
+        # "rename", "revert", "undo" or "match", picks the wording in RENAME_WORDS
+        self.rename_mode = "rename"
+        # Every batch is journaled so it can be undone without the CSVs
+        self.journal = RenameJournal()
+        # Outcome of every file in the current run, written out as a CSV report when it ends
+        self.rename_report = None
+        self.rename_attempted = 0
+        self.last_report_path = None
         
         # New variable for the dropdown selection
         self.file_type_var = tk.StringVar(value="All")
+        self.language_var = tk.StringVar(value=ALL_LANGUAGES)
+        self.dry_run_var = tk.BooleanVar(value=False)
+        self.conform_var = tk.BooleanVar(value=False)
+        self.rate_var = tk.StringVar(value=str(DEFAULT_SPEC["rate"]))
+        self.bits_var = tk.StringVar(value=str(DEFAULT_SPEC["bits"]))
+        self.channels_var = tk.StringVar(value=next(label for label, count in CHANNEL_OPTIONS.items() if count == DEFAULT_SPEC["channels"]))
 
         self.create_widgets()
 
@@ -63,6 +119,13 @@ class AudioAdjustmentTab(ttk.Frame):
         self.file_type_combobox.pack(side='left', expand=False, padx=(0, 10))
         self.file_type_combobox.set("All")
 
+        # Filled from the Localized folders of the work folder each time the list is opened
+        ttk.Label(options_frame, text="Language:", style='TLabel').pack(side='left', padx=(10, 5))
+        self.language_combobox = ttk.Combobox(options_frame, textvariable=self.language_var, state='readonly', style='TCombobox', postcommand=self.refresh_languages)
+        self.language_combobox['values'] = (ALL_LANGUAGES,)
+        self.language_combobox.pack(side='left', expand=False)
+        ToolTip(self.language_combobox, "Which Localized/<language>/Media folders to process for voice-over files.")
+
         # Media CSV selection frame
         media_csv_frame = ttk.Frame(config_frame, style='TFrame')
         media_csv_frame.pack(fill='x', pady=5)
@@ -103,12 +166,52 @@ class AudioAdjustmentTab(ttk.Frame):
         action_button_frame.pack(pady=5)
 
         # Rename button
-        rename_button = ttk.Button(action_button_frame, text="Rename to Game Files", command=self.start_renaming, style='TButton')
-        rename_button.pack(side='left', padx=5)
+        self.rename_button = ttk.Button(action_button_frame, text="Rename to Game Files", command=self.start_renaming, style='TButton')
+        self.rename_button.pack(side='left', padx=5)
 
         # Revert button
-        revert_button = ttk.Button(action_button_frame, text="Rename to IDs", command=self.start_reverting, style='TButton')
-        revert_button.pack(side='left', padx=5)
+        self.revert_button = ttk.Button(action_button_frame, text="Rename to IDs", command=self.start_reverting, style='TButton')
+        self.revert_button.pack(side='left', padx=5)
+
+        self.undo_button = ttk.Button(action_button_frame, text="Undo Last Batch", command=self.undo_last_batch, style='TButton')
+        self.undo_button.pack(side='left', padx=5)
+        ToolTip(self.undo_button, "Put back the files from the most recent rename batch, using the rename journal instead of the CSVs.")
+
+        # Stops after the file currently being renamed
+        self.cancel_button = ttk.Button(action_button_frame, text="Cancel", command=self.cancel_operation, style='TButton', state='disabled')
+        self.cancel_button.pack(side='left', padx=5)
+
+        self.open_report_button = ttk.Button(action_button_frame, text="Open Report", command=self.open_report, style='TButton', state='disabled')
+        self.open_report_button.pack(side='left', padx=5)
+        ToolTip(self.open_report_button, "Open the CSV report of the last run, listing every file and what happened to it.")
+
+        dry_run_cb = ttk.Checkbutton(action_button_frame, text="Dry Run", variable=self.dry_run_var, style='TCheckbutton')
+        dry_run_cb.pack(side='left', padx=(15, 0))
+        ToolTip(dry_run_cb, "Only preview the renames in the log, including conflicts, without changing any files.")
+
+        # Tools for the user's own audio files
+        replacement_button_frame = ttk.Frame(action_progress_frame, style='TFrame')
+        replacement_button_frame.pack(pady=5)
+
+        self.match_button = ttk.Button(replacement_button_frame, text="Match Replacement Files...", command=self.start_matching, style='TButton')
+        self.match_button.pack(side='left', padx=5)
+        # Target format for the .wav files being renamed
+        conform_cb = ttk.Checkbutton(replacement_button_frame, text="Conform WAVs before renaming:", variable=self.conform_var, style='TCheckbutton')
+        conform_cb.pack(side='left', padx=(15, 5))
+        ToolTip(conform_cb, "Convert every .wav file about to be renamed to this sample rate, bit depth and channel count first, using all CPU cores. Files already in this format are left alone.")
+        rate_combobox = ttk.Combobox(replacement_button_frame, textvariable=self.rate_var, state='readonly', width=7, style='TCombobox')
+        rate_combobox['values'] = SAMPLE_RATES
+        rate_combobox.pack(side='left')
+        ttk.Label(replacement_button_frame, text="Hz", style='TLabel').pack(side='left', padx=(2, 8))
+        bits_combobox = ttk.Combobox(replacement_button_frame, textvariable=self.bits_var, state='readonly', width=3, style='TCombobox')
+        bits_combobox['values'] = BIT_DEPTHS
+        bits_combobox.pack(side='left')
+        ttk.Label(replacement_button_frame, text="bit", style='TLabel').pack(side='left', padx=(2, 8))
+        channels_combobox = ttk.Combobox(replacement_button_frame, textvariable=self.channels_var, state='readonly', width=7, style='TCombobox')
+        channels_combobox['values'] = tuple(CHANNEL_OPTIONS)
+        channels_combobox.pack(side='left')
+
+        ToolTip(self.match_button, f"Pick a folder of loosely named replacement files. Each one is matched to the closest Wwise name and copied into the Media folders as <ID>, matches below {MIN_SCORE:.0%} similarity are only reported.")
 
         # Progress bar and label
         self.progress_bar = ttk.Progressbar(action_progress_frame, orient='horizontal', length=100, mode='determinate', style='Horizontal.text.Green.TProgressbar')
@@ -116,31 +219,62 @@ class AudioAdjustmentTab(ttk.Frame):
         self.progress_bar_label = ttk.Label(action_progress_frame, text="0%", style='TLabel', anchor='center')
         self.progress_bar_label.pack(fill='x')
 
+        # Search and log side by side
+        output_pane = ttk.PanedWindow(glass_box, orient='horizontal')
+        output_pane.pack(fill='both', expand=True, pady=(5, 0))
+
+        # The lookup and analysis tools share one pane as pages
+        tools_notebook = ttk.Notebook(output_pane)
+        output_pane.add(tools_notebook, weight=1)
+
+        # --- Search Section ---
+        search_frame = ttk.Frame(tools_notebook, style='TFrame', padding=(10, 5))
+        tools_notebook.add(search_frame, text="Wwise ID Search")
+
+        self.search_panel = WwiseSearchPanel(search_frame, on_rename=self.rename_from_search)
+        self.search_panel.pack(fill='both', expand=True)
+        self.search_panel.load(self.search_sources())
+
+        # --- Loudness Section ---
+        loudness_frame = ttk.Frame(tools_notebook, style='TFrame', padding=(10, 5))
+        tools_notebook.add(loudness_frame, text="Loudness")
+
+        self.loudness_panel = LoudnessPanel(loudness_frame)
+        self.loudness_panel.pack(fill='both', expand=True)
+
+        # --- Durations Section ---
+        duration_frame = ttk.Frame(tools_notebook, style='TFrame', padding=(10, 5))
+        tools_notebook.add(duration_frame, text="Durations")
+
+        self.duration_panel = DurationPanel(duration_frame, get_folder_indexes=self.audio_folder_indexes)
+        self.duration_panel.pack(fill='both', expand=True)
+
+        # --- Inventory Section ---
+        inventory_frame = ttk.Frame(tools_notebook, style='TFrame', padding=(10, 5))
+        tools_notebook.add(inventory_frame, text="Inventory")
+
+        self.inventory_panel = MediaInventoryPanel(inventory_frame, get_folder_indexes=self.audio_folder_indexes)
+        self.inventory_panel.pack(fill='both', expand=True)
+
         # --- Log Section ---
-        log_frame = ttk.Frame(glass_box, style='TFrame', padding=(10, 5), relief='groove', borderwidth=1)
-        log_frame.pack(fill='both', expand=True, pady=(5, 0))
+        log_frame = ttk.Frame(output_pane, style='TFrame', padding=(10, 5), relief='groove', borderwidth=1)
+        output_pane.add(log_frame, weight=1)
         
         log_title = ttk.Label(log_frame, text="Log", style='TLabel', font=("Helvetica", 12, "bold"))
         log_title.pack(anchor='w', pady=(0, 5))
 
-        self.log_text = tk.Text(log_frame, wrap='word', bg='#2a2a2a', fg='white', relief='flat', state='disabled', font=('Helvetica', 10), insertbackground='white')
-        log_scrollbar = ttk.Scrollbar(log_frame, command=self.log_text.yview)
-        self.log_text['yscrollcommand'] = log_scrollbar.set
-        
-        self.log_text.pack(side='left', fill='both', expand=True)
-        log_scrollbar.pack(side='right', fill='y')
+        # Buffered console, flushes to its Text widget in batches so large runs don't flood Tk
+        self.log_console = LogConsole(log_frame)
+        self.log_console.pack(fill='both', expand=True)
 
     def update_status(self, message):
         """Updates the text of the main application's status bar."""
         if self.status_bar:
             self.status_bar.config(text=message)
 
-    def log_message(self, message):
-        """Appends a message to the log text widget."""
-        self.log_text.configure(state='normal')
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.configure(state='disabled')
+    def log_message(self, message, level="INFO"):
+        """Queues a message for the log console."""
+        self.log_console.write(message, level)
 
     def browse_folder(self):
         folder_selected = filedialog.askdirectory()
@@ -159,6 +293,7 @@ class AudioAdjustmentTab(ttk.Frame):
             if self.root:
                 self.root.save_preferences(media_csv_path=csv_selected)
             self.update_status(f"Media CSV selected: {os.path.basename(csv_selected)}")
+            self.search_panel.load(self.search_sources())
 
     def browse_localized_csv(self):
         csv_selected = filedialog.askopenfilename(
@@ -169,84 +304,210 @@ class AudioAdjustmentTab(ttk.Frame):
             if self.root:
                 self.root.save_preferences(localized_csv_path=csv_selected)
             self.update_status(f"Localized Media CSV selected: {os.path.basename(csv_selected)}")
+            self.search_panel.load(self.search_sources())
+
+    def search_sources(self):
+        """The CSV behind each table of the search panel: the selected one, else the bundled one."""
+        sources = {}
+        for kind, csv_path in (("Media", self.media_csv_path_var.get()), ("Localized", self.localized_csv_path_var.get())):
+            if not (csv_path and os.path.isfile(csv_path)):
+                csv_path = BUNDLED_CSVS[kind]
+            if os.path.isfile(csv_path):
+                sources[kind] = csv_path
+        return sources
+
+    def rename_from_search(self, entry, to_id):
+        """
+        Renames a file the user picks to the name or ID of a search result.
+        The other audio files with the same stem in its folder (.uasset/.uexp/.ubulk) are renamed with it.
+        """
+        kind, name, wwise_id = entry
+        new_stem = wwise_id if to_id else name
 
-    def load_id_map_from_csv(self, file_path):
-        """Loads a map from Wwise ID to Name, assuming CSV format 'Name,Wwise Id'."""
-        id_map = {}
-        id_map_lower = {}
+        # Start in the matching Media folder of the work folder when there is one
+        root_folder = self.folder_path_var.get()
+        initial_dir = root_folder if os.path.isdir(root_folder) else None
+        if initial_dir:
+            for folder, language in find_audio_folders(root_folder):
+                if language is None and kind == "Media":
+                    initial_dir = folder
+                    break
+                if language is not None and kind != "Media" and self.language_var.get() in (ALL_LANGUAGES, language):
+                    initial_dir = folder
+                    break
+
+        file_path = filedialog.askopenfilename(
+            title=f"Choose the file to rename to {new_stem}",
+            initialdir=initial_dir,
+            filetypes=[("Audio assets", " ".join(f"*{extension}" for extension in AUDIO_EXTENSIONS)), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+
+        file_path = os.path.normpath(file_path)
+        folder = os.path.dirname(file_path)
+        stem, extension = os.path.splitext(os.path.basename(file_path))
         try:
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                # Skip the first 7 rows as they are headers based on user feedback
-                for _ in range(7):
-                    next(reader, None)
-                for row in reader:
-                    if len(row) >= 2:
-                        new_name = row[0].strip()
-                        file_id = row[1].strip()
-                        if file_id and new_name:
-                            id_map[file_id] = new_name
-                            id_map_lower[file_id.lower()] = new_name
-            return id_map, id_map_lower
-        except Exception as e:
-            messagebox.showerror("CSV Error", f"Failed to read CSV file: {e}")
-            return None, None
-    
-    def load_name_to_id_map_from_csv(self, file_path):
-        """Loads a map from Name to Wwise ID, assuming CSV format 'Name,Wwise Id'."""
-        name_map = {}
-        name_map_lower = {}
+            names = os.listdir(folder)
+        except OSError as e:
+            messagebox.showerror("Rename Error", f"Could not read {folder}: {e}")
+            return
+
+        moves = [{"src": file_path, "dst": os.path.join(folder, f"{new_stem}{extension}")}]
+        for other_name in names:
+            other_stem, other_extension = os.path.splitext(other_name)
+            if other_stem.lower() == stem.lower() and other_extension.lower() in AUDIO_EXTENSIONS and other_name != os.path.basename(file_path):
+                moves.append({"src": os.path.join(folder, other_name), "dst": os.path.join(folder, f"{new_stem}{other_extension}")})
+
+        ordered, skipped = plan_renames(moves, {folder: names})
+        if skipped:
+            reasons = "\n".join(f"{os.path.basename(move['src'])}: {reason}" for move, reason in skipped)
+            messagebox.showerror("Rename Error", f"Nothing was renamed:\n\n{reasons}")
+            return
+        if not ordered:
+            messagebox.showinfo("Nothing to Rename", f"{os.path.basename(file_path)} is already named {new_stem}.")
+            return
+
+        action = "revert" if to_id else "rename"
+        try:
+            journal_batch = self.journal.start_batch(action)
+        except OSError as e:
+            self.log_message(f"Could not open the rename journal, this rename can't be undone later: {e}", "WARNING")
+            journal_batch = None
+        renamed = 0
         try:
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                # Skip the first 7 rows as they are headers
-                for _ in range(7):
-                    next(reader, None)
-                for row in reader:
-                    if len(row) >= 2:
-                        file_id = row[1].strip()
-                        new_name = row[0].strip()
-                        if file_id and new_name:
-                            if new_name.lower() in name_map_lower:
-                                self.log_message(f"Warning: Found a duplicate name '{new_name}'. Skipping to prevent ambiguous reversion.")
-                                logging.warning(f"Found duplicate name '{new_name}' in CSV. Reversion for this file may not be possible.")
-                                # We do not add the duplicate to the map to avoid ambiguity
-                                continue
-                            name_map[new_name] = file_id
-                            name_map_lower[new_name.lower()] = file_id
-            return name_map, name_map_lower
+            for move in ordered:
+                try:
+                    rename_no_replace(move["src"], move["dst"])
+                except OSError as e:
+                    log_message = f"Failed to rename {move['src']}: {e}"
+                    self.log_message(log_message, "ERROR")
+                    logging.error(log_message)
+                    messagebox.showerror("Rename Error", log_message)
+                    break
+                renamed += 1
+                logging.info(f"Renamed {move['src']} to {os.path.basename(move['dst'])}")
+                if journal_batch is not None:
+                    journal_batch.add(move)
+        finally:
+            if journal_batch is not None:
+                try:
+                    journal_batch.close()
+                except OSError as e:
+                    self.log_message(f"Could not write the rename journal: {e}", "ERROR")
+
+        if renamed:
+            self.log_message(f"Renamed {renamed} files from {stem} to {new_stem} in {folder}")
+            self.update_status(f"Renamed {stem} to {new_stem}.")
+
+    def load_wwise_index(self, file_path):
+        """Loads the shared Wwise ID index for a CSV in 'Name,Wwise Id' format, or returns None if it can't be read."""
+        try:
+            # Parsed once per CSV and reused by renaming and reverting until the file changes
+            index = load_index(file_path)
         except Exception as e:
             messagebox.showerror("CSV Error", f"Failed to read CSV file: {e}")
-            return None, None
+            return None
+        if index.skipped_rows:
+            log_message = f"Warning: Ignored {index.skipped_rows} rows in {os.path.basename(file_path)} whose Wwise Id isn't a number."
+            self.log_message(log_message, "WARNING")
+            logging.warning(log_message)
+        return index
+
+    def log_duplicate_names(self, index):
+        for name, ids in index.duplicate_names.items():
+            log_message = f"Warning: '{name}' is listed for several IDs ({', '.join(ids)}). Files with this name revert to {ids[0]}."
+            self.log_message(log_message, "WARNING")
+            logging.warning(log_message)
     
-    def find_audio_folders(self, root_folder):
-        """
-        Finds the 'Media' and 'Localized/English_US_/Media' subdirectories
-        within the given root folder.
-        """
-        audio_folders = []
-        
-        # Check for the main Media folder
-        media_path = os.path.join(root_folder, "Content", "WwiseAudio", "Media")
-        if os.path.isdir(media_path):
-            audio_folders.append(media_path)
-        
-        # Check for the Localized/Media folder
-        localized_media_path = os.path.join(root_folder, "Content", "WwiseAudio", "Localized", "English_US_", "Media")
-        if os.path.isdir(localized_media_path):
-            audio_folders.append(localized_media_path)
-
-        return audio_folders
-
+    def refresh_languages(self):
+        root_folder = self.folder_path_var.get()
+        languages = [language for _, language in find_audio_folders(root_folder) if language] if os.path.isdir(root_folder) else []
+        self.language_combobox['values'] = (ALL_LANGUAGES, *languages)
+        if self.language_var.get() not in self.language_combobox['values']:
+            self.language_var.set(ALL_LANGUAGES)
 
     def start_renaming(self):
+        self.start_plan(reverting=False)
+
+    def start_reverting(self):
+        self.start_plan(reverting=True)
+
+    def set_busy(self, busy):
+        state = 'disabled' if busy else 'normal'
+        self.rename_button.config(state=state)
+        self.revert_button.config(state=state)
+        self.undo_button.config(state=state)
+        self.match_button.config(state=state)
+        self.cancel_button.config(state='normal' if busy else 'disabled')
+
+    def cancel_operation(self):
+        """Stops the running plan or rename worker."""
+        worker = self.plan_worker or self.match_worker or self.conform_worker or self.rename_worker
+        if worker:
+            worker.cancel()
+            self.cancel_button.config(state='disabled')
+            self.update_status("Cancelling...")
+
+    def selected_audio_folders(self, audio_folders):
+        """Filters find_audio_folders() results by the file type and language selection into (folder, is_localized) pairs."""
+        selected_type = self.file_type_var.get()
+        selected_language = self.language_var.get()
+        wanted_folders = []
+        for folder, language in audio_folders:
+            is_localized_folder = language is not None
+            if selected_type == "Localized (VO)" and not is_localized_folder:
+                continue
+            if selected_type == "Media (Audio)" and is_localized_folder:
+                continue
+            if is_localized_folder and selected_language not in (ALL_LANGUAGES, language):
+                continue
+            wanted_folders.append((folder, is_localized_folder))
+        return wanted_folders
+
+    def load_selected_indexes(self, wanted_folders, reverting=False):
+        """
+        Loads the tables the wanted folders need as {is_localized: WwiseIdIndex}, skipping CSVs that aren't set.
+        Returns None if a CSV couldn't be read.
+        """
+        # Every language uses the same localized table, the IDs are shared between them
+        indexes = {}
+        for is_localized_folder, csv_path in ((False, self.media_csv_path_var.get()), (True, self.localized_csv_path_var.get())):
+            if not any(localized == is_localized_folder for _, localized in wanted_folders):
+                continue
+            if csv_path and os.path.exists(csv_path):
+                index = self.load_wwise_index(csv_path)
+                if index is None:
+                    return None
+                if reverting:
+                    self.log_duplicate_names(index)
+                indexes[is_localized_folder] = index
+        return indexes
+
+    def audio_folder_indexes(self):
+        """
+        The selected audio folders paired with their Wwise ID index (None without a CSV), for the Durations and
+        Inventory pages to tell IDs and names apart. Returns None after showing why there are none.
+        """
+        root_folder = self.folder_path_var.get()
+        if not root_folder or not os.path.isdir(root_folder):
+            messagebox.showerror("Error", "Please select a valid work folder.")
+            return None
+        wanted_folders = self.selected_audio_folders(find_audio_folders(root_folder))
+        if not wanted_folders:
+            messagebox.showinfo("No Folders Found", "Could not find 'Media' or 'Localized/<language>/Media' folders for the selected file type and language.")
+            return None
+        indexes = self.load_selected_indexes(wanted_folders)
+        if indexes is None:
+            return None
+        return [(folder, indexes.get(localized)) for folder, localized in wanted_folders]
+
+    def start_plan(self, reverting):
+        """Checks the inputs and starts listing and matching the audio folders in the background."""
         root_folder = self.folder_path_var.get()
         media_csv_path = self.media_csv_path_var.get()
         localized_csv_path = self.localized_csv_path_var.get()
-        selected_type = self.file_type_var.get()
-        
-        # The list of file extensions to process
-        allowed_extensions = ['.uasset', '.uexp', '.ubulk', '.wav']
+        words = RENAME_WORDS["revert" if reverting else "rename"]
 
         if not root_folder or not os.path.isdir(root_folder):
             messagebox.showerror("Error", "Please select a valid work folder.")
@@ -256,255 +517,443 @@ class AudioAdjustmentTab(ttk.Frame):
             messagebox.showerror("Error", "Please select at least one CSV file to proceed.")
             return
 
-        media_map_lower = {}
-        localized_map_lower = {}
-
-        if media_csv_path and os.path.exists(media_csv_path):
-            _, media_map_lower = self.load_id_map_from_csv(media_csv_path)
-            if media_map_lower is None: return # Stop if loading failed
-        
-        if localized_csv_path and os.path.exists(localized_csv_path):
-            _, localized_map_lower = self.load_id_map_from_csv(localized_csv_path)
-            if localized_map_lower is None: return # Stop if loading failed
-        
         self.update_status("Finding audio folders...")
-        self.log_message("Starting audio file renaming process...")
+        self.log_message(f"Starting audio file {words['noun']} process...")
         
-        audio_folders = self.find_audio_folders(root_folder)
+        audio_folders = find_audio_folders(root_folder)
         
         if not audio_folders:
-            messagebox.showinfo("No Folders Found", "Could not find 'Media' or 'Localized/English_US_/Media' folders within the selected directory. Please ensure you have selected the main 'PAYDAY3' folder.")
-            self.update_status("Renaming cancelled. No audio folders found.")
+            messagebox.showinfo("No Folders Found", "Could not find 'Media' or 'Localized/<language>/Media' folders within the selected directory. Please ensure you have selected the main 'PAYDAY3' folder.")
+            self.update_status(f"{words['title']} cancelled. No audio folders found.")
             return
 
+        # Work out which folders are wanted first, so only the tables they need are loaded
+        wanted_folders = self.selected_audio_folders(audio_folders)
+        indexes = self.load_selected_indexes(wanted_folders, reverting)
+        if indexes is None: return # Stop if loading failed
+
+        # Folders without a table aren't listed at all
+        folder_indexes = [(folder, indexes[localized]) for folder, localized in wanted_folders if indexes.get(localized)]
+        if folder_indexes:
+            self.log_message(f"Processing {len(folder_indexes)} audio folders: " + ", ".join(os.path.relpath(folder, root_folder) for folder, _ in folder_indexes))
+
+        self.rename_mode = "revert" if reverting else "rename"
         self.file_list = []
-        for folder in audio_folders:
-            is_localized_folder = "Localized" in os.path.normpath(folder)
-
-            current_map_lower = None
-            if selected_type == "All":
-                current_map_lower = localized_map_lower if is_localized_folder else media_map_lower
-            elif selected_type == "Localized (VO)" and is_localized_folder:
-                current_map_lower = localized_map_lower
-            elif selected_type == "Media (Audio)" and not is_localized_folder:
-                current_map_lower = media_map_lower
-            
-            if current_map_lower:
-                for file_name in os.listdir(folder):
-                    file_id_raw, extension = os.path.splitext(file_name)
-                    # Strip any leading/trailing whitespace from the file ID
-                    file_id = file_id_raw.strip()
-                    # Check if the file's ID is in the dictionary from the CSV
-                    if file_id.lower() in current_map_lower:
-                        # Now, check if the file's extension is one we should process
-                        if extension.lower() in allowed_extensions:
-                            self.file_list.append({
-                                "path": os.path.join(folder, file_name),
-                                "new_name": current_map_lower[file_id.lower()],
-                                "id": file_id
-                            })
-                        else:
-                            self.log_message(f"Skipped file (extension invalid): {file_name}")
-                    else:
-                        self.log_message(f"Skipped file '{file_name}': ID '{file_id}' not found in the selected CSV map.")
-        
-        total_files = len(self.file_list)
+        self.set_busy(True)
+        self.update_status("Matching audio files...")
+        self.plan_worker = RenamePlanWorker(folder_indexes, reverting)
+        self.plan_worker.start()
+        self.after(100, self.poll_plan_queue)
+
+    def poll_plan_queue(self):
+        """Drains the plan worker's queue, then confirms and starts the renames once the plan is ready."""
+        worker = self.plan_worker
+        finished = None
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == "error":
+                    self.log_message(message[1], "ERROR")
+                    logging.error(message[1])
+                elif kind == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(100, self.poll_plan_queue)
+            return
+
+        _, cancelled, ordered, skipped, match_count, unmapped, other_extensions = finished
+        self.plan_worker = None
+        self.set_busy(False)
+        words = RENAME_WORDS[self.rename_mode]
+
+        if cancelled:
+            self.update_status(f"{words['title']} cancelled.")
+            self.log_message(f"{words['title']} cancelled before any files were changed.", "WARNING")
+            return
+
+        # Per-file outcomes go to the report, the log only gets the totals
+        self.rename_report = RenameReport(self.rename_mode, dry_run=self.dry_run_var.get())
+        self.rename_report.add_paths("skipped-unmapped", unmapped, f"{'Name' if self.rename_mode == 'revert' else 'ID'} not in the CSV")
+        self.rename_report.add_paths("skipped-extension", other_extensions, "Not an audio asset file")
+        self.rename_report.add_move_details("collision", skipped)
+        self.log_message(
+            f"Matched {match_count} files: {len(ordered)} to {words['verb']}, {len(skipped)} conflicts. "
+            f"Ignored {len(unmapped)} files not in the CSV and {len(other_extensions)} of other types."
+        )
+
+        if match_count == 0:
+            self.write_report()
+            messagebox.showinfo("No Files", f"No files to {words['verb']} based on the provided dictionaries and selection.")
+            self.update_status(f"{words['title']} complete. No files were {words['past'].lower()}.")
+            self.log_message(f"{words['title']} complete. No files were found to {words['verb']}.")
+            return
+
+        self.file_list = ordered
+        self.run_rename_plan(ordered, skipped)
+
+    def run_rename_plan(self, ordered, skipped):
+        """
+        Previews or starts a planned batch of renames.
+        Conflicts inside the batch were found up front, so each valid move is a single rename.
+        """
+        words = RENAME_WORDS[self.rename_mode]
+        if skipped:
+            self.log_message(f"{len(skipped)} files conflict with other names and will be skipped, see the report for details.", "WARNING")
+
+        if self.rename_report.dry_run:
+            self.rename_report.add_moves("planned", ordered)
+            self.write_report()
+            summary_message = f"Dry run, no files were changed.\n\n{self.rename_report.summary()}"
+            messagebox.showinfo("Dry Run", summary_message)
+            self.update_status(f"Dry run complete. {len(ordered)} files would be changed.")
+            self.log_message(f"Dry run finished. {len(ordered)} files would be changed, {len(skipped)} conflicts.")
+            return
+
+        total_files = len(ordered)
         if total_files == 0:
-            messagebox.showinfo("No Files", "No files to rename based on the provided dictionaries and selection.")
-            self.update_status("Renaming complete. No files were renamed.")
-            self.log_message("Renaming complete. No files were found to rename.")
+            self.write_report()
+            if skipped:
+                messagebox.showinfo("No Files", f"All {len(skipped)} matching files conflict with other names. See the report for details.")
+            else:
+                messagebox.showinfo("No Files", "All matching files already have the right names.")
+            self.update_status(f"{words['title']} complete. No files were changed.")
             return
 
+        conflict_note = f" {len(skipped)} more conflict with other names and will be skipped." if skipped else ""
         confirmation = messagebox.askyesno(
             "Confirmation",
-            f"Found {total_files} files to rename. Are you sure you want to proceed?"
+            f"Found {total_files} files to {words['verb']}.{conflict_note} Are you sure you want to proceed?"
         )
         if not confirmation:
-            self.update_status("Renaming cancelled.")
-            self.log_message("Renaming cancelled by user.")
+            self.update_status(f"{words['title']} cancelled.")
+            self.log_message(f"{words['title']} cancelled by user.")
+            return
+
+        self.start_conform(ordered)
+
+    def conform_spec(self):
+        return {"rate": int(self.rate_var.get()), "bits": int(self.bits_var.get()), "channels": CHANNEL_OPTIONS[self.channels_var.get()]}
+
+    def start_conform(self, moves):
+        """Converts the .wav files among the planned moves to the WAV target when that is enabled, then renames."""
+        wav_paths = [move["src"] for move in moves if move["src"].lower().endswith(".wav")]
+        if not self.conform_var.get() or not wav_paths:
+            self.start_rename_worker(moves)
             return
 
-        self.update_status("Renaming files...")
+        spec = self.conform_spec()
+        channels = {1: "mono", 2: "stereo", None: "original channels"}[spec["channels"]]
+        self.log_message(f"Converting {len(wav_paths)} WAV files to {spec['rate']} Hz, {spec['bits']}-bit, {channels} before renaming...")
+        self.pending_moves = moves
+        self.update_status("Converting WAV files...")
         self.progress_bar["value"] = 0
         self.progress_bar_label.config(text="0%")
-        if self.root:
-            self.root.update_idletasks()
+        self.set_busy(True)
+        self.conform_worker = ConformWorker(wav_paths, spec)
+        self.conform_worker.start()
+        self.after(100, self.poll_conform_queue)
+
+    def poll_conform_queue(self):
+        """Drains the conversion worker's queue, then renames everything that converted (or needed no conversion)."""
+        worker = self.conform_worker
+        report = self.rename_report
+        finished = None
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    _, done_count, total, converted, _, failed = message
+                    for path, detail in converted:
+                        report.add("converted", path, detail=detail)
+                    for path, error in failed:
+                        report.add("error", path, detail=f"Conversion failed: {error}")
+                        self.log_message(f"Failed to convert {path}: {error}", "ERROR")
+                    progress = done_count / total * 100 if total else 100
+                    self.progress_bar["value"] = progress
+                    self.progress_bar_label.config(text=f"{progress:.0f}%")
+                elif kind == "error":
+                    self.log_message(message[1], "ERROR")
+                    logging.error(message[1])
+                elif kind == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(100, self.poll_conform_queue)
+            return
+
+        _, cancelled = finished
+        self.conform_worker = None
+        self.set_busy(False)
+        moves, self.pending_moves = self.pending_moves, []
+        counts = report.counts()
+        self.log_message(f"Converted {counts['converted']} WAV files, {counts['error']} failed.")
+
+        if cancelled:
+            # Nothing is renamed after a cancel, converted files just keep their new format
+            report.add_moves("not-attempted", moves)
+            self.write_report()
+            self.update_status("Conversion cancelled.")
+            self.log_message("Conversion cancelled, no files were renamed.", "WARNING")
+            return
 
-        renamed_count = 0
-        skipped_count = 0
+        # A file that failed to convert would go into the game in the wrong format, so it keeps its name
+        failed = {row[0] for row in report.rows["error"]}
+        remaining = [move for move in moves if move["src"] not in failed]
+        if not remaining:
+            self.write_report()
+            messagebox.showinfo("No Files", f"Every WAV file failed to convert, no files were renamed.\n\n{report.summary()}")
+            self.update_status("Conversion failed.")
+            return
+        self.start_rename_worker(remaining)
 
-        for i, file_data in enumerate(self.file_list):
+    def start_rename_worker(self, moves, undoes=None, operation=rename_no_replace):
+        words = RENAME_WORDS[self.rename_mode]
+        journal_batch = None
+        # Copies leave the originals where they are, so only renames are journaled
+        if operation is rename_no_replace:
             try:
-                # Add the original extension to the new filename
-                original_extension = os.path.splitext(file_data["path"])[1]
-                new_file_path = os.path.join(os.path.dirname(file_data["path"]), f"{file_data['new_name']}{original_extension}")
-                
-                # Check if the destination file already exists
-                if os.path.exists(new_file_path):
-                    log_message = f"Skipped: {os.path.basename(new_file_path)} already exists."
-                    self.log_message(log_message)
-                    logging.warning(log_message)
-                    skipped_count += 1
-                    continue
-
-                os.rename(file_data["path"], new_file_path)
-                log_message = f"Renamed {file_data['id']}{original_extension} to {os.path.basename(new_file_path)}"
-                renamed_count += 1
-                self.log_message(log_message)
-                logging.info(log_message)
-            except PermissionError as e:
-                log_message = f"Failed to rename {file_data['path']}: Access is denied. The file may be in use. Please close any programs like Unreal Engine or Wwise."
-                self.log_message(log_message)
-                logging.error(log_message)
-            except Exception as e:
-                log_message = f"Failed to rename {file_data['path']}: {e}"
-                self.log_message(log_message)
-                logging.error(log_message)
-
-            if (i + 1) % 50 == 0 or (i + 1) == total_files:
-                progress = (i + 1) / total_files * 100
-                self.progress_bar["value"] = progress
-                self.progress_bar_label.config(text=f"{progress:.0f}%")
-                if self.root:
-                    self.root.update_idletasks()
-
-        summary_message = f"Process finished.\n\nRenamed: {renamed_count}\nSkipped (already exist): {skipped_count}"
-        messagebox.showinfo("Renaming Complete", summary_message)
-        self.update_status("Renaming complete.")
-        self.log_message("Renaming process finished.")
+                journal_batch = self.journal.start_batch(self.rename_mode, undoes=undoes)
+            except OSError as e:
+                if not messagebox.askyesno("Journal Error", f"Could not open the rename journal: {e}\n\nThis batch can't be undone later. Continue anyway?"):
+                    return
+
+        self.update_status(words["status"])
+        self.progress_bar["value"] = 0
+        self.progress_bar_label.config(text="0%")
+        self.rename_attempted = 0
+        self.set_busy(True)
+        self.rename_worker = RenameWorker(moves, verb=words["verb"], journal_batch=journal_batch, operation=operation)
+        self.rename_worker.start()
+        self.after(100, self.poll_rename_queue)
+
+    def undo_last_batch(self):
+        """Renames the files of the most recent journaled batch back, newest first."""
+        batch, moves = self.journal.last_undoable()
+        if batch is None:
+            messagebox.showinfo("Nothing to Undo", "The rename journal has no batches left to undo.")
+            return
+
+        words = RENAME_WORDS.get(batch["action"], RENAME_WORDS["rename"])
+        partly = " (partly undone already)" if len(moves) < len(batch["moves"]) else ""
+        confirmation = messagebox.askyesno(
+            "Undo Last Batch",
+            f"Undo the {words['noun']} batch from {batch['time']}{partly}?\n\n{len(moves)} files will get their previous names back."
+        )
+        if not confirmation:
+            return
+
+        self.log_message(f"Undoing the {words['noun']} batch from {batch['time']} ({len(moves)} files)...")
+        self.rename_mode = "undo"
+        self.rename_report = RenameReport("undo")
+        self.start_rename_worker(moves, undoes=batch["batch"])
+
+    def poll_rename_queue(self):
+        """Drains the rename worker's queue and updates the UI, rescheduling itself until the batch is done."""
+        worker = self.rename_worker
+        words = RENAME_WORDS[self.rename_mode]
+        report = self.rename_report
+        done_outcome = "copied" if self.rename_mode == "match" else "renamed"
+        finished = None
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    _, self.rename_attempted, total_files, renamed, skipped, failed = message
+                    report.add_moves(done_outcome, renamed)
+                    report.add_move_details("collision", skipped)
+                    report.add_move_details("error", failed)
+                    # Errors are rare and usually need action, so they still get a line each
+                    for move, error in failed:
+                        self.log_message(f"Failed to {words['verb']} {move['src']}: {error}", "ERROR")
+
+                    progress = self.rename_attempted / total_files * 100 if total_files else 100
+                    self.progress_bar["value"] = progress
+                    self.progress_bar_label.config(text=f"{progress:.0f}%")
+                elif kind == "error":
+                    self.log_message(message[1], "ERROR")
+                elif kind == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(100, self.poll_rename_queue)
+            return
+
+        _, cancelled = finished
+        self.rename_worker = None
+        self.set_busy(False)
+
+        if cancelled:
+            # Anything the worker didn't get to was left untouched
+            attempted = {row[:2] for outcome in (done_outcome, "collision", "error") for row in report.rows[outcome]}
+            report.add_moves("not-attempted", [move for move in worker.moves if (move["src"], move["dst"]) not in attempted])
+
+        report_path = self.write_report()
+        counts = report.counts()
+        summary_message = f"Process finished.\n\n{report.summary()}"
+        if report_path:
+            summary_message += f"\n\nFull report: {report_path}"
+        log_summary = f"{words['past']} {counts[done_outcome]}, {counts['collision']} conflicts, {counts['error']} errors"
+
+        if cancelled:
+            messagebox.showinfo(f"{words['title']} Cancelled", summary_message)
+            self.update_status(f"{words['title']} cancelled.")
+            self.log_message(f"{words['title']} cancelled. {log_summary}, {counts['not-attempted']} not attempted.", "WARNING")
+            return
+
+        messagebox.showinfo(f"{words['title']} Complete", summary_message)
+        self.update_status(f"{words['title']} complete.")
+        self.log_message(f"{words['title']} process finished. {log_summary}.")
         self.progress_bar["value"] = 100
         self.progress_bar_label.config(text="100%")
 
-    def start_reverting(self):
+    def start_matching(self):
+        """Asks for a folder of replacement files and matches them to Wwise names in the background."""
         root_folder = self.folder_path_var.get()
-        media_csv_path = self.media_csv_path_var.get()
-        localized_csv_path = self.localized_csv_path_var.get()
-        selected_type = self.file_type_var.get()
-        
-        # The list of file extensions to process
-        allowed_extensions = ['.uasset', '.uexp', '.ubulk', '.wav']
-
-
         if not root_folder or not os.path.isdir(root_folder):
             messagebox.showerror("Error", "Please select a valid work folder.")
             return
-        
-        if not media_csv_path and not localized_csv_path:
+        if not self.media_csv_path_var.get() and not self.localized_csv_path_var.get():
             messagebox.showerror("Error", "Please select at least one CSV file to proceed.")
             return
 
-        media_map_lower = {}
-        localized_map_lower = {}
-        if media_csv_path and os.path.exists(media_csv_path):
-            _, media_map_lower = self.load_name_to_id_map_from_csv(media_csv_path)
-            if media_map_lower is None: return
+        wanted_folders = self.selected_audio_folders(find_audio_folders(root_folder))
+        if not wanted_folders:
+            messagebox.showinfo("No Folders Found", "Could not find 'Media' or 'Localized/<language>/Media' folders for the selected file type and language.")
+            return
 
-        if localized_csv_path and os.path.exists(localized_csv_path):
-            _, localized_map_lower = self.load_name_to_id_map_from_csv(localized_csv_path)
-            if localized_map_lower is None: return
+        replacement_folder = filedialog.askdirectory(title="Select the folder with the replacement files")
+        if not replacement_folder:
+            return
+        try:
+            entries, _ = list_dir(replacement_folder)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not read {replacement_folder}: {e}")
+            return
+        file_paths = sorted(entry.path for entry in entries if os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS)
+        if not file_paths:
+            messagebox.showinfo("No Files", f"No audio files ({', '.join(AUDIO_EXTENSIONS)}) found in {replacement_folder}.")
+            return
 
-        self.update_status("Finding audio folders for reversion...")
-        self.log_message("Starting audio file reversion process...")
+        indexes = self.load_selected_indexes(wanted_folders)
+        if indexes is None: return # Stop if loading failed
+        kinds = {False: "Media", True: "Localized"}
+        tables = [(kinds[localized], index) for localized, index in indexes.items()]
+        if not tables:
+            messagebox.showerror("Error", "None of the selected folders has a CSV to match against.")
+            return
+        self.match_folders = {}
+        for folder, localized in wanted_folders:
+            if localized in indexes:
+                self.match_folders.setdefault(kinds[localized], []).append(folder)
 
-        audio_folders = self.find_audio_folders(root_folder)
-        
-        if not audio_folders:
-            messagebox.showinfo("No Folders Found", "Could not find 'Media' or 'Localized/English_US_/Media' folders within the selected directory. Please ensure you have selected the main 'PAYDAY3' folder.")
-            self.update_status("Reversion cancelled. No audio folders found.")
+        self.log_message(f"Matching {len(file_paths)} replacement files from {replacement_folder} against the {' and '.join(kind for kind, _ in tables)} tables...")
+        self.rename_mode = "match"
+        self.progress_bar["value"] = 0
+        self.progress_bar_label.config(text="0%")
+        self.set_busy(True)
+        self.update_status("Matching replacement files...")
+        self.match_worker = MatchWorker(file_paths, tables)
+        self.match_worker.start()
+        self.after(100, self.poll_match_queue)
+
+    def poll_match_queue(self):
+        """Drains the match worker's queue, then confirms and starts copying once every file has a proposal."""
+        worker = self.match_worker
+        finished = None
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    _, done_count, total = message
+                    progress = done_count / total * 100 if total else 100
+                    self.progress_bar["value"] = progress
+                    self.progress_bar_label.config(text=f"{progress:.0f}%")
+                elif kind == "error":
+                    self.log_message(message[1], "ERROR")
+                    logging.error(message[1])
+                elif kind == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(100, self.poll_match_queue)
             return
 
-        self.file_list = []
-        for folder in audio_folders:
-            is_localized_folder = "Localized" in os.path.normpath(folder)
-
-            current_map_lower = None
-            if selected_type == "All":
-                current_map_lower = localized_map_lower if is_localized_folder else media_map_lower
-            elif selected_type == "Localized (VO)" and is_localized_folder:
-                current_map_lower = localized_map_lower
-            elif selected_type == "Media (Audio)" and not is_localized_folder:
-                current_map_lower = media_map_lower
-
-            if current_map_lower:
-                for file_name in os.listdir(folder):
-                    file_name_no_ext, extension = os.path.splitext(file_name)
-                    # Strip any leading/trailing whitespace from the filename
-                    file_name_no_ext = file_name_no_ext.strip()
-                    if file_name_no_ext.lower() in current_map_lower:
-                        if extension.lower() in allowed_extensions:
-                            self.file_list.append({
-                                "path": os.path.join(folder, file_name),
-                                "original_id": current_map_lower[file_name_no_ext.lower()],
-                                "current_name": file_name_no_ext
-                            })
-                        else:
-                            self.log_message(f"Skipped file (extension invalid): {file_name}")
-                    else:
-                        self.log_message(f"Skipped file '{file_name}': Name '{file_name_no_ext}' not found in the selected CSV map.")
-
-        total_files = len(self.file_list)
-        if total_files == 0:
-            messagebox.showinfo("No Files", "No files were found to revert based on the provided dictionaries and selection.")
-            self.update_status("Reversion complete. No files were reverted.")
-            self.log_message("Reversion complete. No files were found to revert.")
+        _, cancelled, proposals = finished
+        self.match_worker = None
+        self.set_busy(False)
+        if cancelled:
+            self.update_status("Matching cancelled.")
+            self.log_message("Matching cancelled before any files were copied.", "WARNING")
+            return
+
+        copies, unmatched, skipped = plan_copies(proposals, self.match_folders)
+        self.rename_report = RenameReport("match", dry_run=self.dry_run_var.get())
+        for proposal, reason in unmatched:
+            self.rename_report.add_paths("no-match", proposal["files"], reason)
+        self.rename_report.add_move_details("collision", skipped)
+        self.log_message(
+            f"Matched {len(proposals) - len(unmatched)} of {len(proposals)} replacement assets: "
+            f"{len(copies)} files to copy, {len(skipped)} conflicts, {len(unmatched)} without a close match."
+        )
+
+        if self.rename_report.dry_run or not copies:
+            self.rename_report.add_moves("planned", copies)
+            self.write_report()
+            title = "Dry Run" if self.rename_report.dry_run else "No Files"
+            messagebox.showinfo(title, f"No files were copied.\n\n{self.rename_report.summary()}")
+            self.update_status(f"Matching complete. {len(copies)} files would be copied.")
             return
 
         confirmation = messagebox.askyesno(
             "Confirmation",
-            f"Found {total_files} files to revert. Are you sure you want to proceed?"
+            f"Copy {len(copies)} matched files into the Media folders under their Wwise IDs?\n\n"
+            f"{len(unmatched)} assets without a close match and {len(skipped)} conflicting files will be skipped. "
+            f"Use Dry Run to review the matches first."
         )
         if not confirmation:
-            self.update_status("Reversion cancelled.")
-            self.log_message("Reversion cancelled by user.")
+            self.update_status("Matching cancelled.")
+            self.log_message("Matching cancelled by user.")
             return
 
-        self.update_status("Reverting file names...")
-        self.progress_bar["value"] = 0
-        self.progress_bar_label.config(text="0%")
-        if self.root:
-            self.root.update_idletasks()
-
-        reverted_count = 0
-        skipped_count = 0
+        self.start_rename_worker(copies, operation=copy_no_replace)
 
-        for i, file_data in enumerate(self.file_list):
-            try:
-                original_extension = os.path.splitext(file_data["path"])[1]
-                new_file_path = os.path.join(os.path.dirname(file_data["path"]), f"{file_data['original_id']}{original_extension}")
-                
-                # Check if the destination file already exists
-                if os.path.exists(new_file_path):
-                    log_message = f"Skipped: {os.path.basename(new_file_path)} already exists."
-                    self.log_message(log_message)
-                    logging.warning(log_message)
-                    skipped_count += 1
-                    continue
-                
-                os.rename(file_data["path"], new_file_path)
-                log_message = f"Reverted {file_data['current_name']}{original_extension} to {os.path.basename(new_file_path)}"
-                reverted_count += 1
-                self.log_message(log_message)
-                logging.info(log_message)
-            except PermissionError as e:
-                log_message = f"Failed to revert {file_data['path']}: Access is denied. The file may be in use. Please close any programs like Unreal Engine or Wwise."
-                self.log_message(log_message)
-                logging.error(log_message)
-            except Exception as e:
-                log_message = f"Failed to revert {file_data['path']}: {e}"
-                self.log_message(log_message)
-                logging.error(log_message)
-
-            # --- Performance Improvement: Update UI periodically instead of every iteration ---
-            if (i + 1) % 50 == 0 or (i + 1) == total_files:
-                progress = (i + 1) / total_files * 100
-                self.progress_bar["value"] = progress
-                self.progress_bar_label.config(text=f"{progress:.0f}%")
-                if self.root:
-                    self.root.update_idletasks()
-
-        summary_message = f"Process finished.\n\nReverted: {reverted_count}\nSkipped (already exist): {skipped_count}"
-        messagebox.showinfo("Reversion Complete", summary_message)
-        self.update_status("Reversion complete.")
-        self.log_message("Reversion process finished.")
-        self.progress_bar["value"] = 100
-        self.progress_bar_label.config(text="100%")
+    def write_report(self):
+        """Saves the current rename report and points the Open Report button at it. Returns the path or None."""
+        try:
+            path = self.rename_report.write()
+        except OSError as e:
+            log_message = f"Could not write the rename report: {e}"
+            self.log_message(log_message, "ERROR")
+            logging.error(log_message)
+            return None
+        self.last_report_path = path
+        self.open_report_button.config(state='normal')
+        self.log_message(f"Report saved to {path}")
+        return path
+
+    def open_report(self):
+        """Opens the last rename report with the program registered for CSV files."""
+        if not self.last_report_path:
+            return
+        try:
+            webbrowser.open_new(pathlib.Path(self.last_report_path).as_uri())
+            self.update_status(f"Opened report {os.path.basename(self.last_report_path)}.")
+        except Exception as e:
+            self.update_status(f"Error opening report: {e}")
@@ -2,8 +2,15 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import time
+import queue
 import logging
 from utils.tooltip import ToolTip
+from utils.log_console import LogConsole
+from utils.results_view import CleanupResultsView
+from utils.cleanup_engine import ScanWorker, DeleteWorker, format_size, plan_deletion
+from utils.scan_index import ScanIndex
+from utils.constants import PREFIXES
 # Import the new styles file
 import utils.styles as styles
 
@@ -13,25 +20,35 @@ class CleanupTab(ttk.Frame):
         self.root = None # Will be set by the main app
         self.status_bar = None # Will be set by the main app
         self.scan_running = False
-        self.log_messages = []
+        self.scan_worker = None
+        self.delete_worker = None
+        self.delete_deleted = set()
+        self.delete_failed = []
+        self.delete_freed = 0
+        # Remembers directory listings between scans so unchanged folders aren't walked again
+        self.scan_index = ScanIndex()
+        self.full_rescan_var = tk.BooleanVar(value=False)
+        self.scan_start_time = 0
+        # Asset bundles found by the last scan (see utils.cleanup_engine.collect_bundles)
+        self.bundles = []
+        # Only the results of a scan that ran to the end may be deleted, a cancelled one lists a part of the folder
+        self.scan_complete = False
+        # Folder layout from the last scan, used to collapse fully matched folders when deleting
+        self.scan_root = ""
+        self.directories = {}
         self.last_folder_path = last_folder_path # Store the passed folder path
 
         # Dictionary to store Checkbutton variables for easy access.
-        # All prefixes now end with an underscore for consistency.
         self.prefix_vars = {}
-        self.prefixes_by_category = {
-            "Audio Prefixes": ["LPS_", "WAV_", "MP3_", "OGG_", "SND_", "AUD_"],
-            "Textures Prefixes": ["T_", "TD_", "N_", "R_"],
-            "Materials Prefixes": ["M_", "MI_", "ML_", "MLB_", "MM_", "MF_", "MAT_"],
-            "Blueprint Prefixes": ["BP_", "PC_", "BT_"],
-            "Animation Prefixes": ["A_", "ABP_", "AM_", "AO_", "BS_", "SKM_", "PA_", "ABM_", "ANIM_", "ANM_"],
-            "Mesh Prefixes": ["SM_", "SK_", "PM_", "UM_", "STAT_", "INST_"],
-            "Niagara Prefixes": ["NS_"],
-            "UI Prefixes": ["WBP_", "UI_"],
-            "VFX Prefixes": ["FX_", "VFX_"],
-            "Misc Prefixes": ["_C", "SBZ_", "BB_", "C_", "CT_", "DA_", "EQS_", "FFE_", "FT_", "SS_", "ST_", "SLOT_", "Var_", "WAD_", "WGD_", "WMD_", "WPD_", "WSD_", "WTD_"]
-        }
+        # Shared with cleanup_cli.py, so the command line targets exactly what this tab does
+        self.prefixes_by_category = PREFIXES
         
+        # Which category each prefix belongs to, for grouping the results
+        self.category_of = {}
+        for category, prefixes in self.prefixes_by_category.items():
+            for prefix in prefixes:
+                self.category_of.setdefault(prefix, category)
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -131,9 +148,21 @@ class CleanupTab(ttk.Frame):
         button_frame = ttk.Frame(action_progress_frame, style='TFrame')
         button_frame.pack(fill='x', pady=(0, 10))
 
-        # Scan and Delete buttons
-        ttk.Button(button_frame, text="Scan Files", command=self.scan_files, style='TButton').pack(side='left', padx=(0, 5))
-        ttk.Button(button_frame, text="Delete Files", command=self.delete_files, style='Red.TButton').pack(side='left', padx=(5, 0))
+        # Scan, Cancel and Delete buttons
+        self.scan_button = ttk.Button(button_frame, text="Scan Files", command=self.scan_files, style='TButton')
+        self.scan_button.pack(side='left', padx=(0, 5))
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_operation, style='TButton', state='disabled')
+        self.cancel_button.pack(side='left', padx=5)
+        self.delete_button = ttk.Button(button_frame, text="Delete Files", command=self.delete_files, style='Red.TButton', state='disabled')
+        self.delete_button.pack(side='left', padx=(5, 0))
+
+        full_rescan_cb = ttk.Checkbutton(button_frame, text="Full Rescan", variable=self.full_rescan_var, style='TCheckbutton')
+        full_rescan_cb.pack(side='left', padx=(15, 0))
+        ToolTip(full_rescan_cb, "Ignore the scan index and walk every folder again. Use this if files were changed outside the tool and the scan looks stale.")
+
+        # Live scan counter
+        self.scan_rate_label = ttk.Label(button_frame, text="", style='TLabel')
+        self.scan_rate_label.pack(side='right')
 
         # Progress bar and label
         self.progress_bar = ttk.Progressbar(action_progress_frame, orient='horizontal', length=100, mode='determinate', style='Horizontal.text.Green.TProgressbar')
@@ -141,19 +170,30 @@ class CleanupTab(ttk.Frame):
         self.progress_bar_label = ttk.Label(action_progress_frame, text="0%", style='TLabel', anchor='center')
         self.progress_bar_label.pack(fill='x')
 
+        # Results and log side by side
+        output_pane = ttk.PanedWindow(glass_box, orient='horizontal')
+        output_pane.pack(fill='both', expand=True, pady=(10, 0))
+
+        results_frame = ttk.Frame(output_pane, style='TFrame', padding=(10, 5), relief='groove', borderwidth=1)
+        output_pane.add(results_frame, weight=1)
+
+        results_title = ttk.Label(results_frame, text="Results", style='TLabel', font=("Helvetica", 10, "bold"))
+        results_title.pack(anchor='w', pady=(0, 5))
+
+        # Rows are only created when a category or folder is expanded, untick anything that should be kept
+        self.results_view = CleanupResultsView(results_frame)
+        self.results_view.pack(fill='both', expand=True)
+
         # Log window section
-        log_frame = ttk.Frame(glass_box, style='TFrame', padding=(10, 5), relief='groove', borderwidth=1)
-        log_frame.pack(fill='both', expand=True, pady=(10, 0))
+        log_frame = ttk.Frame(output_pane, style='TFrame', padding=(10, 5), relief='groove', borderwidth=1)
+        output_pane.add(log_frame, weight=1)
         
         log_title = ttk.Label(log_frame, text="Log", style='TLabel', font=("Helvetica", 10, "bold"))
         log_title.pack(anchor='w', pady=(0, 5))
 
-        self.log_text = tk.Text(log_frame, wrap='word', bg='#2a2a2a', fg='white', relief='flat', state='disabled', font=('Helvetica', 10), insertbackground='white')
-        log_scrollbar = ttk.Scrollbar(log_frame, command=self.log_text.yview)
-        self.log_text['yscrollcommand'] = log_scrollbar.set
-        
-        self.log_text.pack(side='left', fill='both', expand=True)
-        log_scrollbar.pack(side='right', fill='y')
+        # Buffered console, flushes to its Text widget in batches so large runs don't flood Tk
+        self.log_console = LogConsole(log_frame)
+        self.log_console.pack(fill='both', expand=True)
 
 
     def select_category(self, checked, prefixes):
@@ -171,6 +211,9 @@ class CleanupTab(ttk.Frame):
             self.update_status(f"Folder selected: {folder_selected}")
 
     def scan_files(self):
+        if self.scan_running:
+            return
+
         folder_path = self.folder_path_var.get()
         if not folder_path or not os.path.isdir(folder_path):
             messagebox.showerror("Error", "Please select a valid folder.")
@@ -187,27 +230,105 @@ class CleanupTab(ttk.Frame):
             if self.prefix_vars.get(prefix) and self.prefix_vars[prefix].get()
         ]
 
-        files_to_delete = []
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                for prefix in selected_prefixes:
-                    if file.startswith(prefix) and (file.endswith(".uasset") or file.endswith(".umap")):
-                        files_to_delete.append(os.path.join(root, file))
-                        self.log_message(f"Found: {os.path.join(root, file)}")
-                        break
-
-        num_files = len(files_to_delete)
-        messagebox.showinfo("Scan Complete", f"Found {num_files} files to delete.")
-        self.update_status(f"Scan complete. Found {num_files} files.")
-        self.log_message(f"Scan complete. Found {num_files} files to delete.")
-        
-        self.log_messages = files_to_delete
+        # Keep Delete disabled until the scan has settled so a partial list is never deleted
+        self.bundles = []
+        self.directories = {}
+        self.scan_complete = False
+        self.results_view.clear()
+        self.scan_running = True
+        self.scan_button.config(state='disabled')
+        self.delete_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self.scan_rate_label.config(text="")
+
+        self.scan_start_time = time.monotonic()
+        rebuild = self.full_rescan_var.get()
+        if rebuild:
+            self.log_message("Full rescan requested, rebuilding the scan index.")
+        self.scan_worker = ScanWorker(folder_path, selected_prefixes, index=self.scan_index, rebuild=rebuild)
+        self.scan_root = self.scan_worker.folder_path
+        self.results_view.set_results(self.scan_root, [], self.category_of)
+        self.scan_worker.start()
+        self.after(100, self.poll_scan_queue)
+
+    def cancel_operation(self):
+        """Stops the running scan or deletion."""
+        if self.scan_worker and self.scan_running:
+            self.scan_worker.cancel()
+            self.cancel_button.config(state='disabled')
+            self.update_status("Cancelling scan...")
+        elif self.delete_worker:
+            self.delete_worker.cancel()
+            self.cancel_button.config(state='disabled')
+            self.update_status("Cancelling deletion...")
+
+    def poll_scan_queue(self):
+        """Drains the scan worker's queue and updates the UI, rescheduling itself until the scan is done."""
+        worker = self.scan_worker
+        finished = None
+        scanned_count = 0
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == "batch":
+                    _, bundles, scanned_count = message
+                    # Matches go to the results view rather than one log line each
+                    self.bundles.extend(bundles)
+                    self.results_view.add_bundles(bundles)
+                elif kind == "error":
+                    self.log_message(f"Scan error: {message[1]}", "ERROR")
+                    logging.error(f"Scan error: {message[1]}")
+                elif kind == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        elapsed = max(time.monotonic() - self.scan_start_time, 1e-6)
+        if scanned_count:
+            self.scan_rate_label.config(
+                text=f"Scanned {scanned_count} files ({scanned_count / elapsed:,.0f} files/sec), {len(self.bundles)} assets found"
+            )
+
+        if finished is None:
+            self.after(100, self.poll_scan_queue)
+            return
+
+        _, cancelled, scanned_count, self.directories = finished
+        self.scan_running = False
+        self.scan_worker = None
+        self.scan_complete = not cancelled
+        self.scan_button.config(state='normal')
+        self.delete_button.config(state='normal' if self.scan_complete else 'disabled')
+        self.cancel_button.config(state='disabled')
+
+        num_assets = len(self.bundles)
+        num_files = sum(len(bundle["files"]) for bundle in self.bundles)
+        total_size = format_size(sum(bundle["size"] for bundle in self.bundles))
+        if cancelled:
+            self.update_status(f"Scan cancelled. Found {num_assets} assets before stopping. Scan again to delete.")
+            self.log_message(f"Scan cancelled after {scanned_count} files. Found {num_assets} assets ({num_files} files, {total_size}) to delete.")
+            return
+
+        messagebox.showinfo("Scan Complete", f"Found {num_assets} assets to delete.\n\n{num_files} files, {total_size} in total.")
+        self.update_status(f"Scan complete. Found {num_assets} assets ({num_files} files, {total_size}).")
+        self.log_message(f"Scan complete. Found {num_assets} assets ({num_files} files, {total_size}) to delete.")
+
+    def describe_bundle(self, action, bundle):
+        """Formats a bundle for the log, e.g. 'Found: path (+2 companion files, 1.2 MB)'."""
+        companions = len(bundle["files"]) - 1
+        details = f"+{companions} companion files, " if companions else ""
+        return f"{action}: {bundle['path']} ({details}{format_size(bundle['size'])})"
 
     def delete_files(self):
-        files_to_delete = self.log_messages
-        total_files = len(files_to_delete)
+        if not self.scan_complete:
+            return
+        # Only what is still ticked in the results view
+        bundles_to_delete = self.results_view.selected_bundles()
+        total_assets = len(bundles_to_delete)
 
-        if total_files == 0:
+        if total_assets == 0:
             messagebox.showinfo("No Files", "No files to delete.")
             self.update_status("No files to delete.")
             self.log_message("No files to delete.")
@@ -215,7 +336,9 @@ class CleanupTab(ttk.Frame):
         
         confirmation = messagebox.askyesno(
             "Confirmation",
-            f"Are you sure you want to delete {total_files} files? This action cannot be undone."
+            f"Are you sure you want to delete {total_assets} assets "
+            f"({sum(len(bundle['files']) for bundle in bundles_to_delete)} files, "
+            f"{format_size(sum(bundle['size'] for bundle in bundles_to_delete))})? This action cannot be undone."
         )
         if not confirmation:
             self.update_status("Deletion cancelled.")
@@ -226,42 +349,93 @@ class CleanupTab(ttk.Frame):
         self.log_message("Starting deletion...")
         self.progress_bar["value"] = 0
         self.progress_bar_label.config(text="0%")
-        if self.root:
-            self.root.update_idletasks()
-
-        # Deletion logic with progress bar
-        if total_files > 0:
-            for i, file_path in enumerate(files_to_delete):
-                try:
-                    os.remove(file_path)
-                    log_message = f"Successfully deleted: {file_path}"
-                    self.log_message(log_message)
-                    logging.info(log_message)
-                except Exception as e:
-                    log_message = f"Failed to delete {file_path}: {e}"
-                    self.log_message(log_message)
-                    logging.error(log_message)
-                
-                # Update progress bar
-                progress = (i + 1) / total_files * 100
-                self.progress_bar["value"] = progress
-                self.progress_bar_label.config(text=f"{progress:.0f}%")
-                if self.root:
-                    self.root.update_idletasks()
-
-            messagebox.showinfo("Deletion Complete", f"Deleted {total_files} files.")
-        
-        self.update_status("Deletion complete.")
-        self.log_message("Deletion process finished.")
-        self.progress_bar["value"] = 100
-        self.progress_bar_label.config(text="100%")
+        self.scan_button.config(state='disabled')
+        self.delete_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+
+        self.delete_deleted = set()
+        self.delete_failed = []
+        self.delete_freed = 0
+        # Folders where everything is being deleted go in one rmtree instead of file by file
+        subtrees, loose_bundles = plan_deletion(self.scan_root, bundles_to_delete, self.directories)
+        if subtrees:
+            self.log_message(f"{len(subtrees)} folders only contain assets being deleted and will be removed whole.")
+        self.delete_worker = DeleteWorker(self.scan_root, subtrees, loose_bundles)
+        self.delete_worker.start()
+        self.after(100, self.poll_delete_queue)
+
+    def poll_delete_queue(self):
+        """Drains the delete worker's queue, rescheduling itself until the deletion is done."""
+        worker = self.delete_worker
+        finished = None
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                if message[0] == "progress":
+                    _, done_count, total_assets, deleted, failed, removed_dirs = message
+                    self.delete_failed.extend(failed)
+                    for bundle in deleted:
+                        self.delete_deleted.add(bundle["path"])
+                        self.delete_freed += bundle["size"]
+                        self.log_message(self.describe_bundle("Successfully deleted", bundle))
+                    for dir_path, bundles in removed_dirs:
+                        # Logged once per folder rather than once per asset
+                        self.delete_deleted.update(bundle["path"] for bundle in bundles)
+                        self.delete_freed += sum(bundle["size"] for bundle in bundles)
+                        self.log_message(
+                            f"Removed folder: {dir_path} ({len(bundles)} assets, "
+                            f"{sum(len(bundle['files']) for bundle in bundles)} files, "
+                            f"{format_size(sum(bundle['size'] for bundle in bundles))})"
+                        )
+                    for bundle, error in failed:
+                        self.log_message(f"Failed to delete {bundle['path']}: {error}", "ERROR")
+
+                    progress = done_count / total_assets * 100 if total_assets else 100
+                    self.progress_bar["value"] = progress
+                    self.progress_bar_label.config(text=f"{progress:.0f}%")
+                elif message[0] == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(100, self.poll_delete_queue)
+            return
+
+        _, cancelled, pruned_count = finished
+        self.delete_worker = None
+        self.scan_button.config(state='normal')
+        self.delete_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+
+        # Keep whatever wasn't deleted so the user can retry it
+        deleted_count = len(self.delete_deleted)
+        failed_count = len(self.delete_failed)
+        unticked_paths = self.results_view.unticked_paths()
+        self.bundles = [bundle for bundle in self.bundles if bundle["path"] not in self.delete_deleted]
+        self.results_view.set_results(self.scan_root, self.bundles, self.category_of, unticked_paths)
+        not_attempted = len(self.bundles) - len(unticked_paths) - failed_count
+
+        summary_message = f"Deleted: {deleted_count} assets ({format_size(self.delete_freed)})\nFailed: {failed_count}"
+        if pruned_count:
+            summary_message += f"\nEmpty folders removed: {pruned_count}"
+            self.log_message(f"Removed {pruned_count} empty folders.")
+        if cancelled:
+            summary_message += f"\nNot attempted (cancelled): {not_attempted}"
+            self.update_status("Deletion cancelled.")
+            self.log_message(f"Deletion cancelled. Deleted {deleted_count}, failed {failed_count}, {not_attempted} not attempted.", "WARNING")
+            messagebox.showinfo("Deletion Cancelled", summary_message)
+        else:
+            self.update_status("Deletion complete.")
+            self.log_message(f"Deletion process finished. Deleted {deleted_count}, failed {failed_count}.")
+            messagebox.showinfo("Deletion Complete", summary_message)
+            self.progress_bar["value"] = 100
+            self.progress_bar_label.config(text="100%")
 
     def update_status(self, message):
         if self.status_bar:
             self.status_bar.config(text=message)
 
-    def log_message(self, message):
-        self.log_text.configure(state='normal')
-        self.log_text.insert(tk.END, f"{message}\n")
-        self.log_text.see(tk.END)
-        self.log_text.configure(state='disabled')
+    def log_message(self, message, level="INFO"):
+        self.log_console.write(message, level)
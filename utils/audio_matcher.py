@@ -0,0 +1,219 @@
+# utils/audio_matcher.py
+import os
+import re
+import math
+import queue
+import shutil
+import threading
+from array import array
+from collections import Counter
+from utils.rename_planner import rename_no_replace
+
+# Proposals scoring lower than this are reported instead of copied
+MIN_SCORE = 0.6
+
+# How many of the names sharing the most trigrams with a file are scored exactly
+CANDIDATES = 50
+
+# Trigrams found in more than this share of the names hardly tell them apart, so they only count
+# towards the exact score and aren't used to find candidates
+MAX_DF_SHARE = 0.125
+
+# The matcher for the tables used last, dry runs and the real run that follows share it
+_matcher = (None, None)
+_lock = threading.Lock()
+
+CAMEL_CASE = re.compile(r"([a-z])([A-Z])")
+TOKEN_SPLIT = re.compile(r"[^0-9a-z]+|(?<=[a-z])(?=[0-9])|(?<=[0-9])(?=[a-z])")
+
+
+def normalize(text):
+    """
+    Reduces a name to lowercase words separated by single spaces, so "CopHearGunfire01_A" and
+    "cop hear gunfire 1a" come out the same. Numbers lose their leading zeros.
+    """
+    text = CAMEL_CASE.sub(r"\1 \2", text).lower()
+    tokens = [token.lstrip("0") or "0" if token.isdigit() else token for token in TOKEN_SPLIT.split(text) if token]
+    return " ".join(tokens)
+
+
+def trigrams(text):
+    padded = f" {normalize(text)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def copy_no_replace(src, dst):
+    """Copies src to dst without ever overwriting an existing file, and without leaving a partial dst behind."""
+    temp_path = f"{dst}.{os.getpid()}.tmp"
+    try:
+        shutil.copy2(src, temp_path)
+        rename_no_replace(temp_path, dst)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class NameMatcher:
+    """
+    Finds the Wwise names closest to a loosely written file name.
+
+    Every name is broken into character trigrams after normalize(), weighted by how rare they are
+    (inverse document frequency). A file is compared against the names sharing the most trigrams with
+    it, found from an inverted index, and scored by the cosine similarity of the weighted trigram sets.
+    Matching a file touches a few thousand index entries instead of all 32k names.
+    """
+    def __init__(self, tables):
+        # (kind, name, wwise_id) per row, from (kind, WwiseIdIndex) pairs
+        self.entries = [(kind, name, file_id) for kind, index in tables for name, file_id in index.rows()]
+        self.entry_trigrams = []
+        postings = {}
+        for row, (_, name, _) in enumerate(self.entries):
+            grams = trigrams(name)
+            self.entry_trigrams.append(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(row)
+
+        count = len(self.entries)
+        self.weights = {gram: math.log(count / len(rows)) ** 2 for gram, rows in postings.items()}
+        self.norms = [math.sqrt(sum(self.weights[gram] for gram in grams)) or 1.0 for grams in self.entry_trigrams]
+        max_rows = max(1, int(count * MAX_DF_SHARE))
+        self.postings = {gram: array("I", rows) for gram, rows in postings.items() if len(rows) <= max_rows}
+
+    def match(self, text, limit=2):
+        """Returns up to `limit` (score, kind, name, wwise_id) tuples, best first. Scores run from 0 to 1."""
+        grams = trigrams(text)
+        known = [gram for gram in grams if gram in self.weights]
+        if not known:
+            return []
+        norm = math.sqrt(sum(self.weights[gram] for gram in known))
+
+        # Counting shared trigrams runs in C; only the best candidates get the weighted score
+        shared = Counter()
+        for gram in known:
+            rows = self.postings.get(gram)
+            if rows is not None:
+                shared.update(rows)
+
+        scored = []
+        for row, _ in shared.most_common(CANDIDATES):
+            common = grams & self.entry_trigrams[row]
+            score = sum(self.weights[gram] for gram in common) / (norm * self.norms[row])
+            scored.append((min(score, 1.0), row))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(score, *self.entries[row]) for score, row in scored[:limit]]
+
+
+def get_matcher(tables):
+    """Returns a NameMatcher for (kind, WwiseIdIndex) pairs, reusing the last one while the indexes are unchanged."""
+    global _matcher
+    # load_index() hands out the same index object until its CSV changes, and indexes compare by identity
+    key = tuple((kind, index) for kind, index in tables)
+    with _lock:
+        if _matcher[0] != key:
+            _matcher = (key, NameMatcher(tables))
+        return _matcher[1]
+
+
+class MatchWorker(threading.Thread):
+    """
+    Proposes the best Wwise entry for every replacement file on a background thread.
+
+    Files sharing a stem (an asset's .uasset/.uexp/.ubulk) are matched once and move together.
+    `tables` is a list of (kind, WwiseIdIndex) pairs. Messages are ("progress", done, total), ("error", message)
+    and finally ("done", cancelled, proposals), where each proposal is a dict with the "stem", its "files"
+    and the best "match" and "runner_up" (score, kind, name, wwise_id) tuples, either of which may be None.
+    """
+    def __init__(self, file_paths, tables, progress_interval=50):
+        super().__init__(daemon=True)
+        self.file_paths = list(file_paths)
+        self.tables = list(tables)
+        self.progress_interval = progress_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the worker to stop after the current file."""
+        self.cancel_event.set()
+
+    def run(self):
+        proposals = []
+        try:
+            groups = {}
+            for path in self.file_paths:
+                stem = os.path.splitext(os.path.basename(path))[0]
+                groups.setdefault((os.path.dirname(path), stem.lower()), (stem, []))[1].append(path)
+
+            matcher = get_matcher(self.tables)
+            total = len(groups)
+            for done, (stem, files) in enumerate(groups.values(), 1):
+                if self.cancel_event.is_set():
+                    break
+                results = matcher.match(stem)
+                proposals.append({
+                    "stem": stem,
+                    "files": files,
+                    "match": results[0] if results else None,
+                    "runner_up": results[1] if len(results) > 1 else None
+                })
+                if done % self.progress_interval == 0 or done == total:
+                    self.queue.put(("progress", done, total))
+        except Exception as e:
+            self.queue.put(("error", str(e)))
+
+        self.queue.put(("done", self.cancel_event.is_set(), proposals))
+
+
+def plan_copies(proposals, folders, min_score=MIN_SCORE):
+    """
+    Turns match proposals into {"src", "dst", "detail"} copies named "<wwise_id><ext>" in the folders of the
+    matched table, where detail names the match and the runner-up with their scores for the report.
+
+    `folders` maps a kind to the folders its files go into (every selected language for Localized).
+    Returns (copies, unmatched, skipped): unmatched holds (proposal, reason) pairs for files without a close
+    enough match or tied between names listed with several IDs, skipped holds (copy, reason) pairs for IDs
+    claimed by a better match and destinations that already exist.
+    """
+    unmatched = []
+    accepted = []
+    best = {}
+    for proposal in proposals:
+        match = proposal["match"]
+        runner_up = proposal["runner_up"]
+        if match is None:
+            unmatched.append((proposal, "No similar name"))
+            continue
+        if match[0] < min_score:
+            unmatched.append((proposal, f"Closest: {match[2]} ({match[0]:.2f})"))
+            continue
+        if runner_up and runner_up[0] >= match[0] and runner_up[3] != match[3]:
+            unmatched.append((proposal, f"{match[2]} and {runner_up[2]} match equally well ({match[1]} {match[3]}, {runner_up[1]} {runner_up[3]})"))
+            continue
+        accepted.append(proposal)
+        # Keep the closest file per entry, the rest would overwrite it
+        key = (match[1], match[3])
+        if key not in best or match[0] > best[key]["match"][0]:
+            best[key] = proposal
+
+    copies = []
+    skipped = []
+    for proposal in accepted:
+        score, kind, name, wwise_id = proposal["match"]
+        winner = best[(kind, wwise_id)]
+        runner_up = proposal["runner_up"]
+        detail = f"{name} ({score:.2f})"
+        if runner_up:
+            detail += f", next best {runner_up[2]} ({runner_up[0]:.2f})"
+        for folder in folders.get(kind, []):
+            for path in proposal["files"]:
+                extension = os.path.splitext(path)[1]
+                copy = {"src": path, "dst": os.path.join(folder, f"{wwise_id}{extension}"), "detail": detail}
+                if winner is not proposal:
+                    skipped.append((copy, f"{winner['stem']} matches {name} better ({winner['match'][0]:.2f} vs {score:.2f})"))
+                elif os.path.lexists(copy["dst"]):
+                    skipped.append((copy, f"{os.path.basename(copy['dst'])} already exists"))
+                else:
+                    copies.append(copy)
+    return copies, unmatched, skipped
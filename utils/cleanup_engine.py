@@ -0,0 +1,330 @@
+# utils/cleanup_engine.py
+import os
+import queue
+import logging
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.prefix_matcher import compile_prefix_matcher
+from utils.walker import walk_tree
+
+# Cooked assets are split over these files next to the .uasset/.umap, and they are usually the big ones
+COMPANION_EXTENSIONS = (".uexp", ".ubulk")
+
+
+def format_size(num_bytes):
+    """Formats a byte count for display, e.g. '12.3 MB'."""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def entry_size(entry):
+    """Returns an entry's size, using the stat data scandir already fetched where the platform provides it."""
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
+
+
+def collect_bundles(dir_path, entries, match):
+    """
+    Groups the matching .uasset/.umap files in one directory listing with their .uexp/.ubulk siblings.
+
+    Works only from the names already listed, so no extra exists() calls are made. Companions are looked
+    up by the matched stem plus .uexp/.ubulk, in lower or upper case, instead of splitting every name in
+    the directory, and only matched files are sized. Returns a list of
+    bundle dicts: {"path": main asset path, "dir": dir_path, "prefix": matched prefix,
+    "files": [paths], "size": bytes}.
+    """
+    matched = []
+    for entry in entries:
+        result = match(entry.name)
+        if result:
+            matched.append((entry, result.group(1)))
+    if not matched:
+        return []
+
+    by_name = {entry.name: entry for entry in entries}
+    bundles = []
+    for entry, prefix in matched:
+        stem = entry.name[:entry.name.rfind(".")]
+        files = [entry]
+        for extension in COMPANION_EXTENSIONS:
+            # pop() so a .uasset and .umap sharing a stem don't both claim the same companions
+            companion = by_name.pop(stem + extension, None) or by_name.pop(stem + extension.upper(), None)
+            if companion is not None:
+                files.append(companion)
+        bundles.append({
+            "path": entry.path,
+            "dir": dir_path,
+            "prefix": prefix,
+            "files": [file.path for file in files],
+            "size": sum(entry_size(file) for file in files)
+        })
+    return bundles
+
+
+class ScanWorker(threading.Thread):
+    """
+    Walks a folder on a background thread and sends matching asset bundles to the UI in batches.
+
+    The UI drains `self.queue` with `after()`; messages are tuples of
+    ("batch", bundles, scanned_count), ("error", message) and finally
+    ("done", cancelled, scanned_count, directories) where `directories` maps every directory that
+    was listed to (file_count, subdir_paths) for plan_deletion().
+    """
+    def __init__(self, folder_path, prefixes, index=None, rebuild=False, batch_interval=0.1):
+        super().__init__(daemon=True)
+        self.folder_path = os.path.normpath(os.path.abspath(folder_path))
+        # Optional ScanIndex so unchanged directories aren't listed again
+        self.index = index
+        self.rebuild = rebuild
+        # The index answers per prefix selection
+        self.prefixes = list(prefixes)
+        # Compiled once per scan so each file name is tested in a single pass
+        self.match = compile_prefix_matcher(prefixes)
+        self.batch_interval = batch_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the worker to stop at the next directory boundary."""
+        self.cancel_event.set()
+
+    def report_error(self, path, error):
+        self.queue.put(("error", f"Could not read {path}: {error}"))
+
+    def collect(self, dir_path, entries):
+        return collect_bundles(dir_path, entries, self.match)
+
+    def run(self):
+        batch = []
+        directories = {}
+        scanned_count = 0
+        last_flush = time.monotonic()
+        try:
+            if self.index is not None:
+                # Unchanged directories come back with their bundles without being listed
+                walk = self.index.walk(self.folder_path, self.prefixes, self.collect, rebuild=self.rebuild,
+                                       cancel_event=self.cancel_event, on_error=self.report_error)
+            else:
+                walk = (
+                    (dir_path, len(entries), subdirs, self.collect(dir_path, entries))
+                    for dir_path, entries, subdirs in walk_tree(self.folder_path, cancel_event=self.cancel_event, on_error=self.report_error)
+                )
+
+            for dir_path, file_count, subdirs, bundles in walk:
+                scanned_count += file_count
+                directories[dir_path] = (file_count, subdirs)
+                batch.extend(bundles)
+
+                # Only hand batches over every so often so the UI thread isn't flooded
+                now = time.monotonic()
+                if now - last_flush >= self.batch_interval:
+                    self.queue.put(("batch", batch, scanned_count))
+                    batch = []
+                    last_flush = now
+        except Exception as e:
+            self.queue.put(("error", str(e)))
+
+        self.queue.put(("batch", batch, scanned_count))
+        self.queue.put(("done", self.cancel_event.is_set(), scanned_count, directories))
+
+
+def plan_deletion(root, bundles, directories):
+    """
+    Splits the bundles to delete into directories that can be removed as one subtree and
+    bundles that have to be deleted one by one.
+
+    A directory collapses when every file in it belongs to a bundle being deleted and all of its
+    subdirectories collapse too. Anything the scan didn't list (unreadable or cancelled) never
+    collapses, and neither does the root itself. `directories` is the map from ScanWorker.
+    Returns (subtrees, loose_bundles) where subtrees is a list of (dir_path, bundles).
+    """
+    slated = {}
+    for bundle in bundles:
+        slated[bundle["dir"]] = slated.get(bundle["dir"], 0) + len(bundle["files"])
+
+    # Pre-order walk of the scanned tree, then fold it up bottom-first
+    order = []
+    parents = {}
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        if path not in directories:
+            continue
+        order.append(path)
+        for subdir in directories[path][1]:
+            parents[subdir] = path
+            stack.append(subdir)
+
+    full = {}
+    contains_bundles = {}
+    for path in reversed(order):
+        file_count, subdirs = directories[path]
+        full[path] = slated.get(path, 0) == file_count and all(full.get(subdir, False) for subdir in subdirs)
+        contains_bundles[path] = path in slated or any(contains_bundles.get(subdir, False) for subdir in subdirs)
+
+    # Only the topmost collapsible directory of each branch is removed
+    subtrees = {}
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        if path not in directories:
+            continue
+        if path != root and full[path] and contains_bundles[path]:
+            subtrees[path] = []
+            continue
+        stack.extend(directories[path][1])
+
+    loose_bundles = []
+    for bundle in bundles:
+        path = bundle["dir"]
+        while path is not None and path not in subtrees:
+            path = parents.get(path)
+        if path is None:
+            loose_bundles.append(bundle)
+        else:
+            subtrees[path].append(bundle)
+
+    return list(subtrees.items()), loose_bundles
+
+
+class DeleteWorker(threading.Thread):
+    """
+    Deletes asset bundles on a thread pool and reports progress to the UI at most every `progress_interval` seconds.
+
+    Works from a plan_deletion() plan: collapsed directories are removed with a single rmtree,
+    loose bundles file by file, and directories left empty are pruned afterwards (up to `root`).
+    Messages are ("progress", done_count, total, deleted, failed, removed_dirs) with the bundles
+    deleted one by one, the (bundle, error) pairs that failed and the (dir_path, bundles) subtrees
+    removed since the last report, and finally ("done", cancelled, pruned_count).
+    """
+    def __init__(self, root, subtrees, loose_bundles, max_workers=None, chunk_size=64, progress_interval=0.1):
+        super().__init__(daemon=True)
+        self.root = root
+        self.subtrees = list(subtrees)
+        self.loose_bundles = list(loose_bundles)
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.chunk_size = chunk_size
+        self.progress_interval = progress_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the worker to stop; bundles that are already being removed finish first."""
+        self.cancel_event.set()
+
+    def delete_chunk(self, chunk):
+        deleted = []
+        failed = []
+        for bundle in chunk:
+            if self.cancel_event.is_set():
+                break
+            errors = []
+            for file_path in bundle["files"]:
+                try:
+                    os.remove(file_path)
+                    logging.info(f"Successfully deleted: {file_path}")
+                except FileNotFoundError:
+                    # Already gone, which is what we wanted
+                    pass
+                except Exception as e:
+                    errors.append(f"{os.path.basename(file_path)}: {e}")
+                    logging.error(f"Failed to delete {file_path}: {e}")
+            if errors:
+                failed.append((bundle, "; ".join(errors)))
+            else:
+                deleted.append(bundle)
+        return deleted, failed, []
+
+    def subtree_unchanged(self, dir_path, bundles):
+        """Re-lists a subtree and checks it still only holds the planned files, so rmtree can't take anything new."""
+        planned = {file_path for bundle in bundles for file_path in bundle["files"]}
+        for path, files, _ in walk_tree(dir_path, max_workers=2, on_error=self.raise_error):
+            for entry in files:
+                if entry.path not in planned:
+                    return False
+        return True
+
+    @staticmethod
+    def raise_error(path, error):
+        raise error
+
+    def delete_subtree(self, dir_path, bundles):
+        if self.cancel_event.is_set():
+            return [], [], []
+        try:
+            unchanged = self.subtree_unchanged(dir_path, bundles)
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            # Something changed since the scan, fall back to deleting just the planned bundles
+            logging.warning(f"{dir_path} changed since the scan, deleting its assets one by one.")
+            return self.delete_chunk(bundles)
+
+        try:
+            shutil.rmtree(dir_path)
+            logging.info(f"Removed folder {dir_path} ({len(bundles)} assets)")
+            return [], [], [(dir_path, bundles)]
+        except Exception as e:
+            logging.error(f"Failed to remove folder {dir_path}: {e}")
+            # rmtree may have got partway, so finish (or report) the rest bundle by bundle
+            return self.delete_chunk(bundles)
+
+    def prune_empty_dirs(self, dir_paths):
+        """Removes directories left empty by the deletion, walking up towards the root."""
+        pruned = 0
+        candidates = set(dir_paths)
+        while candidates:
+            parents = set()
+            # Deepest first so a parent is only tried after its children
+            for path in sorted(candidates, key=len, reverse=True):
+                if not path.startswith(self.root + os.sep):
+                    continue
+                try:
+                    # rmdir only succeeds on empty directories, so this never removes anything else
+                    os.rmdir(path)
+                except OSError:
+                    continue
+                pruned += 1
+                parents.add(os.path.dirname(path))
+            candidates = parents
+        return pruned
+
+    def run(self):
+        total = len(self.loose_bundles) + sum(len(bundles) for _, bundles in self.subtrees)
+        done_count = 0
+        deleted = []
+        failed = []
+        removed_dirs = []
+        touched_dirs = set()
+        last_report = time.monotonic()
+        chunks = [self.loose_bundles[i:i + self.chunk_size] for i in range(0, len(self.loose_bundles), self.chunk_size)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.delete_subtree, dir_path, bundles) for dir_path, bundles in self.subtrees]
+            futures += [pool.submit(self.delete_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                chunk_deleted, chunk_failed, chunk_removed = future.result()
+                done_count += len(chunk_deleted) + len(chunk_failed)
+                done_count += sum(len(bundles) for _, bundles in chunk_removed)
+                deleted.extend(chunk_deleted)
+                failed.extend(chunk_failed)
+                removed_dirs.extend(chunk_removed)
+                touched_dirs.update(bundle["dir"] for bundle in chunk_deleted)
+                touched_dirs.update(os.path.dirname(dir_path) for dir_path, _ in chunk_removed)
+
+                # Throttle progress so Tk redraws don't dominate the deletion time
+                now = time.monotonic()
+                if now - last_report >= self.progress_interval:
+                    self.queue.put(("progress", done_count, total, deleted, failed, removed_dirs))
+                    deleted, failed, removed_dirs = [], [], []
+                    last_report = now
+
+        pruned_count = self.prune_empty_dirs(touched_dirs)
+        self.queue.put(("progress", done_count, total, deleted, failed, removed_dirs))
+        self.queue.put(("done", self.cancel_event.is_set(), pruned_count))
@@ -3,18 +3,18 @@
 # PD3 green accent
 GREEN = "#62854f"
 
-# Unreal Engine file prefixes
+# Unreal Engine file prefixes by category, the one table behind both the Cleanup tab and cleanup_cli.py.
 PREFIXES = {
-            "Audio Prefixes": ["LPS_", "WAV_", "MP3_", "OGG_", "SND_", "AUD_"],
-            "Textures Prefixes": ["T_", "TD_", "N_", "R_"],
-            "Materials Prefixes": ["M_", "MI_", "ML_", "MLB_", "MM_", "MF_", "MAT_"],
-            "Blueprint Prefixes": ["BP_", "PC_", "WBP_", "BT_"],
-            "Animation Prefixes": ["A_", "ABP_", "AM_", "AO_", "BS_", "SK_", "SKM_", "PA_", "ABM_", "ANIM_", "ANM_"],
-            "Mesh Prefixes": ["SM_", "SK_", "PM_", "UM_", "STAT_", "INST_"],
-            "Niagara Prefixes": ["N_", "NS_"],
-            "UI Prefixes": ["WIDGET_", "UI_"],
-            "VFX Prefixes": ["FX_", "VFX_"],
-            "Misc Prefixes": ["_C", "SBZ_", "BB_", "C_", "CT_", "DA_", "EQS_", "FFE_", "FT_", "SS_", "ST_", "SLOT_", "Var_", "WAD_", "WGD_", "WMD_", "WPD_", "WSD_", "WTD_"]
+    "Audio Prefixes": ["LPS_", "WAV_", "MP3_", "OGG_", "SND_", "AUD_"],
+    "Textures Prefixes": ["T_", "TD_", "N_", "R_"],
+    "Materials Prefixes": ["M_", "MI_", "ML_", "MLB_", "MM_", "MF_", "MAT_"],
+    "Blueprint Prefixes": ["BP_", "PC_", "BT_"],
+    "Animation Prefixes": ["A_", "ABP_", "AM_", "AO_", "BS_", "SKM_", "PA_", "ABM_", "ANIM_", "ANM_"],
+    "Mesh Prefixes": ["SM_", "SK_", "PM_", "UM_", "STAT_", "INST_"],
+    "Niagara Prefixes": ["NS_"],
+    "UI Prefixes": ["WBP_", "UI_"],
+    "VFX Prefixes": ["FX_", "VFX_"],
+    "Misc Prefixes": ["_C", "SBZ_", "BB_", "C_", "CT_", "DA_", "EQS_", "FFE_", "FT_", "SS_", "ST_", "SLOT_", "Var_", "WAD_", "WGD_", "WMD_", "WPD_", "WSD_", "WTD_"]
 }
 
 # Application Version
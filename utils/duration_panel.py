@@ -0,0 +1,243 @@
+# utils/duration_panel.py
+import os
+import time
+import queue
+import logging
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from utils.tooltip import ToolTip
+from utils.virtual_list import VirtualList, sort_records
+from utils.walker import list_dir
+from utils.waveform_thumbnails import COLUMN_WIDTH, WaveformThumbnails
+from utils.wav_duration import DEFAULT_TOLERANCE_MS, TOLERANCES_MS, DurationWorker
+
+NUMERIC_COLUMNS = ("duration", "original_duration", "difference")
+
+# Mismatches sort first when sorting by status
+STATUS_ORDER = {"longer": 0, "shorter": 1, "error": 2, "no-original": 3, "trimmed": 4, "padded": 5, "ok": 6}
+
+STATUS_LABELS = {
+    "ok": "OK",
+    "longer": "Too long",
+    "shorter": "Too short",
+    "trimmed": "Trimmed",
+    "padded": "Padded",
+    "no-original": "No original",
+    "error": "Error"
+}
+
+
+def format_seconds(value):
+    return "" if value is None else f"{value:.3f} s"
+
+
+class DurationPanel(ttk.Frame):
+    """
+    Compares the length of replacement WAVs with the original media they replace and can trim or pad them.
+
+    `get_folder_indexes()` is called when a check starts and returns the (folder, WwiseIdIndex or None) pairs
+    of the selected audio folders, or None after telling the user why there are none; the tab owns the
+    work folder and the CSVs. Results are the dicts check_duration() returns, shown with a waveform thumbnail
+    so similarly named lines can be told apart at a glance.
+    """
+    def __init__(self, parent, get_folder_indexes, **kwargs):
+        super().__init__(parent, style='TFrame', **kwargs)
+        self.get_folder_indexes = get_folder_indexes
+        self.worker = None
+        self.folder_indexes = []
+        self.folder = ""
+        self.results = []
+        # path -> index in results while fitting, so the new lengths replace the old rows
+        self.positions = {}
+        self.sort_key = "status"
+        self.sort_descending = False
+        self.started = 0.0
+        self.thumbnails = WaveformThumbnails(self, on_ready=lambda: self.results_list.refresh())
+
+        self.tolerance_var = tk.StringVar(value=str(DEFAULT_TOLERANCE_MS))
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        toolbar = ttk.Frame(self, style='TFrame')
+        toolbar.pack(fill='x', pady=(0, 5))
+
+        self.check_button = ttk.Button(toolbar, text="Check Folder...", command=self.start_check, style='TButton')
+        self.check_button.pack(side='left', padx=(0, 5))
+        ToolTip(self.check_button, "Pick a folder of replacement WAVs named after Wwise IDs or names and compare each with the length of the original media in the selected audio folders. Only file headers are read.")
+
+        self.fit_button = ttk.Button(toolbar, text="Trim/Pad to Original", command=self.start_fit, style='TButton', state='disabled')
+        self.fit_button.pack(side='left', padx=(0, 5))
+        ToolTip(self.fit_button, "Cut the WAVs that are too long (with a short fade-out) and add silence to the ones that are too short, so each matches its original. The files are changed in place.")
+
+        ttk.Label(toolbar, text="Tolerance:", style='TLabel').pack(side='left', padx=(5, 5))
+        tolerance_combobox = ttk.Combobox(toolbar, textvariable=self.tolerance_var, state='readonly', width=4, style='TCombobox')
+        tolerance_combobox['values'] = TOLERANCES_MS
+        tolerance_combobox.pack(side='left')
+        ttk.Label(toolbar, text="ms", style='TLabel').pack(side='left', padx=(2, 10))
+
+        self.cancel_button = ttk.Button(toolbar, text="Cancel", command=self.cancel, style='TButton', state='disabled')
+        self.cancel_button.pack(side='left', padx=(0, 10))
+
+        self.summary_label = ttk.Label(toolbar, text="", style='TLabel', foreground="#999999")
+        self.summary_label.pack(side='left')
+
+        self.results_list = VirtualList(self, columns=(
+            ("name", "File", 180, 'w', True),
+            ("original", "Original File", 140, 'w', True),
+            ("original_duration", "Orig. Length", 80, 'e', False),
+            ("duration", "Length", 75, 'e', False),
+            ("difference", "Difference", 80, 'e', False),
+            ("status", "Status", 80, 'w', False),
+            ("note", "Note", 140, 'w', True)
+        ), fetch_rows=self.fetch_rows, on_sort=self.sort_by, fetch_images=self.fetch_images, image_width=COLUMN_WIDTH)
+        self.results_list.pack(fill='both', expand=True)
+
+    # --- Running ---
+
+    def set_busy(self, busy):
+        self.check_button.config(state='disabled' if busy else 'normal')
+        self.fit_button.config(state='disabled' if busy or not self.mismatched_paths() else 'normal')
+        self.cancel_button.config(state='normal' if busy else 'disabled')
+
+    def mismatched_paths(self):
+        return [result["path"] for result in self.results if result["status"] in ("longer", "shorter")]
+
+    def start_check(self):
+        folder_indexes = self.get_folder_indexes()
+        if folder_indexes is None:
+            return
+        folder = filedialog.askdirectory(title="Select the folder with the replacement WAV files")
+        if not folder:
+            return
+        try:
+            entries, _ = list_dir(folder)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not read {folder}: {e}")
+            return
+        paths = sorted(entry.path for entry in entries if entry.name.lower().endswith(".wav"))
+        if not paths:
+            messagebox.showinfo("No Files", f"No .wav files found in {folder}.")
+            return
+
+        self.folder = folder
+        self.folder_indexes = folder_indexes
+        self.results = []
+        self.results_list.set_count(0)
+        self.start_worker(paths, fit=False)
+
+    def start_fit(self):
+        paths = self.mismatched_paths()
+        confirmation = messagebox.askyesno(
+            "Trim/Pad to Original",
+            f"Change the length of {len(paths)} WAV files in {self.folder} to match their originals?\n\n"
+            f"Files that are too long are cut with a short fade-out, files that are too short get silence at the end. The files are overwritten."
+        )
+        if confirmation:
+            self.start_worker(paths, fit=True)
+
+    def start_worker(self, paths, fit):
+        self.positions = {result["path"]: i for i, result in enumerate(self.results)}
+        self.started = time.perf_counter()
+        self.summary_label.config(text=f"{'Fitting' if fit else 'Checking'} {len(paths)} files...")
+        self.worker = DurationWorker(paths, self.folder_indexes, tolerance_ms=int(self.tolerance_var.get()), fit=fit)
+        self.worker.start()
+        self.set_busy(True)
+        self.after(100, self.poll_worker)
+
+    def cancel(self):
+        if self.worker:
+            self.worker.cancel()
+            self.cancel_button.config(state='disabled')
+
+    def poll_worker(self):
+        """Collects the results from the worker's queue, then shows them sorted once it is done."""
+        worker = self.worker
+        finished = None
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    _, done_count, total, results, failed = message
+                    for result in results:
+                        self.store_result(result)
+                    for path, error in failed:
+                        self.store_result({
+                            "path": path, "original": None, "duration": None, "original_duration": None,
+                            "difference": None, "status": "error", "note": error
+                        })
+                    self.summary_label.config(text=f"{done_count} of {total} files...")
+                elif kind == "error":
+                    logging.error(message[1])
+                    self.summary_label.config(text=message[1])
+                elif kind == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(100, self.poll_worker)
+            return
+
+        _, cancelled = finished
+        self.worker = None
+        self.set_busy(False)
+        self.apply_sort()
+        self.show_summary(cancelled)
+
+    def store_result(self, result):
+        result["name"] = os.path.basename(result["path"])
+        # Trimming or padding rewrote the file, so its waveform is drawn again
+        self.thumbnails.forget(result["path"])
+        position = self.positions.get(result["path"])
+        if position is None:
+            self.results.append(result)
+        else:
+            self.results[position] = result
+
+    def show_summary(self, cancelled):
+        counts = {}
+        for result in self.results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        text = ", ".join(f"{STATUS_LABELS[status]}: {count}" for status, count in sorted(counts.items(), key=lambda item: STATUS_ORDER[item[0]]))
+        text += f" ({time.perf_counter() - self.started:.1f} s)"
+        if cancelled:
+            text += ", cancelled"
+        self.summary_label.config(text=text)
+
+    # --- Table ---
+
+    def sort_by(self, key):
+        """Heading click: sorts by the column, or flips the order when it is already sorted by it."""
+        if self.worker is not None:
+            # Rows are still coming in by position
+            return
+        if key == self.sort_key:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_key = key
+            self.sort_descending = key in NUMERIC_COLUMNS
+        self.apply_sort()
+
+    def apply_sort(self):
+        if self.sort_key == "status":
+            self.results.sort(key=lambda result: (STATUS_ORDER[result["status"]], result["name"].lower()), reverse=self.sort_descending)
+        else:
+            self.results = sort_records(self.results, self.sort_key, self.sort_descending, NUMERIC_COLUMNS)
+        self.results_list.show_sort(self.sort_key, self.sort_descending)
+        self.results_list.set_count(len(self.results))
+
+    def fetch_rows(self, start, stop):
+        rows = []
+        for result in self.results[start:stop]:
+            difference = "" if result["difference"] is None else f"{result['difference'] * 1000:+.0f} ms"
+            rows.append((
+                result["name"], os.path.basename(result["original"] or ""), format_seconds(result["original_duration"]),
+                format_seconds(result["duration"]), difference, STATUS_LABELS[result["status"]], result["note"]
+            ))
+        return rows
+
+    def fetch_images(self, start, stop):
+        return self.thumbnails.images_for([result["path"] for result in self.results[start:stop]])
@@ -0,0 +1,167 @@
+# utils/log_console.py
+import tkinter as tk
+from tkinter import ttk
+from collections import deque
+
+# Severity order used by the level filter
+LEVELS = {"INFO": 0, "WARNING": 1, "ERROR": 2}
+
+
+class LogConsole(ttk.Frame):
+    """
+    A log pane that buffers messages and writes them to its Text widget in batches.
+
+    `write()` only appends to a ring buffer, so it is cheap and safe to call from worker threads.
+    The widget is refreshed on a fixed frame rate and only ever holds the last `max_lines` lines;
+    the level filter and search run over the whole history instead of the widget contents.
+    """
+    def __init__(self, parent, history_size=100_000, max_lines=2000, frame_interval=33, **kwargs):
+        super().__init__(parent, style='TFrame', **kwargs)
+        self.max_lines = max_lines
+        self.frame_interval = frame_interval
+        # (level, message) tuples, oldest entries fall off once the buffer is full
+        self.history = deque(maxlen=history_size)
+        # Entries written since the last frame. Anything older than max_lines wouldn't be shown anyway.
+        self.pending = deque(maxlen=max_lines)
+        self.line_count = 0
+        self.search_job = None
+        self.flush_job = None
+
+        self.level_var = tk.StringVar(value="All")
+        self.search_var = tk.StringVar()
+
+        self.create_widgets()
+        self.flush_job = self.after(self.frame_interval, self.flush)
+
+    def create_widgets(self):
+        # Filter and search bar
+        toolbar = ttk.Frame(self, style='TFrame')
+        toolbar.pack(fill='x', pady=(0, 5))
+
+        ttk.Label(toolbar, text="Show:", style='TLabel').pack(side='left', padx=(0, 5))
+        level_combobox = ttk.Combobox(toolbar, textvariable=self.level_var, state='readonly', width=10, style='TCombobox')
+        level_combobox['values'] = ("All", "Warnings", "Errors")
+        level_combobox.pack(side='left', padx=(0, 10))
+        level_combobox.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+
+        ttk.Label(toolbar, text="Search:", style='TLabel').pack(side='left', padx=(0, 5))
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=30, style='TEntry')
+        search_entry.pack(side='left', padx=(0, 10))
+        search_entry.bind("<KeyRelease>", self.schedule_search)
+
+        ttk.Button(toolbar, text="Clear", command=self.clear, style='TButton').pack(side='right')
+
+        self.match_label = ttk.Label(toolbar, text="", style='TLabel', foreground="#999999")
+        self.match_label.pack(side='left')
+
+        # Log text
+        text_frame = ttk.Frame(self, style='TFrame')
+        text_frame.pack(fill='both', expand=True)
+
+        self.text = tk.Text(text_frame, wrap='word', bg='#2a2a2a', fg='white', relief='flat', state='disabled', font=('Helvetica', 10), insertbackground='white')
+        scrollbar = ttk.Scrollbar(text_frame, command=self.text.yview)
+        self.text['yscrollcommand'] = scrollbar.set
+        self.text.tag_configure("WARNING", foreground="#e0c060")
+        self.text.tag_configure("ERROR", foreground="#e06060")
+
+        self.text.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+    def write(self, message, level="INFO"):
+        """Queues a message for the next frame. Safe to call from any thread."""
+        entry = (level, message)
+        self.history.append(entry)
+        self.pending.append(entry)
+
+    def min_level(self):
+        return {"Warnings": LEVELS["WARNING"], "Errors": LEVELS["ERROR"]}.get(self.level_var.get(), 0)
+
+    def is_visible(self, entry, min_level, search):
+        level, message = entry
+        if LEVELS.get(level, 0) < min_level:
+            return False
+        return not search or search in message.lower()
+
+    def flush(self):
+        """Writes everything queued since the last frame to the widget with a single insert per level run."""
+        self.flush_job = self.after(self.frame_interval, self.flush)
+        if not self.pending:
+            return
+
+        entries = []
+        while self.pending:
+            entries.append(self.pending.popleft())
+
+        min_level = self.min_level()
+        search = self.search_var.get().strip().lower()
+        entries = [entry for entry in entries if self.is_visible(entry, min_level, search)]
+        if entries:
+            self.append_entries(entries)
+
+    def append_entries(self, entries):
+        # Only follow the output if the user hasn't scrolled up to read something
+        follow = self.text.yview()[1] >= 0.999
+
+        self.text.configure(state='normal')
+        # Group consecutive lines with the same level so each run is one Tk call
+        run_level, run_lines = None, []
+        for level, message in entries[-self.max_lines:]:
+            if level != run_level and run_lines:
+                self.text.insert(tk.END, "\n".join(run_lines) + "\n", run_level)
+                run_lines = []
+            run_level = level
+            run_lines.append(message)
+        if run_lines:
+            self.text.insert(tk.END, "\n".join(run_lines) + "\n", run_level)
+
+        # Keep the widget bounded, the full history stays searchable in the ring buffer
+        self.line_count = int(self.text.index('end-1c').split('.')[0]) - 1
+        if self.line_count > self.max_lines:
+            self.text.delete("1.0", f"{self.line_count - self.max_lines + 1}.0")
+            self.line_count = self.max_lines
+        self.text.configure(state='disabled')
+
+        if follow:
+            self.text.see(tk.END)
+
+    def schedule_search(self, event=None):
+        # Wait for a pause in typing before filtering the history
+        if self.search_job:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(200, self.refresh)
+
+    def refresh(self):
+        """Rebuilds the widget from the history using the current level filter and search."""
+        self.search_job = None
+        min_level = self.min_level()
+        search = self.search_var.get().strip().lower()
+        # Workers keep appending while this runs, iterating the deque itself would raise. list() copies it in one step.
+        matches = [entry for entry in list(self.history) if self.is_visible(entry, min_level, search)]
+        self.pending.clear()
+
+        self.text.configure(state='normal')
+        self.text.delete("1.0", tk.END)
+        self.text.configure(state='disabled')
+        self.line_count = 0
+        if matches:
+            self.append_entries(matches)
+        self.text.see(tk.END)
+
+        if search or min_level:
+            shown = min(len(matches), self.max_lines)
+            self.match_label.config(text=f"{len(matches)} matches" + (f", showing last {shown}" if shown < len(matches) else ""))
+        else:
+            self.match_label.config(text="")
+
+    def clear(self):
+        self.history.clear()
+        self.pending.clear()
+        self.search_var.set("")
+        self.refresh()
+
+    def destroy(self):
+        if self.flush_job:
+            self.after_cancel(self.flush_job)
+        if self.search_job:
+            self.after_cancel(self.search_job)
+        super().destroy()
@@ -0,0 +1,254 @@
+# utils/loudness.py
+import math
+import queue
+import logging
+import threading
+from functools import lru_cache, partial
+import numpy as np
+from utils.riff import WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT, read_wav_info
+from utils.task_pool import run_tasks
+from utils.wav_conform import write_wav
+
+# Normalization targets offered in the tab, in LUFS
+TARGETS = (-14, -16, -18, -20, -23, -24)
+DEFAULT_TARGET = -23
+
+# Normalizing never pushes a peak above this, the gain is lowered instead
+PEAK_CEILING_DB = -1.0
+
+# Gains smaller than this leave the file alone
+MIN_GAIN_DB = 0.05
+
+# Frames per chunk read from the memory map are a multiple of the 100 ms block, this many blocks at a time
+CHUNK_BLOCKS = 64
+
+# BS.1770 gating: 400 ms blocks overlapping by 75%, an absolute gate and one relative to the ungated level
+BLOCKS_PER_GATE = 4
+ABSOLUTE_GATE = -70.0
+RELATIVE_GATE = -10.0
+
+
+def db(value):
+    return 20 * math.log10(value) if value > 0 else None
+
+
+def map_samples(path, info):
+    """Memory-maps the sample data of a WAV as an array of (frames, channels) or (frames, channels, 3) for 24-bit."""
+    bits = info["bits"]
+    shape = (info["frames"], info["channels"])
+    if info["format"] == WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        dtype = f"<f{bits // 8}"
+    elif info["format"] == WAVE_FORMAT_PCM and bits in (8, 16, 32):
+        dtype = {8: np.uint8, 16: "<i2", 32: "<i4"}[bits]
+    elif info["format"] == WAVE_FORMAT_PCM and bits == 24:
+        dtype = np.uint8
+        shape += (3,)
+    else:
+        raise ValueError(f"Unsupported WAV format (tag {info['format']:#06x}, {bits}-bit)")
+    if not info["frames"]:
+        return np.zeros(shape, dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=info["data_offset"], shape=shape)
+
+
+def to_float(raw, bits):
+    """Converts a slice of map_samples() to float32 in [-1, 1]."""
+    if raw.dtype.kind == "f":
+        return raw.astype(np.float32)
+    if bits == 8:
+        # 8-bit WAVs are unsigned
+        return (raw.astype(np.float32) - 128) / 128
+    if bits == 24:
+        raw = raw.astype(np.int32)
+        # Shift into the top three bytes so the sign carries, then back down
+        ints = ((raw[..., 0] << 8) | (raw[..., 1] << 16) | (raw[..., 2] << 24)) >> 8
+        return ints.astype(np.float32) / 8388608
+    return (raw.astype(np.float64) / 2 ** (bits - 1)).astype(np.float32)
+
+
+def biquad_response(b, a, frequencies, rate):
+    """Squared magnitude response of a biquad at the given frequencies."""
+    z = np.exp(-2j * np.pi * frequencies / rate)
+    numerator = b[0] + b[1] * z + b[2] * z ** 2
+    denominator = a[0] + a[1] * z + a[2] * z ** 2
+    return np.abs(numerator / denominator) ** 2
+
+
+def k_weighting(frequencies, rate):
+    """
+    Squared magnitude of the BS.1770 K-weighting filter (a +4 dB shelf above 1.5 kHz and a 38 Hz high-pass),
+    designed for the file's own sample rate from the same parameters the 48 kHz coefficients come from.
+    """
+    gain = 10 ** (4.0 / 40)
+    w0 = 2 * np.pi * 1500 / rate
+    alpha = np.sin(w0) / (2 * (1 / np.sqrt(2)))
+    cos_w0 = np.cos(w0)
+    root = 2 * np.sqrt(gain) * alpha
+    shelf_b = (
+        gain * ((gain + 1) + (gain - 1) * cos_w0 + root),
+        -2 * gain * ((gain - 1) + (gain + 1) * cos_w0),
+        gain * ((gain + 1) + (gain - 1) * cos_w0 - root)
+    )
+    shelf_a = ((gain + 1) - (gain - 1) * cos_w0 + root, 2 * ((gain - 1) - (gain + 1) * cos_w0), (gain + 1) - (gain - 1) * cos_w0 - root)
+
+    w0 = 2 * np.pi * 38 / rate
+    alpha = np.sin(w0) / (2 * 0.5)
+    cos_w0 = np.cos(w0)
+    highpass_b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+    highpass_a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+    return biquad_response(shelf_b, shelf_a, frequencies, rate) * biquad_response(highpass_b, highpass_a, frequencies, rate)
+
+
+@lru_cache(maxsize=16)
+def spectrum_weights(length, rate):
+    """K-weighting per rfft bin of a block of `length` frames, counting both halves of the spectrum."""
+    weights = k_weighting(np.fft.rfftfreq(length, 1 / rate), rate)
+    # Every bin except DC (and Nyquist for even lengths) stands for a positive and a negative frequency
+    weights[1:(length + 1) // 2] *= 2
+    return weights
+
+
+def weighted_power(blocks, rate):
+    """
+    Mean square of each K-weighted block of a (blocks, frames, channels) array, as (blocks, channels).
+
+    The filter is applied as a weight on the power spectrum of each block (Parseval), which is vectorized
+    over every block and channel at once instead of running an IIR filter sample by sample.
+    """
+    length = blocks.shape[1]
+    # NumPy's float64 transforms are faster than its float32 ones
+    spectrum = np.fft.rfft(blocks.astype(np.float64), axis=1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    return np.einsum("bfc,f->bc", power, spectrum_weights(length, rate)) / length ** 2
+
+
+def integrated_loudness(block_power):
+    """Gated loudness in LUFS from the (blocks, channels) power of the 100 ms blocks. None for silence."""
+    # 400 ms gating blocks are the mean of four consecutive 100 ms blocks
+    summed = block_power.sum(axis=1)
+    if len(summed) >= BLOCKS_PER_GATE:
+        totals = np.convolve(summed, np.ones(BLOCKS_PER_GATE) / BLOCKS_PER_GATE, mode="valid")
+    else:
+        totals = summed
+    with np.errstate(divide="ignore"):
+        levels = -0.691 + 10 * np.log10(totals)
+    gated = totals[levels > ABSOLUTE_GATE]
+    if not len(gated):
+        return None
+    relative = -0.691 + 10 * np.log10(gated.mean()) + RELATIVE_GATE
+    with np.errstate(divide="ignore"):
+        gated = gated[-0.691 + 10 * np.log10(gated) > relative]
+    return -0.691 + 10 * math.log10(gated.mean())
+
+
+def measure(samples, info):
+    """
+    Measures a memory-mapped WAV chunk by chunk, so only a few seconds of it are in memory as floats.
+    Returns (lufs, rms_db, peak_db), each None for silence.
+    """
+    rate = info["rate"]
+    channels = info["channels"]
+    block = max(1, rate // 10)
+    frames = len(samples)
+    peak = 0.0
+    square_sum = 0.0
+    block_power = []
+    for start in range(0, frames, block * CHUNK_BLOCKS):
+        chunk = to_float(samples[start:start + block * CHUNK_BLOCKS], info["bits"])
+        peak = max(peak, float(np.abs(chunk).max()))
+        square_sum += float(np.square(chunk, dtype=np.float64).sum())
+        whole = len(chunk) // block * block
+        if whole:
+            block_power.append(weighted_power(chunk[:whole].reshape(-1, block, channels), rate))
+
+    if frames < block * BLOCKS_PER_GATE and frames:
+        # Shorter than one gating block, common for SFX: the whole file counts as a single block
+        block_power = [weighted_power(to_float(samples[:], info["bits"])[None], rate)]
+    powers = np.concatenate(block_power) if block_power else np.zeros((0, channels))
+
+    rms = math.sqrt(square_sum / (frames * channels)) if frames else 0.0
+    return integrated_loudness(powers), db(rms), db(peak)
+
+
+def analyze_wav(path, target=None, ceiling=PEAK_CEILING_DB):
+    """
+    Measures a WAV and, when a target loudness is given, scales it in place to that level.
+    Runs in a worker process.
+
+    Returns a dict with the "path", "lufs", "rms" and "peak" levels (dB, None for silence), "duration",
+    "rate", "channels", the "gain" applied in dB (None if nothing was written) and a "note".
+    The gain is lowered when it would push a peak above `ceiling` dBFS.
+    """
+    info = read_wav_info(path)
+    samples = map_samples(path, info)
+    lufs, rms, peak = measure(samples, info)
+    result = {
+        "path": path, "lufs": lufs, "rms": rms, "peak": peak, "duration": info["duration"],
+        "rate": info["rate"], "channels": info["channels"], "gain": None, "note": ""
+    }
+    if target is None:
+        return result
+    if lufs is None:
+        result["note"] = "Silent, not normalized"
+        return result
+    if info["format"] != WAVE_FORMAT_PCM or info["bits"] not in (16, 24, 32):
+        result["note"] = f"{info['bits']}-bit {'float' if info['format'] == WAVE_FORMAT_IEEE_FLOAT else 'PCM'} isn't normalized"
+        return result
+
+    gain = target - lufs
+    if peak + gain > ceiling:
+        gain = ceiling - peak
+        result["note"] = f"Limited by the {ceiling:g} dB peak ceiling"
+    if abs(gain) < MIN_GAIN_DB:
+        result["note"] = "Already at the target"
+        return result
+
+    scaled = to_float(samples[:], info["bits"]) * np.float32(10 ** (gain / 20))
+    # The map has to be closed before the file can be replaced on Windows
+    del samples
+    write_wav(path, scaled, info["rate"], info["bits"])
+    result.update({"lufs": lufs + gain, "rms": rms + gain, "peak": peak + gain, "gain": gain})
+    return result
+
+
+class LoudnessWorker(threading.Thread):
+    """
+    Measures (and with a `target` in LUFS, normalizes) WAVs on a process pool, one file per task.
+
+    Messages are ("progress", done_count, total, results, failed) with the analyze_wav() dicts and the
+    (path, error) pairs since the last report, ("error", message), and finally ("done", cancelled).
+    """
+    def __init__(self, paths, target=None, max_workers=None, progress_interval=0.1):
+        super().__init__(daemon=True)
+        self.paths = list(paths)
+        self.target = target
+        self.max_workers = max_workers
+        self.progress_interval = progress_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the worker to stop once the files being measured are done."""
+        self.cancel_event.set()
+
+    def run(self):
+        total = len(self.paths)
+        done_count = 0
+        try:
+            tasks = run_tasks(partial(analyze_wav, target=self.target), self.paths, self.max_workers, self.cancel_event, self.progress_interval)
+            for finished in tasks:
+                results, failed = [], []
+                for path, result, error in finished:
+                    done_count += 1
+                    if error is not None:
+                        message = str(error) or f"{type(error).__name__}, the file is truncated or not a WAV"
+                        logging.error(f"Failed to measure {path}: {message}")
+                        failed.append((path, message))
+                        continue
+                    if result["gain"] is not None:
+                        logging.info(f"Normalized {path} by {result['gain']:+.1f} dB")
+                    results.append(result)
+                self.queue.put(("progress", done_count, total, results, failed))
+        except Exception as e:
+            self.queue.put(("error", f"Loudness analysis stopped: {e}"))
+
+        self.queue.put(("done", self.cancel_event.is_set()))
@@ -0,0 +1,226 @@
+# utils/loudness_panel.py
+import os
+import time
+import queue
+import logging
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from utils.tooltip import ToolTip
+from utils.virtual_list import VirtualList, sort_records
+from utils.walker import list_dir
+from utils.waveform_thumbnails import COLUMN_WIDTH, WaveformThumbnails
+from utils.loudness import DEFAULT_TARGET, PEAK_CEILING_DB, TARGETS, LoudnessWorker
+
+# Columns that sort loudest or longest first on the first click
+NUMERIC_COLUMNS = ("lufs", "rms", "peak", "duration", "gain")
+
+
+def format_level(value):
+    return "-inf" if value is None else f"{value:.1f}"
+
+
+class LoudnessPanel(ttk.Frame):
+    """
+    Measures the loudness of a folder of replacement WAVs and can normalize them to a target level.
+
+    Results are kept as the dicts analyze_wav() returns, files that couldn't be read get a row with only a "note".
+    Clicking a heading re-orders `self.results`; the list itself is virtual, so thousands of rows cost nothing.
+    Each row shows a waveform thumbnail, drawn once its peaks come back from the background peak worker.
+    """
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, style='TFrame', **kwargs)
+        self.worker = None
+        self.folder = ""
+        self.results = []
+        # path -> index in results while normalizing, so new levels replace the old rows
+        self.positions = {}
+        self.sort_key = "name"
+        self.sort_descending = False
+        self.started = 0.0
+        self.thumbnails = WaveformThumbnails(self, on_ready=lambda: self.results_list.refresh())
+
+        self.target_var = tk.StringVar(value=str(DEFAULT_TARGET))
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        toolbar = ttk.Frame(self, style='TFrame')
+        toolbar.pack(fill='x', pady=(0, 5))
+
+        self.analyze_button = ttk.Button(toolbar, text="Analyze Folder...", command=self.start_analysis, style='TButton')
+        self.analyze_button.pack(side='left', padx=(0, 5))
+        ToolTip(self.analyze_button, "Pick a folder of WAV files and measure the integrated loudness (LUFS), RMS and peak level of each, using all CPU cores.")
+
+        self.normalize_button = ttk.Button(toolbar, text="Normalize to", command=self.start_normalize, style='TButton', state='disabled')
+        self.normalize_button.pack(side='left', padx=(0, 5))
+        ToolTip(self.normalize_button, f"Change the volume of every analyzed file in place so it measures the target loudness. Peaks are kept below {PEAK_CEILING_DB:g} dBFS.")
+        target_combobox = ttk.Combobox(toolbar, textvariable=self.target_var, state='readonly', width=4, style='TCombobox')
+        target_combobox['values'] = TARGETS
+        target_combobox.pack(side='left')
+        ttk.Label(toolbar, text="LUFS", style='TLabel').pack(side='left', padx=(2, 10))
+
+        self.cancel_button = ttk.Button(toolbar, text="Cancel", command=self.cancel, style='TButton', state='disabled')
+        self.cancel_button.pack(side='left', padx=(0, 10))
+
+        self.summary_label = ttk.Label(toolbar, text="", style='TLabel', foreground="#999999")
+        self.summary_label.pack(side='left')
+
+        self.results_list = VirtualList(self, columns=(
+            ("name", "File", 200, 'w', True),
+            ("lufs", "LUFS", 60, 'e', False),
+            ("rms", "RMS dB", 60, 'e', False),
+            ("peak", "Peak dB", 60, 'e', False),
+            ("duration", "Length", 60, 'e', False),
+            ("gain", "Gain", 55, 'e', False),
+            ("note", "Note", 160, 'w', True)
+        ), fetch_rows=self.fetch_rows, on_sort=self.sort_by, fetch_images=self.fetch_images, image_width=COLUMN_WIDTH)
+        self.results_list.pack(fill='both', expand=True)
+
+    # --- Running ---
+
+    def set_busy(self, busy):
+        state = 'disabled' if busy else 'normal'
+        self.analyze_button.config(state=state)
+        self.normalize_button.config(state='disabled' if busy or not self.measured_paths() else 'normal')
+        self.cancel_button.config(state='normal' if busy else 'disabled')
+
+    def measured_paths(self):
+        return [result["path"] for result in self.results if result.get("lufs") is not None]
+
+    def start_analysis(self):
+        folder = filedialog.askdirectory(title="Select the folder with the WAV files to analyze")
+        if not folder:
+            return
+        try:
+            entries, _ = list_dir(folder)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not read {folder}: {e}")
+            return
+        paths = sorted(entry.path for entry in entries if entry.name.lower().endswith(".wav"))
+        if not paths:
+            messagebox.showinfo("No Files", f"No .wav files found in {folder}.")
+            return
+
+        self.folder = folder
+        self.results = []
+        self.results_list.set_count(0)
+        self.start_worker(paths, None)
+
+    def start_normalize(self):
+        paths = self.measured_paths()
+        target = int(self.target_var.get())
+        confirmation = messagebox.askyesno(
+            "Normalize Loudness",
+            f"Change the volume of {len(paths)} WAV files in {self.folder} to {target} LUFS?\n\n"
+            f"The files are overwritten. Peaks are kept below {PEAK_CEILING_DB:g} dBFS, so very dynamic files may end up quieter than the target."
+        )
+        if confirmation:
+            self.start_worker(paths, target)
+
+    def start_worker(self, paths, target):
+        self.positions = {result["path"]: i for i, result in enumerate(self.results)}
+        self.started = time.perf_counter()
+        self.summary_label.config(text=f"{'Normalizing' if target is not None else 'Analyzing'} {len(paths)} files...")
+        self.worker = LoudnessWorker(paths, target)
+        self.worker.start()
+        self.set_busy(True)
+        self.after(100, self.poll_worker)
+
+    def cancel(self):
+        if self.worker:
+            self.worker.cancel()
+            self.cancel_button.config(state='disabled')
+
+    def poll_worker(self):
+        """Collects the results from the worker's queue, then shows them sorted once it is done."""
+        worker = self.worker
+        finished = None
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    _, done_count, total, results, failed = message
+                    for result in results:
+                        self.store_result(result)
+                    for path, error in failed:
+                        self.store_result({"path": path, "note": f"Error: {error}"})
+                    self.summary_label.config(text=f"{done_count} of {total} files...")
+                elif kind == "error":
+                    logging.error(message[1])
+                    self.summary_label.config(text=message[1])
+                elif kind == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(100, self.poll_worker)
+            return
+
+        _, cancelled = finished
+        self.worker = None
+        self.set_busy(False)
+        self.apply_sort()
+        self.show_summary(worker.target, cancelled)
+
+    def store_result(self, result):
+        result["name"] = os.path.basename(result["path"])
+        # Normalizing rewrote the file, so its waveform is drawn again
+        self.thumbnails.forget(result["path"])
+        position = self.positions.get(result["path"])
+        if position is None:
+            self.results.append(result)
+        else:
+            self.results[position] = result
+
+    def show_summary(self, target, cancelled):
+        levels = [result["lufs"] for result in self.results if result.get("lufs") is not None]
+        elapsed = time.perf_counter() - self.started
+        if target is not None:
+            changed = sum(1 for result in self.results if result.get("gain") is not None)
+            text = f"Normalized {changed} files to {target} LUFS"
+        else:
+            text = f"{len(self.results)} files"
+        if levels:
+            text += f", {min(levels):.1f} to {max(levels):.1f} LUFS"
+        text += f" ({elapsed:.1f} s)"
+        if cancelled:
+            text += ", cancelled"
+        self.summary_label.config(text=text)
+
+    # --- Table ---
+
+    def sort_by(self, key):
+        """Heading click: sorts by the column, or flips the order when it is already sorted by it."""
+        if self.worker is not None:
+            # Rows are still coming in by position
+            return
+        if key == self.sort_key:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_key = key
+            self.sort_descending = key in NUMERIC_COLUMNS
+        self.apply_sort()
+
+    def apply_sort(self):
+        self.results = sort_records(self.results, self.sort_key, self.sort_descending, NUMERIC_COLUMNS)
+        self.results_list.show_sort(self.sort_key, self.sort_descending)
+        self.results_list.set_count(len(self.results))
+
+    def fetch_rows(self, start, stop):
+        rows = []
+        for result in self.results[start:stop]:
+            if "lufs" not in result:
+                rows.append((result["name"], "", "", "", "", "", result["note"]))
+                continue
+            gain = "" if result["gain"] is None else f"{result['gain']:+.1f}"
+            rows.append((
+                result["name"], format_level(result["lufs"]), format_level(result["rms"]), format_level(result["peak"]),
+                f"{result['duration']:.2f} s", gain, result["note"]
+            ))
+        return rows
+
+    def fetch_images(self, start, stop):
+        return self.thumbnails.images_for([result["path"] for result in self.results[start:stop]])
@@ -0,0 +1,159 @@
+# utils/media_inventory_panel.py
+import time
+import queue
+import logging
+from tkinter import ttk
+from utils.tooltip import ToolTip
+from utils.virtual_list import VirtualList, sort_records
+from utils.cleanup_engine import format_size
+from utils.media_metadata import MetadataCache, MediaScanWorker
+
+NUMERIC_COLUMNS = ("rate", "channels", "duration", "size")
+
+
+class MediaInventoryPanel(ttk.Frame):
+    """
+    Lists every asset in the audio folders of the work folder with the codec, sample rate, channels and length
+    read from its headers, so a work folder can be checked without opening files one by one.
+
+    `get_folder_indexes()` returns the (folder, WwiseIdIndex or None) pairs to scan, or None after telling the
+    user why there are none. Rows are build_assets() dicts; the list is virtual and sorts by any column.
+    """
+    def __init__(self, parent, get_folder_indexes, **kwargs):
+        super().__init__(parent, style='TFrame', **kwargs)
+        self.get_folder_indexes = get_folder_indexes
+        self.cache = MetadataCache()
+        self.worker = None
+        self.assets = []
+        self.sort_key = "stem"
+        self.sort_descending = False
+        self.started = 0.0
+        self.error_count = 0
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        toolbar = ttk.Frame(self, style='TFrame')
+        toolbar.pack(fill='x', pady=(0, 5))
+
+        self.scan_button = ttk.Button(toolbar, text="Scan Audio Folders", command=self.start_scan, style='TButton')
+        self.scan_button.pack(side='left', padx=(0, 5))
+        ToolTip(self.scan_button, "Read the headers of every file in the selected Media folders. Files that haven't changed since the last scan come from the cache.")
+
+        self.rescan_button = ttk.Button(toolbar, text="Full Rescan", command=lambda: self.start_scan(rebuild=True), style='TButton')
+        self.rescan_button.pack(side='left', padx=(0, 5))
+        ToolTip(self.rescan_button, "Read every header again, ignoring the cache.")
+
+        self.cancel_button = ttk.Button(toolbar, text="Cancel", command=self.cancel, style='TButton', state='disabled')
+        self.cancel_button.pack(side='left', padx=(0, 10))
+
+        self.summary_label = ttk.Label(toolbar, text="", style='TLabel', foreground="#999999")
+        self.summary_label.pack(side='left')
+
+        self.results_list = VirtualList(self, columns=(
+            ("stem", "Asset", 110, 'w', True),
+            ("name", "Wwise Name", 160, 'w', True),
+            ("folder", "Folder", 80, 'w', False),
+            ("codec", "Codec", 60, 'w', False),
+            ("rate", "Rate", 60, 'e', False),
+            ("channels", "Ch", 35, 'e', False),
+            ("duration", "Length", 70, 'e', False),
+            ("size", "Size", 70, 'e', False),
+            ("files", "Files", 110, 'w', False),
+            ("package", "Package", 90, 'w', False),
+            ("note", "Note", 140, 'w', True)
+        ), fetch_rows=self.fetch_rows, on_sort=self.sort_by)
+        self.results_list.pack(fill='both', expand=True)
+
+    # --- Running ---
+
+    def set_busy(self, busy):
+        state = 'disabled' if busy else 'normal'
+        self.scan_button.config(state=state)
+        self.rescan_button.config(state=state)
+        self.cancel_button.config(state='normal' if busy else 'disabled')
+
+    def start_scan(self, rebuild=False):
+        folder_indexes = self.get_folder_indexes()
+        if folder_indexes is None:
+            return
+        self.started = time.perf_counter()
+        self.summary_label.config(text="Scanning...")
+        self.error_count = 0
+        self.worker = MediaScanWorker(folder_indexes, self.cache, rebuild=rebuild)
+        self.worker.start()
+        self.set_busy(True)
+        self.after(100, self.poll_worker)
+
+    def cancel(self):
+        if self.worker:
+            self.worker.cancel()
+            self.cancel_button.config(state='disabled')
+
+    def poll_worker(self):
+        """Shows the scan progress, then the sorted inventory once the worker is done."""
+        worker = self.worker
+        finished = None
+        try:
+            while True:
+                message = worker.queue.get_nowait()
+                kind = message[0]
+                if kind == "progress":
+                    _, done_count, total = message
+                    self.summary_label.config(text=f"Reading headers: {done_count} of {total} files...")
+                elif kind == "error":
+                    logging.error(message[1])
+                    self.error_count += 1
+                    self.summary_label.config(text=message[1])
+                elif kind == "done":
+                    finished = message
+                    break
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.after(100, self.poll_worker)
+            return
+
+        _, cancelled, self.assets, cached_count = finished
+        self.worker = None
+        self.set_busy(False)
+        self.apply_sort()
+
+        problems = sum(1 for asset in self.assets if asset["note"])
+        total_duration = sum(asset["duration"] or 0 for asset in self.assets)
+        text = (
+            f"{len(self.assets)} assets, {total_duration / 60:.0f} min of audio, {problems} with problems "
+            f"({time.perf_counter() - self.started:.1f} s, {cached_count} files from the cache)"
+        )
+        if self.error_count:
+            text += f", {self.error_count} errors, see the log"
+        if cancelled:
+            text = "Cancelled, the list is incomplete. " + text
+        self.summary_label.config(text=text)
+
+    # --- Table ---
+
+    def sort_by(self, key):
+        """Heading click: sorts by the column, or flips the order when it is already sorted by it."""
+        if key == self.sort_key:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_key = key
+            self.sort_descending = key in NUMERIC_COLUMNS
+        self.apply_sort()
+
+    def apply_sort(self):
+        self.assets = sort_records(self.assets, self.sort_key, self.sort_descending, NUMERIC_COLUMNS)
+        self.results_list.show_sort(self.sort_key, self.sort_descending)
+        self.results_list.set_count(len(self.assets))
+
+    def fetch_rows(self, start, stop):
+        rows = []
+        for asset in self.assets[start:stop]:
+            duration = "" if asset["duration"] is None else f"{asset['duration']:.2f} s"
+            rows.append((
+                asset["stem"], asset["name"], asset["folder"], asset["codec"] or "", asset["rate"] or "",
+                asset["channels"] or "", duration, format_size(asset["size"]), asset["files"], asset["package"], asset["note"]
+            ))
+        return rows
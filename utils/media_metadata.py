@@ -0,0 +1,247 @@
+# utils/media_metadata.py
+import os
+import mmap
+import time
+import queue
+import struct
+import marshal
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.riff import codec_name, find_riff, read_wave_header
+from utils.task_pool import run_tasks
+from utils.walker import DEFAULT_WORKERS, list_dirs
+from utils.scan_index import RACY_MTIME_NS
+
+# Lives next to preferences.db
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "media_metadata.db")
+
+# Only this much of the start of each file is mapped, every header read here sits inside it
+HEADER_WINDOW = 64 * 1024
+
+# Files that carry the audio of an entry, in the order they're preferred for its row
+MEDIA_EXTENSIONS = (".wem", ".ubulk", ".uexp", ".wav")
+PACKAGE_EXTENSION = ".uasset"
+
+# Unreal package summary
+PACKAGE_TAG = 0x9E2A83C1
+
+
+def read_package_header(window):
+    """Reads the engine version from the summary at the start of a .uasset. Cooked games are often unversioned."""
+    if len(window) < 20 or struct.unpack_from("<I", window, 0)[0] != PACKAGE_TAG:
+        raise ValueError("Not an Unreal package")
+    legacy_version = struct.unpack_from("<i", window, 4)[0]
+    # Legacy version -4 dropped the UE3 version field, -8 added the UE5 one
+    offset = 8 if legacy_version == -4 else 12
+    ue4_version = struct.unpack_from("<i", window, offset)[0]
+    ue5_version = struct.unpack_from("<i", window, offset + 4)[0] if legacy_version <= -8 else 0
+    if ue5_version:
+        return f"UE5 ({ue5_version})"
+    if ue4_version:
+        return f"UE4 ({ue4_version})"
+    return "Unversioned"
+
+
+def read_file_metadata(path):
+    """
+    Reads what the header of one file says, through a read-only memory map of its first HEADER_WINDOW bytes.
+
+    Returns a dict with "package" for a .uasset, or "codec", "rate", "channels" and "duration" for media,
+    or "media": False for a .uexp/.ubulk without audio in it (the media is in its sibling). Broken headers
+    are returned as an "error" instead of raised, so they're cached like any other result. OSError is raised:
+    a file that's locked or vanished for a moment has to be read again next time.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return {"error": "Empty file"}
+            with mmap.mmap(f.fileno(), min(size, HEADER_WINDOW), access=mmap.ACCESS_READ) as window:
+                if extension == PACKAGE_EXTENSION:
+                    return {"package": read_package_header(window)}
+                offset = find_riff(window)
+                if offset < 0:
+                    if extension in (".uexp", ".ubulk"):
+                        return {"media": False}
+                    return {"error": "No RIFF/WAVE header"}
+                window.seek(offset)
+                info = read_wave_header(window, size)
+    except (ValueError, struct.error) as e:
+        return {"error": str(e)}
+    return {"codec": codec_name(info["format"]), "rate": info["rate"], "channels": info["channels"], "duration": info["duration"]}
+
+
+def folder_label(folder):
+    """"Media" for Content/WwiseAudio/Media, the language for Localized/<language>/Media."""
+    parent = os.path.dirname(os.path.normpath(folder))
+    if os.path.basename(os.path.dirname(parent)) == "Localized":
+        return os.path.basename(parent)
+    return "Media"
+
+
+class MetadataCache:
+    """
+    Header metadata per file, kept in SQLite and keyed by path, size and mtime.
+
+    A file rewritten in place changes its size or mtime, so a cached record is only used while both match.
+    Files modified in the last two seconds aren't cached, another write could land within the same mtime tick.
+    """
+    def __init__(self, db_path=DEFAULT_CACHE_PATH):
+        self.db_path = db_path
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, record BLOB NOT NULL)"
+        )
+        return conn
+
+    def load(self, folders):
+        """Returns {path: (size, mtime_ns, record)} for the files cached directly inside the folders."""
+        cached = {}
+        conn = self.connect()
+        try:
+            for folder in folders:
+                prefix = os.path.join(os.path.normpath(folder), "")
+                rows = conn.execute(
+                    "SELECT path, size, mtime_ns, record FROM files WHERE path >= ? AND path < ?",
+                    (prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+                )
+                for path, size, mtime_ns, record in rows:
+                    cached[path] = (size, mtime_ns, record)
+        finally:
+            conn.close()
+        return cached
+
+    def store(self, updates, stale=()):
+        """Saves (path, size, mtime_ns, record dict) updates and drops the stale paths."""
+        now = time.time_ns()
+        conn = self.connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                    ((path, size, mtime_ns, marshal.dumps(record)) for path, size, mtime_ns, record in updates if now - mtime_ns >= RACY_MTIME_NS)
+                )
+                conn.executemany("DELETE FROM files WHERE path = ?", ((path,) for path in stale))
+        finally:
+            conn.close()
+
+
+def build_assets(folder_indexes, files):
+    """
+    Folds per-file metadata into one row per asset (the files sharing a stem in a folder).
+
+    `files` maps each folder to [(path, size, record)]. Rows are dicts with the "stem", Wwise "name" (from
+    the folder's index, when the stem is an ID), "folder" label, the "files" extensions, total "size", the
+    "codec", "rate", "channels" and "duration" of the first file with audio, the "package" version and a "note".
+    """
+    assets = []
+    for folder, index in folder_indexes:
+        label = folder_label(folder)
+        groups = {}
+        for path, size, record in files.get(folder, []):
+            stem, extension = os.path.splitext(os.path.basename(path))
+            groups.setdefault(stem.lower(), (stem, []))[1].append((extension.lower(), size, record))
+        for stem, members in groups.values():
+            members.sort(key=lambda member: (MEDIA_EXTENSIONS + (PACKAGE_EXTENSION,)).index(member[0]))
+            asset = {
+                "stem": stem, "name": (index.name_for_id(stem) if index is not None else None) or "", "folder": label,
+                "files": " ".join(extension.lstrip(".") for extension, _, _ in members),
+                "size": sum(size for _, size, _ in members),
+                "codec": None, "rate": None, "channels": None, "duration": None, "package": "", "note": ""
+            }
+            errors = []
+            for extension, _, record in members:
+                if "error" in record:
+                    errors.append(f"{extension}: {record['error']}")
+                elif "package" in record:
+                    asset["package"] = record["package"]
+                elif "codec" in record and asset["codec"] is None:
+                    asset.update(codec=record["codec"], rate=record["rate"], channels=record["channels"], duration=record["duration"])
+            if asset["codec"] is None and not errors:
+                errors.append("No audio found")
+            asset["note"] = "; ".join(errors)
+            assets.append(asset)
+    return assets
+
+
+class MediaScanWorker(threading.Thread):
+    """
+    Inventories the audio folders of a work folder on a background thread, reading file headers only.
+
+    `folder_indexes` is a list of (folder, WwiseIdIndex or None) pairs. Files whose size and mtime match the
+    cache aren't opened at all; the rest are read on a thread pool. Files that couldn't be opened get an
+    "error" note but aren't cached, so they're tried again. Messages are ("progress", done, total),
+    ("error", message) and finally ("done", cancelled, assets, cached_count) with build_assets() rows.
+    """
+    def __init__(self, folder_indexes, cache=None, rebuild=False, max_workers=None, progress_interval=0.1):
+        super().__init__(daemon=True)
+        # Normalized so the paths built from them match the ones in the cache
+        self.folder_indexes = [(os.path.normpath(folder), index) for folder, index in folder_indexes]
+        self.cache = cache or MetadataCache()
+        self.rebuild = rebuild
+        self.max_workers = max_workers or DEFAULT_WORKERS
+        self.progress_interval = progress_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the worker to stop once the files being read are done."""
+        self.cancel_event.set()
+
+    def list_error(self, path, error):
+        self.queue.put(("error", f"Could not list {path}: {error}"))
+
+    def run(self):
+        assets = []
+        cached_count = 0
+        try:
+            folders = [folder for folder, _ in self.folder_indexes]
+            cached = {} if self.rebuild else self.cache.load(folders)
+            files = {}
+            jobs = []
+            for folder, entries in list_dirs(folders, on_error=self.list_error):
+                listed = files.setdefault(folder, [])
+                for entry in entries:
+                    extension = os.path.splitext(entry.name)[1].lower()
+                    if extension != PACKAGE_EXTENSION and extension not in MEDIA_EXTENSIONS:
+                        continue
+                    try:
+                        # Comes with the listing on Windows, so unchanged files cost no extra system call
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    hit = cached.pop(entry.path, None)
+                    if hit is not None and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+                        listed.append((entry.path, st.st_size, marshal.loads(hit[2])))
+                        cached_count += 1
+                    else:
+                        jobs.append((folder, entry.path, st.st_size, st.st_mtime_ns))
+
+            total = len(jobs)
+            done_count = 0
+            updates = []
+            tasks = run_tasks(lambda job: read_file_metadata(job[1]), jobs, self.max_workers, self.cancel_event, self.progress_interval, executor_class=ThreadPoolExecutor)
+            for finished in tasks:
+                for (folder, path, size, mtime_ns), record, error in finished:
+                    done_count += 1
+                    if error is not None:
+                        # Not cached, so the file is read again on the next scan
+                        record = {"error": str(error) or type(error).__name__}
+                    else:
+                        updates.append((path, size, mtime_ns, record))
+                    files[folder].append((path, size, record))
+                self.queue.put(("progress", done_count, total))
+
+            # Whatever is left in `cached` wasn't listed again, so it was deleted or renamed
+            cancelled = self.cancel_event.is_set()
+            self.cache.store(updates, stale=() if cancelled else cached.keys())
+            assets = build_assets(self.folder_indexes, files)
+        except Exception as e:
+            self.queue.put(("error", f"Media scan stopped: {e}"))
+
+        self.queue.put(("done", self.cancel_event.is_set(), assets, cached_count))
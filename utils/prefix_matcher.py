@@ -0,0 +1,92 @@
+# utils/prefix_matcher.py
+import re
+
+
+def _build_trie(words):
+    """Builds a nested dict trie from the given words. An empty-string key marks the end of a word."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return trie
+
+
+def _trie_to_pattern(node):
+    """Turns a trie into a regex fragment where shared leading characters are only tested once."""
+    branches = []
+    ends_here = False
+    for char in sorted(node):
+        if char == "":
+            ends_here = True
+            continue
+        branches.append(re.escape(char) + _trie_to_pattern(node[char]))
+
+    if not branches:
+        return ""
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+
+    pattern = "(?:" + "|".join(branches) + ")"
+    if ends_here:
+        pattern += "?"
+    return pattern
+
+
+def compile_prefix_matcher(prefixes, extensions=(".uasset", ".umap")):
+    """
+    Compiles the selected prefixes and file extensions into a single anchored regex.
+
+    Returns a match function that takes a file name and returns a match object (or None).
+    `match.group(1)` is the prefix the file name started with.
+    """
+    prefixes = [prefix for prefix in prefixes if prefix]
+    if not prefixes or not extensions:
+        return lambda file_name: None
+
+    prefix_pattern = _trie_to_pattern(_build_trie(prefixes))
+    extension_pattern = _trie_to_pattern(_build_trie(extensions))
+    return re.compile(f"({prefix_pattern}).*{extension_pattern}\\Z", re.DOTALL).match
+
+
+if __name__ == "__main__":
+    # Micro-benchmark: the old per-file prefix loop against the compiled matcher.
+    # Run from the repository root with `python -m utils.prefix_matcher`.
+    import random
+    import timeit
+    from utils.constants import PREFIXES
+
+    all_prefixes = list(dict.fromkeys(prefix for prefixes in PREFIXES.values() for prefix in prefixes))
+    random.seed(0)
+    stems = ["Wall", "Door", "Crate", "Glass", "Heist", "Guard", "Rifle", "Vault", "Drill", "Van"]
+    extensions = [".uasset", ".umap", ".uexp", ".ubulk", ".wem", ".json"]
+    prefixes_and_misses = all_prefixes + ["Foo_", "Env", "Lvl_", "Props"]
+    names = [
+        f"{random.choice(prefixes_and_misses)}{random.choice(stems)}_{i:06d}{random.choice(extensions)}"
+        for i in range(500_000)
+    ]
+
+    def old_loop():
+        found = 0
+        for file in names:
+            for prefix in all_prefixes:
+                if file.startswith(prefix) and (file.endswith(".uasset") or file.endswith(".umap")):
+                    found += 1
+                    break
+        return found
+
+    def compiled():
+        match = compile_prefix_matcher(all_prefixes)
+        found = 0
+        for file in names:
+            if match(file):
+                found += 1
+        return found
+
+    assert old_loop() == compiled()
+    old_time = min(timeit.repeat(old_loop, number=1, repeat=3))
+    new_time = min(timeit.repeat(compiled, number=1, repeat=3))
+    print(f"{len(names)} names, {len(all_prefixes)} prefixes")
+    print(f"Per-file prefix loop: {old_time:.3f}s")
+    print(f"Compiled matcher:     {new_time:.3f}s ({old_time / new_time:.1f}x faster)")
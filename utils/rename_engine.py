@@ -0,0 +1,233 @@
+# utils/rename_engine.py
+import os
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.rename_planner import plan_renames, rename_no_replace
+from utils.walker import list_dirs
+
+# Files that make up a Wwise media entry in a cooked mod folder
+AUDIO_EXTENSIONS = ('.uasset', '.uexp', '.ubulk', '.wav')
+
+
+def find_audio_folders(root_folder):
+    """
+    Finds Content/WwiseAudio/Media and every Content/WwiseAudio/Localized/<language>/Media folder.
+
+    Returns a list of (folder, language) pairs, where language is None for the non-localized Media folder.
+    """
+    wwise_root = os.path.join(root_folder, "Content", "WwiseAudio")
+    audio_folders = []
+
+    media_path = os.path.join(wwise_root, "Media")
+    if os.path.isdir(media_path):
+        audio_folders.append((media_path, None))
+
+    try:
+        with os.scandir(os.path.join(wwise_root, "Localized")) as it:
+            languages = sorted(entry.name for entry in it if entry.is_dir())
+    except OSError:
+        languages = []
+    for language in languages:
+        localized_media_path = os.path.join(wwise_root, "Localized", language, "Media")
+        if os.path.isdir(localized_media_path):
+            audio_folders.append((localized_media_path, language))
+
+    return audio_folders
+
+
+def collect_moves(folder, entries, index, reverting):
+    """
+    Matches one folder listing against a WwiseIdIndex.
+
+    Renaming maps "<id>.ext" to "<name>.ext", reverting maps "<name>.ext" back to "<id>.ext".
+    Returns (moves, unmapped, other_extensions) where moves are {"src", "dst"} dicts for plan_renames()
+    and the other two list the paths that were left alone.
+    """
+    moves = []
+    unmapped = []
+    other_extensions = []
+    for entry in entries:
+        stem, extension = os.path.splitext(entry.name)
+        # Strip any leading/trailing whitespace from the ID or name
+        stem = stem.strip()
+        target = index.id_for_name(stem) if reverting else index.name_for_id(stem)
+        if target is None:
+            unmapped.append(entry.path)
+        elif extension.lower() not in AUDIO_EXTENSIONS:
+            other_extensions.append(entry.path)
+        else:
+            moves.append({"src": entry.path, "dst": os.path.join(folder, f"{target}{extension}")})
+    return moves, unmapped, other_extensions
+
+
+class RenamePlanWorker(threading.Thread):
+    """
+    Lists the audio folders on a background thread, matches them against their Wwise ID index and plans the renames.
+
+    `folder_indexes` is a list of (folder, WwiseIdIndex) pairs. Messages are ("error", message) and finally
+    ("done", cancelled, ordered_moves, skipped, match_count, unmapped, other_extensions) with the plan_renames()
+    result and the paths collect_moves() left alone.
+    """
+    def __init__(self, folder_indexes, reverting):
+        super().__init__(daemon=True)
+        self.folder_indexes = list(folder_indexes)
+        self.reverting = reverting
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the worker to stop after the current folder."""
+        self.cancel_event.set()
+
+    def report_error(self, path, error):
+        self.queue.put(("error", f"Could not read folder {path}: {error}"))
+
+    def run(self):
+        indexes = dict(self.folder_indexes)
+        moves = []
+        unmapped = []
+        other_extensions = []
+        listings = {}
+        ordered, skipped = [], []
+        try:
+            # The DirEntry objects already carry the full paths
+            for folder, entries in list_dirs(indexes, on_error=self.report_error):
+                if self.cancel_event.is_set():
+                    break
+                # Every name in each folder, so the planner can spot conflicts without checking files one by one
+                listings[folder] = [entry.name for entry in entries]
+                folder_moves, folder_unmapped, folder_other = collect_moves(folder, entries, indexes[folder], self.reverting)
+                moves.extend(folder_moves)
+                unmapped.extend(folder_unmapped)
+                other_extensions.extend(folder_other)
+
+            if not self.cancel_event.is_set():
+                ordered, skipped = plan_renames(moves, listings)
+        except Exception as e:
+            self.queue.put(("error", str(e)))
+
+        self.queue.put(("done", self.cancel_event.is_set(), ordered, skipped, len(moves), unmapped, other_extensions))
+
+
+class RenameWorker(threading.Thread):
+    """
+    Executes planned renames in order on a background thread.
+
+    Each folder is renamed on its own pool thread, so several language folders finish in about the time of
+    the largest one. Within a folder renames run one at a time in the given order, since plan_renames()
+    orders chains so that a name is freed before it is reused. Cancelling stops after the current file. Messages are ("progress", done_count, total, renamed,
+    skipped, failed) with the moves renamed, the (move, reason) pairs skipped and the (move, error) pairs
+    that failed since the last report, ("error", message), and finally ("done", cancelled).
+    Every successful rename is added to `journal_batch` (a rename_journal.JournalBatch) when one is given.
+    `operation` does the actual work per move and can be swapped for another no-replace file operation,
+    such as audio_matcher.copy_no_replace.
+    """
+    def __init__(self, moves, verb="rename", journal_batch=None, max_workers=None, progress_interval=0.1, operation=rename_no_replace):
+        super().__init__(daemon=True)
+        self.moves = list(moves)
+        self.verb = verb
+        self.operation = operation
+        self.journal_batch = journal_batch
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.progress_interval = progress_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        # Guards the outcome lists and the journal, which every folder thread writes to
+        self.lock = threading.Lock()
+        self.done_count = 0
+        self.renamed = []
+        self.skipped = []
+        self.failed = []
+
+    def cancel(self):
+        """Asks the worker to stop after the file it is renaming."""
+        self.cancel_event.set()
+
+    def flush_journal(self, close=False):
+        if self.journal_batch is None:
+            return
+        try:
+            self.journal_batch.flush()
+            if close:
+                self.journal_batch.close()
+        except OSError as e:
+            logging.error(f"Could not write the rename journal: {e}")
+            self.queue.put(("error", f"Could not write the rename journal, undo may miss some files: {e}"))
+            self.journal_batch = None
+
+    def rename_folder(self, moves):
+        """
+        Renames one folder's moves in order. If something unexpected stops the folder (the journal failing,
+        say), the moves it didn't get to are reported as failed so the totals and the report still add up.
+        """
+        recorded = 0
+        try:
+            for move in moves:
+                if self.cancel_event.is_set():
+                    return
+                renamed = skipped = failed = None
+                try:
+                    self.operation(move["src"], move["dst"])
+                    renamed = move
+                    logging.info(f"{self.verb.capitalize()} {move['src']} -> {os.path.basename(move['dst'])}")
+                except FileExistsError:
+                    # Appeared after the folder was listed
+                    skipped = (move, f"{os.path.basename(move['dst'])} already exists")
+                    logging.warning(f"Skipped {move['src']}: {os.path.basename(move['dst'])} already exists.")
+                except PermissionError:
+                    error = "Access is denied. The file may be in use. Please close any programs like Unreal Engine or Wwise."
+                    failed = (move, error)
+                    logging.error(f"Failed to {self.verb} {move['src']}: {error}")
+                except Exception as e:
+                    failed = (move, str(e))
+                    logging.error(f"Failed to {self.verb} {move['src']}: {e}")
+
+                with self.lock:
+                    self.done_count += 1
+                    if renamed is not None:
+                        self.renamed.append(renamed)
+                    elif skipped is not None:
+                        self.skipped.append(skipped)
+                    else:
+                        self.failed.append(failed)
+                    recorded += 1
+                    if renamed is not None and self.journal_batch is not None:
+                        self.journal_batch.add(renamed)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            rest = moves[recorded:]
+            logging.error(f"Stopped in {os.path.dirname(moves[0]['src'])} with {len(rest)} files left: {error}")
+            with self.lock:
+                self.done_count += len(rest)
+                self.failed.extend((move, f"The folder stopped before this file: {error}") for move in rest)
+
+    def report_progress(self, total):
+        with self.lock:
+            self.flush_journal()
+            self.queue.put(("progress", self.done_count, total, self.renamed, self.skipped, self.failed))
+            self.renamed, self.skipped, self.failed = [], [], []
+
+    def run(self):
+        total = len(self.moves)
+        # Group by folder, keeping the planned order inside each one
+        folders = {}
+        for move in self.moves:
+            folders.setdefault(os.path.dirname(move["src"]), []).append(move)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(folders)))) as pool:
+            pending = {pool.submit(self.rename_folder, moves) for moves in folders.values()}
+            while pending:
+                # Throttle progress so Tk redraws don't dominate the rename time
+                done, pending = wait(pending, timeout=self.progress_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    error = future.exception()
+                    if error is not None:
+                        self.queue.put(("error", str(error)))
+                self.report_progress(total)
+
+        self.report_progress(total)
+        with self.lock:
+            self.flush_journal(close=True)
+        self.queue.put(("done", self.cancel_event.is_set()))
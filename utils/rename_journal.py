@@ -0,0 +1,95 @@
+# utils/rename_journal.py
+import os
+import json
+import time
+import uuid
+import logging
+
+# Lives next to preferences.db
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rename_journal.jsonl")
+
+
+class JournalBatch:
+    """
+    Appends the renames of one batch to the journal as they happen.
+
+    `add()` only writes to the file buffer; `flush()` pushes it to disk and is called together with each
+    progress report, so a crash loses at most the last fraction of a second of the batch.
+    """
+    def __init__(self, path, batch_id, action, undoes=None):
+        self.batch_id = batch_id
+        self.file = open(path, "a", encoding="utf-8")
+        header = {"batch": batch_id, "action": action, "time": time.strftime("%Y-%m-%d %H:%M:%S")}
+        if undoes:
+            header["undoes"] = undoes
+        self.file.write(json.dumps(header) + "\n")
+        self.file.flush()
+
+    def add(self, move):
+        self.file.write(json.dumps([self.batch_id, move["src"], move["dst"]]) + "\n")
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class RenameJournal:
+    """
+    Append-only log of every rename batch as (old path, new path) pairs.
+
+    Undo replays a batch backwards from the recorded paths alone, so it needs no CSV and works for names the
+    CSV maps ambiguously. Undoing is itself journaled as a batch that points at the one it undoes, which is
+    how partly undone batches (a cancelled undo) are picked up where they stopped.
+    """
+    def __init__(self, path=DEFAULT_JOURNAL_PATH):
+        self.path = path
+
+    def start_batch(self, action, undoes=None):
+        return JournalBatch(self.path, uuid.uuid4().hex[:12], action, undoes)
+
+    def read_batches(self):
+        """Returns every batch in order as dicts: {"batch", "action", "time", "undoes", "moves": [(src, dst)]}."""
+        batches = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash, everything before it is still valid
+                        continue
+                    if isinstance(record, dict):
+                        record["moves"] = []
+                        record.setdefault("undoes", None)
+                        batches[record["batch"]] = record
+                    elif record[0] in batches:
+                        batches[record[0]]["moves"].append((record[1], record[2]))
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logging.error(f"Could not read the rename journal {self.path}: {e}")
+            return []
+        return list(batches.values())
+
+    def last_undoable(self):
+        """
+        Returns (batch, moves) for the most recent rename batch that hasn't been fully undone, where moves are
+        the {"src", "dst"} renames that put it back, newest first. Returns (None, []) when there is nothing to undo.
+        """
+        batches = self.read_batches()
+        restored = {}
+        for batch in batches:
+            if batch["undoes"]:
+                # Stored the way they were executed, so flip them back to compare with the original moves
+                restored.setdefault(batch["undoes"], set()).update((dst, src) for src, dst in batch["moves"])
+
+        for batch in reversed(batches):
+            if batch["undoes"]:
+                continue
+            done = restored.get(batch["batch"], set())
+            moves = [{"src": dst, "dst": src} for src, dst in reversed(batch["moves"]) if (src, dst) not in done]
+            if moves:
+                return batch, moves
+        return None, []
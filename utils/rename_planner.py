@@ -0,0 +1,107 @@
+# utils/rename_planner.py
+import os
+
+
+def rename_no_replace(src, dst):
+    """
+    Renames src to dst without ever overwriting an existing file.
+
+    On Windows os.rename already refuses to replace an existing file, so it is a single call. POSIX
+    rename() silently replaces the target and the standard library has no no-replace variant, so
+    there the destination is checked first. The check stays even though plan_renames() already ruled out
+    collisions: its listings can be minutes old by the time a batch runs, and a file the game or the editor
+    wrote since would be lost for good, while one lstat() is cheap next to the rename itself.
+
+    A destination that is the source under another case (a.wem -> A.wem on a case-insensitive mount such
+    as macOS or exFAT/NTFS on Linux) is the same file, not a collision, so that rename goes ahead.
+    """
+    if os.name != "nt" and os.path.lexists(dst) and not is_case_change(src, dst):
+        raise FileExistsError(f"{os.path.basename(dst)} already exists")
+    os.rename(src, dst)
+
+
+def is_case_change(src, dst):
+    """True when dst only differs from src in case and both names lead to the same file."""
+    if src == dst or src.lower() != dst.lower():
+        return False
+    try:
+        src_stat = os.lstat(src)
+        dst_stat = os.lstat(dst)
+    except OSError:
+        return False
+    return (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino)
+
+
+def plan_renames(moves, listings):
+    """
+    Works out which renames can run and in what order, using only directory listings already in memory.
+
+    `moves` are dicts with at least "src" and "dst" paths; any other keys are passed through untouched.
+    `listings` maps each directory to the names currently in it.
+
+    Returns (ordered_moves, skipped), where skipped holds (move, reason) pairs for:
+      - several files that would get the same name
+      - destinations that already exist and aren't renamed away first
+      - renames that form a cycle (a -> b while b -> a), which would need a temporary name
+    Renames whose destination is freed by another rename in the batch are ordered after that rename.
+    Names are compared the way the file system does (case-insensitively on Windows).
+    """
+    key = os.path.normcase
+    existing = {key(os.path.join(dir_path, name)) for dir_path, names in listings.items() for name in names}
+    skipped = []
+
+    # Several sources for one destination can't be told apart, so none of them are renamed
+    by_dst = {}
+    for move in moves:
+        if move["src"] == move["dst"]:
+            continue
+        by_dst.setdefault(key(move["dst"]), []).append(move)
+    candidates = {}
+    for dst_key, group in by_dst.items():
+        if len(group) > 1:
+            reason = f"{len(group)} files would be renamed to {os.path.basename(group[0]['dst'])}"
+            skipped.extend((move, reason) for move in group)
+        else:
+            candidates[key(group[0]["src"])] = group[0]
+
+    # Each candidate's destination is either free, already taken, or the source of exactly one other
+    # candidate, so following those links gives chains that end in a free/taken name or loop back
+    depth = {}
+    failed = {}
+    for start in candidates:
+        path = []
+        on_path = set()
+        src_key = start
+        while src_key not in depth and src_key not in failed and src_key not in on_path:
+            path.append(src_key)
+            on_path.add(src_key)
+            dst_key = key(candidates[src_key]["dst"])
+            if dst_key == src_key:
+                # Only the case changes, the file doesn't collide with itself
+                depth[src_key] = 0
+            elif dst_key in candidates:
+                src_key = dst_key
+                continue
+            elif dst_key in existing:
+                failed[src_key] = f"{os.path.basename(candidates[src_key]['dst'])} already exists"
+            else:
+                depth[src_key] = 0
+            break
+
+        if src_key in on_path and src_key not in depth and src_key not in failed:
+            for cycle_key in path[path.index(src_key):]:
+                failed[cycle_key] = "part of a rename cycle"
+
+        # Walk back down the chain: a rename can run once the rename out of its destination has
+        for src_key in reversed(path):
+            if src_key in depth or src_key in failed:
+                continue
+            blocker = key(candidates[src_key]["dst"])
+            if blocker in depth:
+                depth[src_key] = depth[blocker] + 1
+            else:
+                failed[src_key] = f"{os.path.basename(candidates[src_key]['dst'])} already exists"
+
+    skipped.extend((candidates[src_key], reason) for src_key, reason in failed.items())
+    ordered = sorted((candidates[src_key] for src_key in depth), key=lambda move: depth[key(move["src"])])
+    return ordered, skipped
@@ -0,0 +1,95 @@
+# utils/rename_report.py
+import os
+import csv
+import time
+
+# Reports are kept next to cleanup.log
+REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+
+# Every file the audio rename and match actions look at ends up under exactly one of these, except
+# "converted": a WAV converted before renaming is listed again under the outcome of its rename
+OUTCOMES = (
+    "renamed",
+    "copied",             # matched replacement files
+    "converted",          # WAVs brought to the target spec, a step before their rename outcome
+    "planned",            # dry runs
+    "skipped-unmapped",   # ID or name not in the CSV
+    "skipped-extension",  # matched, but not an audio asset file
+    "no-match",           # replacement files without a close enough Wwise name
+    "collision",          # conflicts found by plan_renames() or at rename time
+    "error",
+    "not-attempted"       # left over when a batch is cancelled
+)
+
+LABELS = {
+    "renamed": "Renamed",
+    "copied": "Copied",
+    "converted": "Converted WAVs",
+    "planned": "Would rename",
+    "skipped-unmapped": "Not in the CSV",
+    "skipped-extension": "Other file types",
+    "no-match": "No close match",
+    "collision": "Conflicts",
+    "error": "Errors",
+    "not-attempted": "Not attempted (cancelled)"
+}
+
+
+class RenameReport:
+    """
+    Collects the outcome of every file in a rename batch so the log only needs a summary.
+
+    Rows are (file, target, detail) tuples per outcome; `write()` saves them as one CSV that opens in any
+    spreadsheet, with the counts in `counts()`.
+    """
+    def __init__(self, action, dry_run=False):
+        self.action = action
+        self.dry_run = dry_run
+        self.started = time.localtime()
+        self.rows = {outcome: [] for outcome in OUTCOMES}
+
+    def add(self, outcome, file_path, target="", detail=""):
+        self.rows[outcome].append((file_path, target, detail))
+
+    def add_paths(self, outcome, file_paths, detail=""):
+        self.rows[outcome].extend((file_path, "", detail) for file_path in file_paths)
+
+    def add_moves(self, outcome, moves):
+        self.rows[outcome].extend((move["src"], move["dst"], move.get("detail", "")) for move in moves)
+
+    def add_move_details(self, outcome, pairs):
+        """Adds (move, detail) pairs like the skipped and failed lists from the planner and RenameWorker."""
+        self.rows[outcome].extend((move["src"], move["dst"], detail) for move, detail in pairs)
+
+    def counts(self):
+        return {outcome: len(rows) for outcome, rows in self.rows.items()}
+
+    def summary(self):
+        """One 'Label: count' line per outcome that occurred."""
+        return "\n".join(f"{LABELS[outcome]}: {count}" for outcome, count in self.counts().items() if count)
+
+    def write(self, report_dir=REPORT_DIR):
+        """
+        Writes the report as CSV and returns its path. Raises OSError if it can't be written.
+        Names only go down to the second, so a report started in the same second as another gets a number
+        instead of overwriting it.
+        """
+        os.makedirs(report_dir, exist_ok=True)
+        suffix = "_dry_run" if self.dry_run else ""
+        base_name = f"{self.action}_{time.strftime('%Y%m%d_%H%M%S', self.started)}"
+        attempt = 1
+        while True:
+            number = f"_{attempt}" if attempt > 1 else ""
+            path = os.path.join(report_dir, f"{base_name}{number}{suffix}.csv")
+            try:
+                f = open(path, "x", newline="", encoding="utf-8")
+                break
+            except FileExistsError:
+                attempt += 1
+        with f:
+            writer = csv.writer(f)
+            writer.writerow(["outcome", "file", "target", "detail"])
+            for outcome, rows in self.rows.items():
+                for file_path, target, detail in rows:
+                    writer.writerow([outcome, file_path, target, detail])
+        return path
@@ -0,0 +1,268 @@
+# utils/results_view.py
+import os
+from tkinter import ttk
+from utils.cleanup_engine import format_size
+
+CHECKED = "☑"
+UNCHECKED = "☐"
+PARTIAL = "▣"
+
+
+class CleanupResultsView(ttk.Frame):
+    """
+    Scan results grouped by prefix category and folder, with file counts and sizes per node.
+
+    Only the category rows exist up front. Folder and asset rows are inserted the first time their
+    parent is expanded, so the view stays responsive with hundreds of thousands of results.
+    Every row can be ticked or unticked; `selected_bundles()` returns what is still ticked.
+    """
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, style='TFrame', **kwargs)
+        self.root_path = ""
+        self.category_of = {}
+        self.bundles = []
+        self.unticked = set()
+        # category -> {dir_path: [bundle indexes]}
+        self.groups = {}
+        # Row id -> (kind, category, dir_path), for rows that have been inserted
+        self.rows = {}
+        self.populated = set()
+        # Category/folder row id -> [assets, files, bytes, unticked assets], kept up to date incrementally
+        self.stats = {}
+        self.unticked_files = 0
+        self.unticked_size = 0
+        self.total_files = 0
+        self.total_size = 0
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        self.summary_label = ttk.Label(self, text="No scan results yet.", style='TLabel')
+        self.summary_label.pack(anchor='w', pady=(0, 5))
+
+        tree_frame = ttk.Frame(self, style='TFrame')
+        tree_frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(tree_frame, columns=("selected", "assets", "files", "size"), selectmode='browse')
+        self.tree.heading("#0", text="Category / Folder / Asset", anchor='w')
+        self.tree.heading("selected", text="Delete")
+        self.tree.heading("assets", text="Assets")
+        self.tree.heading("files", text="Files")
+        self.tree.heading("size", text="Size")
+        self.tree.column("#0", width=320, stretch=True)
+        self.tree.column("selected", width=50, anchor='center', stretch=False)
+        self.tree.column("assets", width=70, anchor='e', stretch=False)
+        self.tree.column("files", width=70, anchor='e', stretch=False)
+        self.tree.column("size", width=90, anchor='e', stretch=False)
+
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        self.tree.bind("<<TreeviewOpen>>", self.on_open)
+        self.tree.bind("<Button-1>", self.on_click)
+        self.tree.bind("<space>", self.on_space)
+
+    # --- Data ---
+
+    def set_results(self, root_path, bundles, category_of, unticked_paths=()):
+        """
+        Replaces the view with a new set of bundles. `category_of` maps each prefix to its category.
+        Bundles whose path is in `unticked_paths` start out unticked.
+        """
+        self.clear()
+        self.root_path = root_path
+        self.category_of = category_of
+        self.add_bundles(bundles)
+
+        if unticked_paths:
+            unticked_paths = set(unticked_paths)
+            self.set_ticked([index for index, bundle in enumerate(self.bundles) if bundle["path"] in unticked_paths], False)
+            for row_id in self.stats:
+                self.refresh_row(row_id)
+            self.update_summary()
+
+    def unticked_paths(self):
+        return {self.bundles[index]["path"] for index in self.unticked}
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+        self.bundles = []
+        self.unticked = set()
+        self.groups = {}
+        self.rows = {}
+        self.populated = set()
+        self.stats = {}
+        self.unticked_files = 0
+        self.unticked_size = 0
+        self.total_files = 0
+        self.total_size = 0
+        self.summary_label.config(text="No scan results yet.")
+
+    def add_bundles(self, bundles):
+        """Adds bundles as they stream in from a scan, only touching rows that already exist."""
+        touched = set()
+        for bundle in bundles:
+            index = len(self.bundles)
+            self.bundles.append(bundle)
+            category = self.category_of.get(bundle["prefix"], "Other")
+            file_count = len(bundle["files"])
+            self.total_files += file_count
+            self.total_size += bundle["size"]
+            for row_id in (f"cat|{category}", self.dir_row(category, bundle["dir"])):
+                stats = self.stats.setdefault(row_id, [0, 0, 0, 0])
+                stats[0] += 1
+                stats[1] += file_count
+                stats[2] += bundle["size"]
+
+            dirs = self.groups.get(category)
+            if dirs is None:
+                dirs = self.groups[category] = {}
+                self.insert_row(f"cat|{category}", "", category, ("cat", category, None), lazy=True)
+
+            indexes = dirs.get(bundle["dir"])
+            if indexes is None:
+                indexes = dirs[bundle["dir"]] = []
+                if f"cat|{category}" in self.populated:
+                    self.insert_row(self.dir_row(category, bundle["dir"]), f"cat|{category}",
+                                    self.dir_label(bundle["dir"]), ("dir", category, bundle["dir"]), lazy=True)
+            indexes.append(index)
+
+            if self.dir_row(category, bundle["dir"]) in self.populated:
+                self.insert_bundle_row(category, bundle["dir"], index)
+            touched.add((category, bundle["dir"]))
+
+        for category, dir_path in touched:
+            self.refresh_row(self.dir_row(category, dir_path))
+        for category in {category for category, _ in touched}:
+            self.refresh_row(f"cat|{category}")
+        self.update_summary()
+
+    def selected_bundles(self):
+        return [bundle for index, bundle in enumerate(self.bundles) if index not in self.unticked]
+
+    # --- Rows ---
+
+    @staticmethod
+    def dir_row(category, dir_path):
+        return f"dir|{category}|{dir_path}"
+
+    def dir_label(self, dir_path):
+        relative = os.path.relpath(dir_path, self.root_path) if self.root_path else dir_path
+        return "(root folder)" if relative == "." else relative
+
+    def insert_row(self, row_id, parent, text, info, lazy=False):
+        self.rows[row_id] = info
+        self.tree.insert(parent, 'end', iid=row_id, text=text)
+        if lazy:
+            # Placeholder child so the expand arrow shows before the real children exist
+            self.tree.insert(row_id, 'end', iid=f"{row_id}|placeholder", text="")
+        self.refresh_row(row_id)
+
+    def insert_bundle_row(self, category, dir_path, index):
+        bundle = self.bundles[index]
+        row_id = f"b|{index}"
+        self.rows[row_id] = ("bundle", category, dir_path)
+        self.tree.insert(self.dir_row(category, dir_path), 'end', iid=row_id, text=os.path.basename(bundle["path"]))
+        self.refresh_row(row_id)
+
+    def indexes_for(self, row_id):
+        kind, category, dir_path = self.rows[row_id]
+        if kind == "bundle":
+            return [int(row_id.split("|", 1)[1])]
+        if kind == "dir":
+            return self.groups[category][dir_path]
+        return [index for indexes in self.groups[category].values() for index in indexes]
+
+    def refresh_row(self, row_id):
+        if row_id not in self.rows:
+            return
+        if self.rows[row_id][0] == "bundle":
+            index = int(row_id.split("|", 1)[1])
+            bundle = self.bundles[index]
+            mark = UNCHECKED if index in self.unticked else CHECKED
+            self.tree.item(row_id, values=(mark, "", len(bundle["files"]), format_size(bundle["size"])))
+            return
+
+        assets, files, size, unticked = self.stats[row_id]
+        mark = CHECKED if unticked == 0 else UNCHECKED if unticked == assets else PARTIAL
+        self.tree.item(row_id, values=(mark, assets, files, format_size(size)))
+
+    def update_summary(self):
+        selected = len(self.bundles) - len(self.unticked)
+        self.summary_label.config(
+            text=f"{selected} of {len(self.bundles)} assets selected "
+                 f"({self.total_files - self.unticked_files} files, "
+                 f"{format_size(self.total_size - self.unticked_size)})"
+        )
+
+    # --- Events ---
+
+    def on_open(self, event=None):
+        row_id = self.tree.focus()
+        if row_id not in self.rows or row_id in self.populated:
+            return
+        self.populated.add(row_id)
+        self.tree.delete(f"{row_id}|placeholder")
+
+        kind, category, dir_path = self.rows[row_id]
+        if kind == "cat":
+            for child_dir in sorted(self.groups[category]):
+                self.insert_row(self.dir_row(category, child_dir), row_id, self.dir_label(child_dir),
+                                ("dir", category, child_dir), lazy=True)
+        elif kind == "dir":
+            for index in self.groups[category][dir_path]:
+                self.insert_bundle_row(category, dir_path, index)
+
+    def on_click(self, event):
+        # Only clicks on the Delete column toggle, the rest behave like a normal tree
+        if self.tree.identify_column(event.x) != "#1":
+            return
+        row_id = self.tree.identify_row(event.y)
+        if row_id in self.rows:
+            self.toggle(row_id)
+            return "break"
+
+    def on_space(self, event=None):
+        row_id = self.tree.focus()
+        if row_id in self.rows:
+            self.toggle(row_id)
+            return "break"
+
+    def toggle(self, row_id):
+        """Ticks or unticks a row and everything under it, then refreshes the affected rows that exist."""
+        kind, category, dir_path = self.rows[row_id]
+        indexes = self.indexes_for(row_id)
+        self.set_ticked(indexes, any(index in self.unticked for index in indexes))
+
+        affected = {f"cat|{category}"}
+        if kind == "bundle":
+            affected.update((self.dir_row(category, dir_path), row_id))
+        else:
+            dirs = self.groups[category] if kind == "cat" else {dir_path: self.groups[category][dir_path]}
+            for child_dir, child_indexes in dirs.items():
+                dir_row = self.dir_row(category, child_dir)
+                affected.add(dir_row)
+                if dir_row in self.populated:
+                    affected.update(f"b|{index}" for index in child_indexes)
+        for affected_row in affected:
+            self.refresh_row(affected_row)
+        self.update_summary()
+
+    def set_ticked(self, indexes, tick):
+        """Updates the tick state of the given bundles and the folder/category counters above them."""
+        change = -1 if tick else 1
+        for index in indexes:
+            if (index in self.unticked) != tick:
+                continue
+            if tick:
+                self.unticked.discard(index)
+            else:
+                self.unticked.add(index)
+            bundle = self.bundles[index]
+            category = self.category_of.get(bundle["prefix"], "Other")
+            self.unticked_files += change * len(bundle["files"])
+            self.unticked_size += change * bundle["size"]
+            self.stats[f"cat|{category}"][3] += change
+            self.stats[self.dir_row(category, bundle["dir"])][3] += change
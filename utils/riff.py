@@ -0,0 +1,145 @@
+# utils/riff.py
+import os
+import struct
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_ADPCM = 0x0002
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# Formats only found in Wwise .wem files
+WWISE_VORBIS = 0xFFFF
+WWISE_OPUS = (0x3040, 0x3041)
+
+CODEC_NAMES = {
+    WAVE_FORMAT_PCM: "PCM",
+    WAVE_FORMAT_ADPCM: "ADPCM",
+    WAVE_FORMAT_IEEE_FLOAT: "Float",
+    WWISE_VORBIS: "Vorbis",
+    0x3040: "Opus",
+    0x3041: "Opus"
+}
+
+# Wwise ADPCM packs 64 frames into 36 bytes per channel, unlike Microsoft ADPCM
+WWISE_ADPCM_BLOCK = 0x24
+WWISE_ADPCM_FRAMES = 64
+
+# How far into a .uexp the RIFF header of inline media is looked for
+RIFF_SEARCH_BYTES = 64 * 1024
+
+
+def read_wave_header(f, file_size=None):
+    """
+    Reads the format and the position of the samples of a RIFF/WAVE stream without reading the samples.
+
+    `f` is anything with read() and seek(), a file opened in binary mode or an mmap, positioned at the
+    RIFF header. Chunks are skipped by seeking, so only the few bytes of each chunk header are read,
+    and `file_size` is the size of the whole file when `f` only maps the start of it.
+    Returns a dict with the "format" tag (the sub-format for WAVE_FORMAT_EXTENSIBLE), "channels", "rate",
+    "bits", "block_align", "data_offset", "data_size", "frames" and "duration" in seconds. Wwise Vorbis
+    and Opus store their length in the header, ADPCM is counted from its blocks.
+    Raises ValueError for anything that isn't a WAVE file.
+    """
+    riff = f.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file")
+
+    info = None
+    data = None
+    sample_count = None
+    while info is None or data is None:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            break
+        chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        start = f.tell()
+        if chunk_id == b"fmt ":
+            fmt = f.read(min(size, 0x42))
+            if len(fmt) < 16:
+                raise ValueError("The fmt chunk is too short")
+            format_tag, channels, rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+                # The first two bytes of the sub-format GUID are the actual format tag
+                format_tag = struct.unpack("<H", fmt[24:26])[0]
+            if (format_tag == WWISE_VORBIS or format_tag in WWISE_OPUS) and len(fmt) >= 0x1C:
+                sample_count = struct.unpack("<I", fmt[0x18:0x1C])[0]
+            info = {"format": format_tag, "channels": channels, "rate": rate, "bits": bits, "block_align": block_align}
+        elif chunk_id == b"vorb" and size >= 4:
+            # Older Vorbis .wem files keep their setup in a chunk of its own
+            sample_count = struct.unpack("<I", f.read(4))[0]
+        elif chunk_id == b"data":
+            data = (start, size)
+        if info is not None and data is not None:
+            break
+        # Chunks are padded to an even length
+        try:
+            f.seek(start + size + (size & 1))
+        except ValueError:
+            # An mmap window can't seek past its end
+            break
+
+    if info is None:
+        raise ValueError("No fmt chunk")
+    if data is None:
+        raise ValueError("No data chunk")
+
+    data_offset, data_size = data
+    if file_size is not None:
+        # Files cut short (or written by streaming tools with a placeholder size) hold less than they claim
+        data_size = max(0, min(data_size, file_size - data_offset))
+    block_align = info["block_align"]
+    if sample_count is not None:
+        frames = sample_count
+    elif not block_align:
+        frames = 0
+    elif info["format"] == WAVE_FORMAT_ADPCM:
+        channels = max(1, info["channels"])
+        if block_align == WWISE_ADPCM_BLOCK * channels:
+            per_block = WWISE_ADPCM_FRAMES
+        else:
+            per_block = (block_align - 7 * channels) * 8 // (4 * channels) + 2
+        frames = data_size // block_align * per_block
+    else:
+        frames = data_size // block_align
+    info.update({
+        "data_offset": data_offset,
+        "data_size": data_size,
+        "frames": frames,
+        "duration": frames / info["rate"] if info["rate"] else 0.0
+    })
+    return info
+
+
+def codec_name(format_tag):
+    return CODEC_NAMES.get(format_tag, f"{format_tag:#06x}")
+
+
+def read_wav_info(path):
+    """read_wave_header() for a file path."""
+    with open(path, "rb") as f:
+        return read_wave_header(f, os.fstat(f.fileno()).st_size)
+
+
+def find_riff(head):
+    """Returns the offset of the first RIFF/WAVE header in a bytes-like head of a file, or -1."""
+    offset = head.find(b"RIFF")
+    while offset >= 0:
+        if head[offset + 8:offset + 12] == b"WAVE":
+            return offset
+        offset = head.find(b"RIFF", offset + 1)
+    return -1
+
+
+def read_media_info(path):
+    """
+    read_wave_header() for a .wav/.wem file or the media inside a cooked .ubulk/.uexp, which hold the .wem
+    after a short Unreal header. Raises ValueError if the file has no RIFF/WAVE data near its start.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = find_riff(f.read(RIFF_SEARCH_BYTES))
+        if offset < 0:
+            raise ValueError("No RIFF/WAVE data")
+        f.seek(offset)
+        info = read_wave_header(f, size)
+    info["riff_offset"] = offset
+    return info
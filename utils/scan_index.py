@@ -0,0 +1,265 @@
+# utils/scan_index.py
+import os
+import time
+import hashlib
+import marshal
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.walker import DEFAULT_WORKERS, list_dir
+
+# Lives next to preferences.db
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scan_index.db")
+
+# Directories modified this recently aren't trusted, since another change could land within the
+# same mtime tick (FAT and some network shares only have 2 second resolution)
+RACY_MTIME_NS = 2_000_000_000
+
+# Indexed directories are stat()ed this many to a pool task, one task per directory costs more than the stat
+STAT_CHUNK = 512
+
+
+def prefix_key(prefixes):
+    """Names a prefix selection independent of order, so the index only answers for the selection it was built with."""
+    return hashlib.sha1("\0".join(sorted(set(prefixes))).encode("utf-8", "surrogatepass")).hexdigest()[:16]
+
+
+def pack_bundles(bundles):
+    # Names relative to the directory, the full paths are rebuilt on the way out
+    return marshal.dumps([
+        (os.path.basename(bundle["path"]), bundle["prefix"], [os.path.basename(path) for path in bundle["files"]], bundle["size"])
+        for bundle in bundles
+    ])
+
+
+def stat_mtimes(paths):
+    """Returns {path: mtime_ns} for the paths that still exist."""
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            pass
+    return mtimes
+
+
+def unpack_bundles(dir_path, prefix_path, blob):
+    return [
+        {"path": prefix_path + name, "dir": dir_path, "prefix": prefix, "files": [prefix_path + file for file in files], "size": size}
+        for name, prefix, files, size in marshal.loads(blob)
+    ]
+
+
+class ScanIndex:
+    """
+    Persistent index of the matching asset bundles of every directory, keyed by the directory's mtime
+    and the prefix selection.
+
+    A directory's mtime changes whenever an entry is added, removed or renamed directly inside it, so on a
+    rescan with the same prefixes an unchanged directory costs one stat(): its file count, subdirectories
+    and bundles come from the index without listing or matching anything. Picking other prefixes lists
+    each directory once more. A file rewritten in place keeps its directory's mtime, so its size can be
+    out of date until the directory changes or a full rescan; sizes are only shown, never used to decide
+    a deletion.
+    """
+    def __init__(self, db_path=DEFAULT_INDEX_PATH):
+        self.db_path = db_path
+
+    def connect(self):
+        # Several roots can be scanned at once (see cleanup_cli), so wait for the write lock instead of failing
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(directories)")]
+        if columns and "bundles" not in columns:
+            # Written by an older version that kept whole listings; it's only a cache, so start over
+            conn.execute("DROP TABLE directories")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS directories ("
+            "path TEXT PRIMARY KEY, prefix_key TEXT NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "file_count INTEGER NOT NULL, subdirs BLOB NOT NULL, bundles BLOB NOT NULL)"
+        )
+        return conn
+
+    @staticmethod
+    def tree_range(root):
+        """Returns the (lower, upper) bounds that select every path below root with a range query."""
+        prefix = root.rstrip(os.sep) + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    def clear(self, root=None):
+        """Drops the cached directories below root, or the whole index when root is None."""
+        with self.connect() as conn:
+            if root is None:
+                conn.execute("DELETE FROM directories")
+            else:
+                root = os.path.normpath(os.path.abspath(root))
+                conn.execute(
+                    "DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)",
+                    (root, *self.tree_range(root))
+                )
+        conn.close()
+
+    def walk(self, root, prefixes, collect, rebuild=False, cancel_event=None, on_error=None, max_workers=None):
+        """
+        Yields (dir_path, file_count, subdir_paths, bundles) for every directory below root, in no particular order.
+
+        Directories that changed since the last scan with the same `prefixes` are listed and handed to
+        `collect(dir_path, file_entries)`, which returns their bundles (see cleanup_engine.collect_bundles);
+        it runs on pool threads. Pass rebuild=True to ignore the index and list everything.
+        """
+        root = os.path.normpath(os.path.abspath(root))
+        key = prefix_key(prefixes)
+        conn = self.connect()
+        try:
+            if rebuild:
+                cached = {}
+            else:
+                cached = {
+                    path: (mtime_ns, file_count, subdirs, bundles)
+                    for path, mtime_ns, file_count, subdirs, bundles in conn.execute(
+                        "SELECT path, mtime_ns, file_count, subdirs, bundles FROM directories "
+                        "WHERE prefix_key = ? AND (path = ? OR (path >= ? AND path < ?))",
+                        (key, root, *self.tree_range(root))
+                    )
+                }
+            updates = []
+
+            # Runs on the pool threads for directories that changed, so it only appends to `updates`
+            def list_changed(path):
+                mtime_ns = os.stat(path).st_mtime_ns
+                files, subdirs = list_dir(path)
+                bundles = collect(path, files)
+                if time.time_ns() - mtime_ns < RACY_MTIME_NS:
+                    mtime_ns = -1
+                updates.append((
+                    path,
+                    key,
+                    mtime_ns,
+                    len(files),
+                    marshal.dumps([os.path.basename(subdir) for subdir in subdirs]),
+                    pack_bundles(bundles)
+                ))
+                return len(files), bundles, subdirs
+
+            visited = set()
+            with ThreadPoolExecutor(max_workers=max_workers or DEFAULT_WORKERS) as pool:
+                # Every indexed directory is checked up front in a few large tasks, then the unchanged part
+                # of the tree is replayed right here and only changed directories go to the pool
+                paths = list(cached)
+                mtimes = {}
+                for chunk in pool.map(stat_mtimes, [paths[i:i + STAT_CHUNK] for i in range(0, len(paths), STAT_CHUNK)]):
+                    mtimes.update(chunk)
+
+                stack = [root]
+                pending = {}
+                try:
+                    while stack or pending:
+                        if cancel_event is not None and cancel_event.is_set():
+                            return
+                        while stack:
+                            path = stack.pop()
+                            record = cached.get(path)
+                            if record is None or mtimes.get(path) != record[0]:
+                                pending[pool.submit(list_changed, path)] = path
+                                continue
+                            # Plain concatenation, os.path.join is the slowest part of replaying a large index
+                            prefix_path = path if path.endswith(os.sep) else path + os.sep
+                            subdirs = [prefix_path + name for name in marshal.loads(record[2])]
+                            stack.extend(subdirs)
+                            visited.add(path)
+                            yield path, record[1], subdirs, unpack_bundles(path, prefix_path, record[3])
+                        if not pending:
+                            break
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            path = pending.pop(future)
+                            try:
+                                file_count, bundles, subdirs = future.result()
+                            except OSError as e:
+                                if on_error:
+                                    on_error(path, e)
+                                continue
+                            stack.extend(subdirs)
+                            visited.add(path)
+                            yield path, file_count, subdirs, bundles
+                finally:
+                    # Stop anything that hasn't started yet if the walk is cancelled or the caller stops iterating
+                    for future in pending:
+                        future.cancel()
+
+            # Rows are valid on their own, so keep them even if the walk was cancelled.
+            # Stale directories can only be told apart after a complete walk.
+            with conn:
+                if rebuild:
+                    conn.execute(
+                        "DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)",
+                        (root, *self.tree_range(root))
+                    )
+                conn.executemany("INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?)", updates)
+                if not (cancel_event is not None and cancel_event.is_set()):
+                    # Rows built with other prefixes too, a deleted directory is stale whatever it was scanned for
+                    indexed = conn.execute(
+                        "SELECT path FROM directories WHERE path = ? OR (path >= ? AND path < ?)",
+                        (root, *self.tree_range(root))
+                    ).fetchall()
+                    conn.executemany("DELETE FROM directories WHERE path = ?", [row for row in indexed if row[0] not in visited])
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    # Benchmark: a plain walk that lists and matches every directory against an unchanged rescan through the index.
+    # Run from the repository root with `python -m utils.scan_index [folder]`; without a folder a deep tree of
+    # ~31k directories and 300k files is built in a temporary directory first.
+    import sys
+    import shutil
+    import tempfile
+    import timeit
+    from utils.cleanup_engine import collect_bundles
+    from utils.constants import PREFIXES
+    from utils.prefix_matcher import compile_prefix_matcher
+    from utils.walker import walk_tree
+
+    temp_dir = tempfile.mkdtemp()
+    if len(sys.argv) > 1:
+        root = sys.argv[1]
+    else:
+        root = os.path.join(temp_dir, "Content")
+        names = ["SM_Crate", "T_Crate_D", "M_Crate", "BP_Door", "Wall", "Readme"]
+        old = time.time() - 60
+        for i in range(31_110):
+            # Ten subdirectories per level, four levels deep, about ten files per directory
+            parts = [f"D{int(digit)}" for digit in str(i + 1)]
+            path = os.path.join(root, *parts)
+            os.makedirs(path, exist_ok=True)
+            for j in range(10 if i < 30_000 else 0):
+                name = names[(i + j) % len(names)]
+                extension = (".uasset", ".uexp", ".ubulk")[j % 3]
+                open(os.path.join(path, f"{name}_{j // 3}{extension}"), "wb").close()
+        # Old enough to be trusted by the index
+        for path, _, _ in os.walk(root):
+            os.utime(path, (old, old))
+
+    prefixes = list(dict.fromkeys(prefix for category in PREFIXES.values() for prefix in category))
+    match = compile_prefix_matcher(prefixes)
+    index = ScanIndex(os.path.join(temp_dir, "scan_index.db"))
+
+    def collect(dir_path, entries):
+        return collect_bundles(dir_path, entries, match)
+
+    def plain():
+        return sum(len(collect(path, files)) for path, files, _ in walk_tree(root))
+
+    def indexed(rebuild=False):
+        return sum(len(bundles) for _, _, _, bundles in index.walk(root, prefixes, collect, rebuild=rebuild))
+
+    try:
+        found = indexed(rebuild=True)
+        assert plain() == indexed() == found
+        plain_time = min(timeit.repeat(plain, number=1, repeat=3))
+        rebuild_time = min(timeit.repeat(lambda: indexed(rebuild=True), number=1, repeat=3))
+        indexed_time = min(timeit.repeat(indexed, number=1, repeat=3))
+        print(f"{root}: {found} bundles")
+        print(f"Plain walk:        {plain_time:.3f}s")
+        print(f"Index rebuild:     {rebuild_time:.3f}s")
+        print(f"Unchanged rescan:  {indexed_time:.3f}s ({plain_time / indexed_time:.1f}x faster)")
+    finally:
+        shutil.rmtree(temp_dir)
@@ -164,6 +164,16 @@ def apply_styles(style):
                  [('Scale.trough', {'sticky': 'nswe'}),
                   ('Scale.slider', {'side': 'left', 'sticky': ''})])
 
+    # --- Treeview ---
+    style.configure('Treeview', background='#2a2a2a', fieldbackground='#2a2a2a', foreground='white', borderwidth=0, font=('Helvetica', 10), rowheight=22)
+    style.map('Treeview', background=[('selected', GREEN)], foreground=[('selected', 'white')])
+    style.configure('Treeview.Heading', background='#333333', foreground='white', relief='flat', font=('Helvetica', 10, 'bold'))
+    style.map('Treeview.Heading', background=[('active', '#444444')])
+
+    # --- PanedWindow ---
+    style.configure('TPanedwindow', background='#1a1a1a')
+    style.configure('Sash', sashthickness=6, gripcount=0, background='#333333')
+
     # --- LabelFrame ---
     style.layout('TLabelFrame', [('LabelFrame.border', {'sticky': 'nswe'}),
                                  ('LabelFrame.padding', {'sticky': 'nswe', 'children': [
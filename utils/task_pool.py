@@ -0,0 +1,45 @@
+# utils/task_pool.py
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Windows can't wait on more than 61 worker processes
+MAX_PROCESSES = 61
+
+
+def run_tasks(function, items, max_workers=None, cancel_event=None, interval=0.1, executor_class=ProcessPoolExecutor):
+    """
+    Calls function(item) for every item on a pool, one task per item, using every core by default.
+
+    Yields a list of (item, result, error) triples every `interval` seconds with the tasks that finished since
+    the last one (possibly none, so callers can keep their progress current). `error` is None on success and the
+    exception otherwise; a worker process that dies fails every task still waiting. Setting `cancel_event` drops
+    the items that haven't started, the ones already running finish and are still yielded.
+    For a process pool, `function` must be importable by the worker processes (a module-level function,
+    or a functools.partial of one).
+    """
+    items = list(items)
+    workers = max_workers or os.cpu_count() or 1
+    if executor_class is ProcessPoolExecutor:
+        workers = min(workers, MAX_PROCESSES)
+    with executor_class(max_workers=max(1, min(workers, len(items)))) as pool:
+        pending = {pool.submit(function, item): item for item in items}
+        try:
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    for future in pending:
+                        future.cancel()
+                done, _ = wait(pending, timeout=interval, return_when=FIRST_COMPLETED)
+                finished = []
+                for future in done:
+                    item = pending.pop(future)
+                    if future.cancelled():
+                        continue
+                    try:
+                        finished.append((item, future.result(), None))
+                    except Exception as e:
+                        finished.append((item, None, e))
+                yield finished
+        finally:
+            # Stop anything that hasn't started yet if the caller stops iterating
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,186 @@
+# utils/virtual_list.py
+from tkinter import ttk
+
+
+def sort_records(records, key, descending, numeric_keys):
+    """
+    Orders dict rows by one column for a heading click: numbers by value and text ignoring case.
+    Rows without a value (None or missing) go last either way round.
+    """
+    present = [record for record in records if record.get(key) is not None]
+    missing = [record for record in records if record.get(key) is None]
+    if key in numeric_keys:
+        present.sort(key=lambda record: record[key], reverse=descending)
+    else:
+        present.sort(key=lambda record: str(record[key]).lower(), reverse=descending)
+    return present + missing
+
+
+class VirtualList(ttk.Frame):
+    """
+    A flat list that only ever has as many Treeview rows as fit on screen.
+
+    The caller gives the number of rows with `set_count()` and a `fetch_rows(start, stop)` function that
+    returns the column values for that slice. Scrolling re-fills the same few Treeview items instead of
+    moving through one item per row, so a list of a hundred thousand rows costs the same as one of twenty.
+    Generates <<VirtualListSelect>> when the selection changes and <<VirtualListActivate>> on double-click
+    or Return; `selected_index()` gives the row. With `on_sort`, clicking a heading calls `on_sort(key)`;
+    the caller re-orders its rows and marks the column with `show_sort()`. With `fetch_images(start, stop)`,
+    each row also gets an image (or "") in a first column `image_width` pixels wide.
+    """
+    def __init__(self, parent, columns, fetch_rows, on_sort=None, fetch_images=None, image_width=0, **kwargs):
+        super().__init__(parent, style='TFrame', **kwargs)
+        # (key, heading, width, anchor, stretch) per column
+        self.columns = columns
+        self.fetch_rows = fetch_rows
+        self.on_sort = on_sort
+        self.fetch_images = fetch_images
+        self.image_width = image_width
+        self.count = 0
+        self.top = 0
+        self.visible = 1
+        self.selected = None
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        show = 'tree headings' if self.fetch_images else 'headings'
+        self.tree = ttk.Treeview(self, columns=[key for key, *_ in self.columns], show=show, selectmode='browse')
+        if self.fetch_images:
+            self.tree.column('#0', width=self.image_width, minwidth=self.image_width, stretch=False)
+        for key, heading, width, anchor, stretch in self.columns:
+            self.tree.heading(key, text=heading, anchor=anchor)
+            if self.on_sort:
+                self.tree.heading(key, command=lambda key=key: self.on_sort(key))
+            self.tree.column(key, width=width, anchor=anchor, stretch=stretch)
+
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<Double-1>", lambda e: self.event_generate("<<VirtualListActivate>>"))
+        self.tree.bind("<Return>", lambda e: self.event_generate("<<VirtualListActivate>>"))
+        # The Treeview only holds the visible rows, so scrolling and arrow keys are handled here
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"), ("<Home>", "home"), ("<End>", "end")):
+            self.tree.bind(key, lambda e, step=step: self.move_selection(step))
+
+    # --- Data ---
+
+    def set_count(self, count):
+        """Points the list at a new set of rows, scrolled back to the top with nothing selected."""
+        self.count = count
+        self.top = 0
+        self.selected = None
+        self.refresh()
+
+    def show_sort(self, sort_key, descending):
+        """Puts an arrow on the heading of the column the rows are sorted by."""
+        for key, heading, *_ in self.columns:
+            arrow = (" ▼" if descending else " ▲") if key == sort_key else ""
+            self.tree.heading(key, text=heading + arrow)
+
+    def selected_index(self):
+        return self.selected
+
+    def refresh(self):
+        """Fills the Treeview items with the rows currently in view."""
+        stop = min(self.count, self.top + self.visible)
+        rows = self.fetch_rows(self.top, stop) if stop > self.top else []
+        images = self.fetch_images(self.top, stop) if self.fetch_images and rows else [""] * len(rows)
+
+        items = self.tree.get_children()
+        for slot in range(len(items), len(rows)):
+            self.tree.insert('', 'end', iid=str(slot))
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        for slot, (values, image) in enumerate(zip(rows, images)):
+            self.tree.item(str(slot), values=values, image=image)
+
+        slot = None if self.selected is None else self.selected - self.top
+        if slot is not None and 0 <= slot < len(rows):
+            if self.tree.selection() != (str(slot),):
+                self.tree.selection_set(str(slot))
+            self.tree.focus(str(slot))
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if self.count:
+            self.scrollbar.set(self.top / self.count, stop / self.count)
+        else:
+            self.scrollbar.set(0, 1)
+
+    # --- Scrolling ---
+
+    def scroll_to(self, top):
+        top = max(0, min(top, self.count - self.visible))
+        if top != self.top:
+            self.top = top
+            self.refresh()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.top + rows)
+        return "break"
+
+    def yview(self, *args):
+        """Scrollbar command, same arguments as a widget's yview()."""
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.count))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.scroll_by(amount * self.visible if args[2] == "pages" else amount)
+
+    def on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        notches = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+        return self.scroll_by(-3 * notches)
+
+    def on_resize(self, event=None):
+        rowheight = int(ttk.Style(self).lookup('Treeview', 'rowheight') or 20)
+        # One row less than fits, leaving room for the heading
+        visible = max(1, self.tree.winfo_height() // rowheight - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.top = max(0, min(self.top, self.count - self.visible))
+            self.refresh()
+
+    # --- Selection ---
+
+    def on_select(self, event=None):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        index = self.top + int(selection[0])
+        if index != self.selected:
+            self.selected = index
+            self.event_generate("<<VirtualListSelect>>")
+
+    def move_selection(self, step):
+        if not self.count:
+            return "break"
+        current = self.top if self.selected is None else self.selected
+        if step == "home":
+            index = 0
+        elif step == "end":
+            index = self.count - 1
+        elif step in ("page", "-page"):
+            index = current + (self.visible if step == "page" else -self.visible)
+        else:
+            index = current + step
+        index = max(0, min(index, self.count - 1))
+
+        # Keep the selected row on screen
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.visible:
+            self.top = index - self.visible + 1
+        changed = index != self.selected
+        self.selected = index
+        self.refresh()
+        if changed:
+            self.event_generate("<<VirtualListSelect>>")
+        return "break"
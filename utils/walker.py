@@ -0,0 +1,88 @@
+# utils/walker.py
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Directory listing is I/O bound, so use more threads than cores (helps a lot on network shares)
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def list_dir(path):
+    """
+    Lists a single directory with os.scandir.
+
+    Returns (file_entries, subdir_paths). The DirEntry objects are handed out as-is so callers
+    can reuse the type and stat data scandir already fetched instead of stat-ing paths again.
+    """
+    files = []
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                else:
+                    files.append(entry)
+            except OSError:
+                # The entry vanished or can't be read, same as os.walk skipping it
+                continue
+    return files, subdirs
+
+
+def walk_tree(root, max_workers=None, cancel_event=None, lister=list_dir, on_error=None):
+    """
+    Walks a directory tree, listing subdirectories in parallel on a thread pool.
+
+    Yields (dir_path, file_entries, subdir_paths) for every directory as soon as it has been listed,
+    so the order is not deterministic. Subdirectories are queued before the caller gets the entries,
+    which keeps the pool busy while the caller works. Unreadable directories are skipped and
+    reported to `on_error(path, exception)` when given. Setting `cancel_event` stops the walk.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or DEFAULT_WORKERS) as pool:
+        pending = {pool.submit(lister, root): root}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        files, subdirs = future.result()
+                    except OSError as e:
+                        if on_error:
+                            on_error(path, e)
+                        continue
+
+                    if cancel_event is not None and cancel_event.is_set():
+                        return
+
+                    for subdir in subdirs:
+                        pending[pool.submit(lister, subdir)] = subdir
+                    yield path, files, subdirs
+        finally:
+            # Stop anything that hasn't started yet if we return early or the caller stops iterating
+            for future in pending:
+                future.cancel()
+
+
+def list_dirs(paths, max_workers=None, on_error=None):
+    """
+    Lists a fixed set of directories (non-recursively) in parallel.
+
+    Yields (dir_path, file_entries) for each directory as it finishes.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or DEFAULT_WORKERS) as pool:
+        pending = {pool.submit(list_dir, path): path for path in paths}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    try:
+                        files, _ = future.result()
+                    except OSError as e:
+                        if on_error:
+                            on_error(path, e)
+                        continue
+                    yield path, files
+        finally:
+            for future in pending:
+                future.cancel()
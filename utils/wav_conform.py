@@ -0,0 +1,200 @@
+# utils/wav_conform.py
+import os
+import queue
+import wave
+import logging
+import threading
+from math import gcd
+from functools import partial
+import numpy as np
+from utils.task_pool import run_tasks
+
+# What Wwise imports cleanly for game audio; the tab lets the user pick another spec
+DEFAULT_SPEC = {"rate": 48000, "bits": 16, "channels": 1}
+
+SAMPLE_RATES = (48000, 44100, 32000, 24000, 22050, 16000)
+BIT_DEPTHS = (16, 24, 32)
+
+# Taps of the windowed-sinc resampling filter, and how many output frames are computed per block
+RESAMPLE_TAPS = 32
+RESAMPLE_BLOCK = 16384
+
+
+def read_wav(path):
+    """Reads a PCM WAV into a float32 (frames, channels) array in [-1, 1]. Returns (samples, rate, bits)."""
+    with wave.open(path, "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        # 8-bit WAVs are unsigned
+        samples = (np.frombuffer(data, np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(data, "<i2").astype(np.float32) / 32768
+    elif width == 3:
+        raw = np.frombuffer(data, np.uint8).reshape(-1, 3).astype(np.int32)
+        # Shift into the top three bytes so the sign carries, then back down
+        ints = ((raw[:, 0] << 8) | (raw[:, 1] << 16) | (raw[:, 2] << 24)) >> 8
+        samples = ints.astype(np.float32) / 8388608
+    elif width == 4:
+        samples = (np.frombuffer(data, "<i4").astype(np.float64) / 2147483648).astype(np.float32)
+    else:
+        raise ValueError(f"{width * 8}-bit samples aren't supported")
+    return samples.reshape(-1, channels), rate, width * 8
+
+
+def encode_pcm(samples, bits):
+    """Turns float samples into little-endian PCM bytes, with triangular dither below 24 bits."""
+    scale = 2 ** (bits - 1)
+    values = samples.astype(np.float64) * scale
+    if bits < 24:
+        rng = np.random.default_rng()
+        values += rng.random(values.shape) - rng.random(values.shape)
+    ints = np.clip(np.round(values), -scale, scale - 1)
+
+    if bits == 16:
+        return ints.astype("<i2").tobytes()
+    if bits == 24:
+        # Keep the low three bytes of each little-endian int32
+        return ints.astype("<i4").view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    if bits == 32:
+        return ints.astype("<i4").tobytes()
+    raise ValueError(f"{bits}-bit output isn't supported")
+
+
+def mix_channels(samples, channels):
+    """Down-mixes by averaging into mono, up-mixes mono by copying it, and otherwise keeps the first channels."""
+    current = samples.shape[1]
+    if channels == current:
+        return samples
+    if channels == 1:
+        return samples.mean(axis=1, keepdims=True)
+    if current == 1:
+        return np.repeat(samples, channels, axis=1)
+    if current > channels:
+        # WAV channel order starts with front left and front right
+        return samples[:, :channels]
+    raise ValueError(f"Can't mix {current} channels into {channels}")
+
+
+def resample(samples, src_rate, dst_rate, taps=RESAMPLE_TAPS):
+    """
+    Band-limited polyphase resampling with a Hann-windowed sinc, vectorized over blocks of output frames.
+
+    Output frames fall on one of `up` fractional positions between input frames, so the filter weights
+    are computed once per position instead of once per frame. The cutoff drops to the new Nyquist
+    frequency when downsampling, so nothing folds back as aliasing.
+    """
+    if src_rate == dst_rate or not len(samples):
+        return samples
+    divisor = gcd(src_rate, dst_rate)
+    up, down = dst_rate // divisor, src_rate // divisor
+    cutoff = min(1.0, dst_rate / src_rate)
+    half = taps // 2
+    offsets = np.arange(-half + 1, half + 1)
+    distance = (np.arange(up) / up)[:, None] - offsets
+    table = cutoff * np.sinc(cutoff * distance) * (0.5 + 0.5 * np.cos(np.pi * distance / half))
+    # Rows sum to one so a constant signal stays constant
+    table = (table / table.sum(axis=1, keepdims=True)).astype(np.float32)
+
+    # Taps past either end of the clip read silence
+    silence = np.zeros((half, samples.shape[1]), np.float32)
+    padded = np.concatenate([silence, samples, silence])
+    out_count = -(-len(samples) * up // down)
+    out = np.empty((out_count, samples.shape[1]), np.float32)
+    for start in range(0, out_count, RESAMPLE_BLOCK):
+        steps = np.arange(start, min(start + RESAMPLE_BLOCK, out_count)) * down
+        weights = table[steps % up]
+        indexes = (steps // up + half)[:, None] + offsets
+        for channel in range(samples.shape[1]):
+            out[start:start + len(steps), channel] = (weights * padded[indexes, channel]).sum(axis=1)
+    return out
+
+
+def write_wav(path, samples, rate, bits):
+    """Writes a PCM WAV through a temporary file next to it, so the file is either the old or the new version."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with wave.open(temp_path, "wb") as wav:
+            wav.setnchannels(samples.shape[1])
+            wav.setsampwidth(bits // 8)
+            wav.setframerate(rate)
+            wav.writeframes(encode_pcm(samples, bits))
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def conform_wav(path, spec):
+    """
+    Converts a WAV in place to the spec's rate, bit depth and channel count (None keeps the file's own).
+    Runs in a worker process. Returns (changed, description of what was done).
+    """
+    with wave.open(path, "rb") as wav:
+        params = (wav.getframerate(), wav.getsampwidth() * 8, wav.getnchannels())
+    rate = spec["rate"] or params[0]
+    bits = spec["bits"] or params[1]
+    channels = spec["channels"] or params[2]
+    if params == (rate, bits, channels):
+        return False, f"{rate} Hz, {bits}-bit, {channels} ch"
+
+    samples, source_rate, _ = read_wav(path)
+    # Mix first, so a stereo file being made mono only goes through the resampler once
+    samples = resample(mix_channels(samples, channels), source_rate, rate)
+    write_wav(path, samples, rate, bits)
+    return True, f"{params[0]} Hz, {params[1]}-bit, {params[2]} ch -> {rate} Hz, {bits}-bit, {channels} ch"
+
+
+class ConformWorker(threading.Thread):
+    """
+    Converts WAVs to a target spec on a process pool, one file per task, using every core by default.
+
+    Messages are ("progress", done_count, total, converted, unchanged, failed) with the (path, detail) pairs
+    converted and unchanged and the (path, error) pairs that failed since the last report, ("error", message),
+    and finally ("done", cancelled). Cancelling drops the files that haven't started yet.
+    """
+    def __init__(self, paths, spec, max_workers=None, progress_interval=0.1):
+        super().__init__(daemon=True)
+        self.paths = list(paths)
+        self.spec = dict(spec)
+        self.max_workers = max_workers
+        self.progress_interval = progress_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the worker to stop once the files being converted are done."""
+        self.cancel_event.set()
+
+    def run(self):
+        total = len(self.paths)
+        done_count = 0
+        try:
+            tasks = run_tasks(partial(conform_wav, spec=self.spec), self.paths, self.max_workers, self.cancel_event, self.progress_interval)
+            for finished in tasks:
+                converted, unchanged, failed = [], [], []
+                for path, result, error in finished:
+                    done_count += 1
+                    if error is not None:
+                        # wave raises a bare EOFError for files cut short
+                        message = str(error) or f"{type(error).__name__}, the file is truncated or not a WAV"
+                        logging.error(f"Failed to convert {path}: {message}")
+                        failed.append((path, message))
+                        continue
+                    changed, detail = result
+                    if changed:
+                        logging.info(f"Converted {path}: {detail}")
+                        converted.append((path, detail))
+                    else:
+                        unchanged.append((path, detail))
+                self.queue.put(("progress", done_count, total, converted, unchanged, failed))
+        except Exception as e:
+            self.queue.put(("error", f"WAV conversion stopped: {e}"))
+
+        self.queue.put(("done", self.cancel_event.is_set()))
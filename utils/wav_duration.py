@@ -0,0 +1,227 @@
+# utils/wav_duration.py
+import os
+import queue
+import logging
+import struct
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from utils.riff import WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT, read_media_info, read_wav_info
+from utils.task_pool import run_tasks
+from utils.walker import DEFAULT_WORKERS, list_dirs
+
+# Where the original media of a Wwise entry can be, in order of preference: a loose .wem, then the
+# cooked bulk data, then media stored inline in the .uexp
+ORIGINAL_EXTENSIONS = (".wem", ".ubulk", ".uexp")
+
+# How far a replacement may be off before it's flagged, in milliseconds
+TOLERANCES_MS = (1, 10, 20, 50, 100)
+DEFAULT_TOLERANCE_MS = 10
+
+# Trimmed files fade out over the last few milliseconds so the cut doesn't click
+FADE_MS = 5
+
+
+def list_originals(folders, on_error=None):
+    """Lists the audio folders in parallel. Returns {folder: {lowercase stem: [original media paths by preference]}}."""
+    originals = {}
+    for folder, entries in list_dirs(folders, on_error=on_error):
+        stems = {}
+        for entry in entries:
+            stem, extension = os.path.splitext(entry.name)
+            if extension.lower() in ORIGINAL_EXTENSIONS:
+                stems.setdefault(stem.strip().lower(), []).append(entry.path)
+        for paths in stems.values():
+            paths.sort(key=lambda path: ORIGINAL_EXTENSIONS.index(os.path.splitext(path)[1].lower()))
+        originals[folder] = stems
+    return originals
+
+
+def find_original(wav_path, folder_indexes, originals):
+    """
+    Returns the original media paths for a replacement WAV, named after either the Wwise ID or the name,
+    from the first folder that has them (Media before the languages). An empty list if none has.
+    """
+    stem = os.path.splitext(os.path.basename(wav_path))[0].strip()
+    for folder, index in folder_indexes:
+        keys = [stem]
+        if index is not None:
+            # The work folder may be named either way round
+            keys += [key for key in (index.id_for_name(stem), index.name_for_id(stem)) if key]
+        for key in keys:
+            paths = originals.get(folder, {}).get(key.lower())
+            if paths:
+                return paths
+    return []
+
+
+def fade_out(data, info, frames):
+    """Fades the last `frames` frames of raw PCM or float sample bytes linearly to silence, in place."""
+    if frames <= 0:
+        return
+    bits = info["bits"]
+    channels = info["channels"]
+    tail = memoryview(data)[-frames * info["block_align"]:]
+    ramp = np.linspace(1.0, 0.0, frames)[:, None]
+    if info["format"] == WAVE_FORMAT_IEEE_FLOAT:
+        samples = np.frombuffer(tail, f"<f{bits // 8}").reshape(frames, channels)
+        samples *= ramp
+    elif bits == 8:
+        # 8-bit WAVs are unsigned around 128
+        samples = np.frombuffer(tail, np.uint8).reshape(frames, channels)
+        samples[:] = np.round((samples.astype(np.float64) - 128) * ramp + 128)
+    elif bits == 24:
+        raw = np.frombuffer(tail, np.uint8).reshape(frames, channels, 3)
+        wide = raw.astype(np.int32)
+        ints = ((wide[..., 0] << 8) | (wide[..., 1] << 16) | (wide[..., 2] << 24)) >> 8
+        faded = np.round(ints * ramp).astype("<i4")
+        raw[:] = faded.view(np.uint8).reshape(frames, channels, 4)[..., :3]
+    else:
+        samples = np.frombuffer(tail, {16: "<i2", 32: "<i4"}[bits]).reshape(frames, channels)
+        samples[:] = np.round(samples * ramp)
+
+
+def fit_wav(path, info, frames, fade_ms=FADE_MS):
+    """
+    Trims or pads a PCM or float WAV to exactly `frames` frames without re-encoding it.
+
+    Everything before the samples (the format and any metadata chunks) is kept byte for byte; only the
+    sizes are patched. Padding is silence, trimming fades out the last `fade_ms` of what's kept.
+    Chunks after the samples are dropped. The file is replaced through a temporary file.
+    """
+    if info["format"] not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) or info["bits"] not in (8, 16, 24, 32, 64):
+        raise ValueError(f"Only PCM and float WAVs can be trimmed or padded (tag {info['format']:#06x})")
+    block_align = info["block_align"]
+    keep = min(frames, info["frames"])
+    with open(path, "rb") as f:
+        header = bytearray(f.read(info["data_offset"]))
+        data = bytearray(f.read(keep * block_align))
+    if len(data) < keep * block_align:
+        raise ValueError("The file is shorter than its header says")
+
+    if keep < info["frames"]:
+        fade_out(data, info, min(keep, info["rate"] * fade_ms // 1000))
+    silence = b"\x80" if info["bits"] == 8 else b"\x00"
+    data += silence * ((frames - keep) * block_align)
+
+    data_size = len(data)
+    pad = data_size & 1
+    struct.pack_into("<I", header, info["data_offset"] - 4, data_size)
+    struct.pack_into("<I", header, 4, len(header) - 8 + data_size + pad)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(header)
+            f.write(data)
+            if pad:
+                f.write(b"\x00")
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def check_duration(job, tolerance_ms=DEFAULT_TOLERANCE_MS, fit=False):
+    """
+    Compares the length of a replacement WAV with its original from their headers alone, and with `fit`
+    trims or pads the WAV to the original length when they differ by more than the tolerance.
+
+    `job` is a (wav_path, original_paths) pair. Returns a dict with the "path", the "original" path used,
+    both durations in seconds ("duration", "original_duration"), the "difference" (replacement minus original)
+    and a "status": ok, longer, shorter, trimmed, padded or no-original. Lengths are None where unknown.
+    """
+    path, original_paths = job
+    info = read_wav_info(path)
+    result = {
+        "path": path, "original": None, "duration": info["duration"], "original_duration": None,
+        "difference": None, "status": "no-original", "note": ""
+    }
+    original = None
+    for original_path in original_paths:
+        try:
+            original = read_media_info(original_path)
+        except ValueError:
+            continue
+        result["original"] = original_path
+        break
+    if original is None:
+        if original_paths:
+            result["note"] = "No audio data in " + ", ".join(os.path.basename(p) for p in original_paths)
+        return result
+
+    result["original_duration"] = original["duration"]
+    result["difference"] = info["duration"] - original["duration"]
+    if abs(result["difference"]) * 1000 <= tolerance_ms:
+        result["status"] = "ok"
+        return result
+    result["status"] = "longer" if result["difference"] > 0 else "shorter"
+    if not fit:
+        return result
+
+    # Match the original's length at the replacement's own sample rate
+    frames = round(original["frames"] * info["rate"] / original["rate"]) if original["rate"] else 0
+    fit_wav(path, info, frames)
+    result["status"] = "trimmed" if result["status"] == "longer" else "padded"
+    result["note"] = f"Was {info['duration']:.3f} s"
+    result["duration"] = frames / info["rate"]
+    result["difference"] = result["duration"] - original["duration"]
+    return result
+
+
+class DurationWorker(threading.Thread):
+    """
+    Pairs replacement WAVs with the original media in the audio folders and compares their lengths,
+    reading headers only. With `fit`, mismatched WAVs are trimmed or padded to the original length.
+
+    `folder_indexes` is a list of (folder, WwiseIdIndex or None) pairs, so WAVs named after either the ID or
+    the Wwise name find their original. Headers are read on a thread pool since the work is all I/O.
+    Messages are ("progress", done_count, total, results, failed) with check_duration() dicts and
+    (path, error) pairs, ("error", message), and finally ("done", cancelled).
+    """
+    def __init__(self, wav_paths, folder_indexes, tolerance_ms=DEFAULT_TOLERANCE_MS, fit=False, max_workers=None, progress_interval=0.1):
+        super().__init__(daemon=True)
+        self.wav_paths = list(wav_paths)
+        self.folder_indexes = list(folder_indexes)
+        self.tolerance_ms = tolerance_ms
+        self.fit = fit
+        self.max_workers = max_workers or DEFAULT_WORKERS
+        self.progress_interval = progress_interval
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Asks the worker to stop once the files being read are done."""
+        self.cancel_event.set()
+
+    def list_error(self, path, error):
+        self.queue.put(("error", f"Could not list {path}: {error}"))
+
+    def run(self):
+        try:
+            originals = list_originals([folder for folder, _ in self.folder_indexes], on_error=self.list_error)
+            jobs = [(path, find_original(path, self.folder_indexes, originals)) for path in self.wav_paths]
+            total = len(jobs)
+            done_count = 0
+            check = partial(check_duration, tolerance_ms=self.tolerance_ms, fit=self.fit)
+            tasks = run_tasks(check, jobs, self.max_workers, self.cancel_event, self.progress_interval, executor_class=ThreadPoolExecutor)
+            for finished in tasks:
+                results, failed = [], []
+                for (path, _), result, error in finished:
+                    done_count += 1
+                    if error is not None:
+                        logging.error(f"Failed to check the length of {path}: {error}")
+                        failed.append((path, str(error) or type(error).__name__))
+                        continue
+                    if result["status"] in ("trimmed", "padded"):
+                        logging.info(f"{result['status'].capitalize()} {path} to {result['duration']:.3f} s")
+                    results.append(result)
+                self.queue.put(("progress", done_count, total, results, failed))
+        except Exception as e:
+            self.queue.put(("error", f"Length check stopped: {e}"))
+
+        self.queue.put(("done", self.cancel_event.is_set()))
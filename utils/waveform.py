@@ -0,0 +1,194 @@
+# utils/waveform.py
+import os
+import time
+import queue
+import hashlib
+import logging
+import marshal
+import threading
+import numpy as np
+from utils.riff import read_wav_info
+from utils.loudness import map_samples, to_float
+from utils.scan_index import RACY_MTIME_NS
+
+# Peak files live in utils/cache next to the button images and the Wwise ID tables
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+# Bump whenever the cached layout or the way peaks are computed changes
+CACHE_VERSION = 1
+
+# One min/max pair per pixel column of a thumbnail
+PEAK_COLUMNS = 96
+THUMBNAIL_HEIGHT = 18
+
+# Roughly how many frames are converted to float at a time, whole thumbnail columns each
+CHUNK_FRAMES = 1 << 20
+
+
+def compute_peaks(path, columns=PEAK_COLUMNS):
+    """
+    Downsamples a PCM or float WAV to `columns` (min, max) pairs over all channels, read through a memory map.
+
+    Returns them as bytes of interleaved int8 pairs scaled to ±127, the form they're cached in.
+    Raises ValueError for formats map_samples() can't read and OSError for unreadable files.
+    """
+    info = read_wav_info(path)
+    samples = map_samples(path, info)
+    frames = info["frames"]
+    if not frames or not info["channels"]:
+        return bytes(2 * columns)
+
+    # 24-bit samples are three bytes each and need converting first, the rest are reduced as stored
+    # and only the per-column extremes converted, which is most of the speed on long files
+    bits = info["bits"]
+    channels = info["channels"]
+    packed = samples.ndim == 3
+
+    # First frame of each column, strictly increasing unless the file is shorter than the thumbnail
+    starts = np.arange(columns, dtype=np.int64) * frames // columns
+    if frames < columns:
+        block = to_float(samples[:], bits) if packed else samples[:]
+        lows = block.min(axis=1)[starts]
+        highs = block.max(axis=1)[starts]
+    else:
+        lows = []
+        highs = []
+        per_chunk = max(1, CHUNK_FRAMES * columns // frames)
+        for first in range(0, columns, per_chunk):
+            last = min(columns, first + per_chunk)
+            offset = int(starts[first])
+            stop = int(starts[last]) if last < columns else frames
+            block = samples[offset:stop]
+            if packed:
+                block = to_float(block, bits)
+            # Flattened, the frames of a column are one run of values across all channels
+            block = block.reshape(-1)
+            indices = (starts[first:last] - offset) * channels
+            lows.append(np.minimum.reduceat(block, indices))
+            highs.append(np.maximum.reduceat(block, indices))
+        lows = np.concatenate(lows)
+        highs = np.concatenate(highs)
+    del samples
+    lows = to_float(lows[:, None], bits)[:, 0]
+    highs = to_float(highs[:, None], bits)[:, 0]
+
+    peaks = np.empty((columns, 2), np.int8)
+    peaks[:, 0] = np.clip(np.round(lows * 127), -127, 127)
+    peaks[:, 1] = np.clip(np.round(highs * 127), -127, 127)
+    return peaks.tobytes()
+
+
+def render_ppm(peaks, height=THUMBNAIL_HEIGHT, color=(143, 191, 115), background=(42, 42, 42)):
+    """
+    Draws cached peaks as a binary PPM, one pixel column per (min, max) pair with a centre line for silence.
+    Tk's PhotoImage reads PPM data without any image library, so this is all a thumbnail needs.
+    """
+    pairs = np.frombuffer(peaks, np.int8).reshape(-1, 2).astype(np.float32)
+    middle = (height - 1) / 2
+    # Row 0 is the top, so the maximum sets the top edge of each column
+    tops = np.floor(middle - pairs[:, 1] / 127 * middle)
+    bottoms = np.ceil(middle - pairs[:, 0] / 127 * middle)
+    rows = np.arange(height)[:, None]
+    mask = (rows >= tops) & (rows <= bottoms)
+    pixels = np.where(mask[..., None], np.array(color, np.uint8), np.array(background, np.uint8)).astype(np.uint8)
+    return b"P6 %d %d 255\n" % (len(pairs), height) + pixels.tobytes()
+
+
+def peak_cache_path(folder):
+    # One file per folder, named after its location like the Wwise ID caches
+    key = hashlib.sha1(os.path.normcase(os.path.normpath(folder)).encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"peaks_{key}.bin")
+
+
+def read_peak_cache(folder):
+    """Returns {file name: (size, mtime_ns, peaks)} from the folder's peak file, empty if it's missing or outdated."""
+    try:
+        with open(peak_cache_path(folder), "rb") as f:
+            record = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    if not isinstance(record, dict) or record.get("version") != CACHE_VERSION or record.get("columns") != PEAK_COLUMNS:
+        return {}
+    return record["files"]
+
+
+def write_peak_cache(folder, files):
+    """Saves a folder's peaks, dropping files that no longer exist. Goes through a temporary file like write_cache()."""
+    cache_path = peak_cache_path(folder)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        present = set(os.listdir(folder))
+        files = {name: entry for name, entry in files.items() if name in present}
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temp_path, "wb") as f:
+            f.write(marshal.dumps({"version": CACHE_VERSION, "columns": PEAK_COLUMNS, "files": files}))
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"Could not write the peak cache {cache_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+class PeakWorker(threading.Thread):
+    """
+    Computes waveform peaks on one background thread for as long as the app runs.
+
+    `want(paths)` replaces whatever was still waiting, so a list only ever asks for the rows in view and
+    scrolling past thousands of files doesn't queue thousands of reads. Peaks come from the folder's peak
+    file while the size and mtime of the WAV match, otherwise they're computed and the peak file is
+    rewritten once the worker runs out of requests. Results are (path, peaks) on `queue`, with b"" for
+    files that have no thumbnail (unreadable or compressed).
+    """
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.queue = queue.Queue()
+        self.condition = threading.Condition()
+        self.wanted = []
+        # folder -> {file name: (size, mtime_ns, peaks)}, only touched by the worker thread
+        self.folders = {}
+        self.dirty = set()
+
+    def want(self, paths):
+        """Asks for the peaks of `paths`, in order, instead of anything asked for before."""
+        with self.condition:
+            self.wanted = list(paths)
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                if not self.dirty:
+                    self.condition.wait_for(lambda: self.wanted)
+                path = self.wanted.pop(0) if self.wanted else None
+            if path is None:
+                # Idle with new peaks, save them before waiting again
+                for folder in self.dirty:
+                    write_peak_cache(folder, self.folders[folder])
+                self.dirty.clear()
+                continue
+            self.queue.put((path, self.peaks_for(path)))
+
+    def peaks_for(self, path):
+        folder, name = os.path.split(os.path.normpath(path))
+        files = self.folders.get(folder)
+        if files is None:
+            files = self.folders[folder] = read_peak_cache(folder)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return b""
+        cached = files.get(name)
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        try:
+            peaks = compute_peaks(path)
+        except (OSError, ValueError) as e:
+            logging.debug(f"No waveform for {path}: {e}")
+            peaks = b""
+        # A file written within the same mtime tick could change again without the cache noticing
+        if time.time_ns() - st.st_mtime_ns >= RACY_MTIME_NS:
+            files[name] = (st.st_size, st.st_mtime_ns, peaks)
+            self.dirty.add(folder)
+        return peaks
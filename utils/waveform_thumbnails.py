@@ -0,0 +1,70 @@
+# utils/waveform_thumbnails.py
+import queue
+import logging
+import tkinter as tk
+from utils.waveform import PEAK_COLUMNS, PeakWorker, render_ppm
+
+# Width of the VirtualList image column, the thumbnail plus the Treeview's item indent
+COLUMN_WIDTH = PEAK_COLUMNS + 24
+
+
+class WaveformThumbnails:
+    """
+    Waveform images for the rows of a VirtualList of WAV files.
+
+    `images_for(paths)` is meant to be called from the list's `fetch_images`: it returns a PhotoImage per
+    path, or "" for the ones whose peaks aren't known yet, and hands those to a PeakWorker. When peaks come
+    back `on_ready()` is called, usually the list's refresh(), so nothing on the Tk thread ever waits for a file.
+    """
+    def __init__(self, widget, on_ready):
+        self.widget = widget
+        self.on_ready = on_ready
+        # path -> PhotoImage, or "" for files without a waveform
+        self.images = {}
+        # Paths asked for last and not back yet; the worker drops anything asked for before
+        self.pending = set()
+        self.worker = None
+        self.polling = False
+
+    def images_for(self, paths):
+        missing = [path for path in paths if path not in self.images]
+        if missing:
+            if self.worker is None:
+                self.worker = PeakWorker()
+                self.worker.start()
+            self.worker.want(missing)
+            self.pending = set(missing)
+            if not self.polling:
+                self.polling = True
+                self.widget.after(100, self.poll_worker)
+        return [self.images.get(path, "") for path in paths]
+
+    def forget(self, path):
+        """Drops the image of a file that was changed, so it's drawn again from its new peaks."""
+        self.images.pop(path, None)
+
+    def poll_worker(self):
+        arrived = False
+        try:
+            while True:
+                path, peaks = self.worker.queue.get_nowait()
+                self.images[path] = self.make_image(path, peaks)
+                self.pending.discard(path)
+                arrived = True
+        except queue.Empty:
+            pass
+        if arrived:
+            self.on_ready()
+        if self.pending:
+            self.widget.after(100, self.poll_worker)
+        else:
+            self.polling = False
+
+    def make_image(self, path, peaks):
+        if not peaks:
+            return ""
+        try:
+            return tk.PhotoImage(master=self.widget, data=render_ppm(peaks), format="PPM")
+        except tk.TclError as e:
+            logging.debug(f"Could not draw the waveform of {path}: {e}")
+            return ""
@@ -0,0 +1,315 @@
+# utils/wwise_ids.py
+import io
+import os
+import csv
+import hashlib
+import logging
+import marshal
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Parsed tables are kept in utils/cache next to the button images
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+# Bump whenever the cached layout or the parsing rules change
+CACHE_VERSION = 2
+
+# The exported CSVs start with a banner and a "Name,Wwise Id" header
+HEADER_ROWS = 7
+
+# Wwise IDs are 32-bit hashes, so they fit an unsigned 32-bit array column
+ID_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+MAX_ID = 2 ** 32
+
+# csv_path -> ((size, mtime_ns), WwiseIdIndex), shared by every action for the rest of the session
+_indexes = {}
+_lock = threading.Lock()
+
+
+def parse_csv(data):
+    """Parses the raw bytes of a Wwise media CSV into parallel (names, ids) lists."""
+    names = []
+    ids = []
+    reader = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+    for _ in range(HEADER_ROWS):
+        next(reader, None)
+    for row in reader:
+        if len(row) >= 2:
+            name = row[0].strip()
+            file_id = row[1].strip()
+            if file_id and name:
+                names.append(name)
+                ids.append(file_id)
+    return names, ids
+
+
+def parse_id(text):
+    """Returns the numeric value of a Wwise ID written the way the CSVs and file names write it, else None."""
+    if not (text.isascii() and text.isdigit()):
+        return None
+    value = int(text)
+    # "0123" isn't the same file name as "123"
+    if value >= MAX_ID or str(value) != text:
+        return None
+    return value
+
+
+class WwiseIdIndex:
+    """
+    Both directions of a Wwise media table, packed into a few flat arrays.
+
+    Names live in one UTF-8 buffer sorted case-insensitively, with an offsets array marking where each one
+    starts, and a parallel uint32 column holding each name's ID. A second pair of columns lists the IDs in
+    ascending order with the position of their name. Lookups are binary searches, so a table costs a few
+    bytes per row instead of four dict entries and two str objects.
+
+    Lookups ignore case. When an ID is listed more than once the last name wins, matching what the old
+    loaders did. When a name is listed more than once the first ID wins, and every ID for that name stays
+    available through `ids_for_name()` and `duplicate_names`. Rows whose ID isn't a 32-bit number can't be
+    a Wwise media file and are only counted in `skipped_rows`.
+    """
+    def __init__(self, name_data, name_offsets, name_ids, sorted_ids, id_positions, duplicate_names, skipped_rows=0):
+        self.name_data = name_data
+        self.name_offsets = name_offsets
+        self.name_ids = name_ids
+        self.sorted_ids = sorted_ids
+        self.id_positions = id_positions
+        # lowercased name -> every ID listed for it, only for names listed with more than one ID
+        self.duplicate_names = duplicate_names
+        self.skipped_rows = skipped_rows
+        self.positions = range(len(name_ids))
+
+    @classmethod
+    def from_rows(cls, names, ids):
+        rows = []
+        skipped_rows = 0
+        for row, (name, file_id) in enumerate(zip(names, ids)):
+            value = parse_id(file_id)
+            if value is None:
+                skipped_rows += 1
+                continue
+            rows.append((name.lower(), row, name, value))
+        # Equal names end up next to each other in the order they were listed
+        rows.sort()
+
+        chunks = []
+        name_offsets = array(ID_TYPECODE, [0])
+        name_ids = array(ID_TYPECODE)
+        duplicate_names = {}
+        offset = 0
+        run_start = 0
+        for position, (key, _, name, value) in enumerate(rows):
+            encoded = name.encode("utf-8")
+            chunks.append(encoded)
+            offset += len(encoded)
+            name_offsets.append(offset)
+            name_ids.append(value)
+
+            if key != rows[run_start][0]:
+                run_start = position
+            elif position != run_start and value != rows[run_start][3]:
+                duplicate_names[key] = [str(rows[i][3]) for i in range(run_start, position + 1)]
+
+        # Sorting by (ID, original row) puts the last listed name of a repeated ID at the end of its run
+        by_id = sorted(range(len(rows)), key=lambda position: (rows[position][3], rows[position][1]))
+        sorted_ids = array(ID_TYPECODE, (rows[position][3] for position in by_id))
+        id_positions = array(ID_TYPECODE, by_id)
+        return cls(b"".join(chunks), name_offsets, name_ids, sorted_ids, id_positions, duplicate_names, skipped_rows)
+
+    @classmethod
+    def from_record(cls, record):
+        columns = []
+        for field in ("name_offsets", "name_ids", "sorted_ids", "id_positions"):
+            column = array(ID_TYPECODE)
+            column.frombytes(record[field])
+            columns.append(column)
+        return cls(record["name_data"], *columns, record["duplicate_names"], record["skipped_rows"])
+
+    def to_record(self):
+        return {
+            "name_data": self.name_data,
+            "name_offsets": self.name_offsets.tobytes(),
+            "name_ids": self.name_ids.tobytes(),
+            "sorted_ids": self.sorted_ids.tobytes(),
+            "id_positions": self.id_positions.tobytes(),
+            "duplicate_names": self.duplicate_names,
+            "skipped_rows": self.skipped_rows
+        }
+
+    def __len__(self):
+        return len(self.name_ids)
+
+    def name(self, position):
+        return self.name_data[self.name_offsets[position]:self.name_offsets[position + 1]].decode("utf-8")
+
+    def lower_name(self, position):
+        return self.name(position).lower()
+
+    def rows(self):
+        """Yields every (name, id) pair in case-insensitive name order."""
+        for position in self.positions:
+            yield self.name(position), str(self.name_ids[position])
+
+    def find_name(self, name):
+        """Returns the position of the first row for this name, or -1."""
+        key = name.lower()
+        position = bisect_left(self.positions, key, key=self.lower_name)
+        if position < len(self.positions) and self.lower_name(position) == key:
+            return position
+        return -1
+
+    def name_for_id(self, file_id):
+        value = parse_id(file_id)
+        if value is None:
+            return None
+        index = bisect_right(self.sorted_ids, value) - 1
+        if index < 0 or self.sorted_ids[index] != value:
+            return None
+        return self.name(self.id_positions[index])
+
+    def id_for_name(self, name):
+        position = self.find_name(name)
+        return str(self.name_ids[position]) if position >= 0 else None
+
+    def ids_for_name(self, name):
+        key = name.lower()
+        if key in self.duplicate_names:
+            return list(self.duplicate_names[key])
+        file_id = self.id_for_name(name)
+        return [file_id] if file_id is not None else []
+
+
+def cache_path_for(csv_path):
+    # One file per CSV, named after its location since the user can pick CSVs from anywhere
+    key = hashlib.sha1(csv_path.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"wwise_{key}.bin")
+
+
+def read_cache(cache_path):
+    try:
+        # marshal.load() on the file object reads in tiny chunks, reading it in one go is ~10x faster
+        with open(cache_path, "rb") as f:
+            record = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(record, dict) or record.get("version") != CACHE_VERSION:
+        return None
+    return record
+
+
+def write_cache(cache_path, record):
+    # Write to a temporary file first so a crash never leaves a half-written cache behind
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, "wb") as f:
+            marshal.dump(record, f)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logging.warning(f"Could not write the Wwise ID cache {cache_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def load_index(csv_path):
+    """
+    Returns the WwiseIdIndex for a Wwise media CSV, parsing the file only when it changed.
+
+    Indexes are kept in memory for the session and on disk in utils/cache. A cached index is reused
+    when the CSV's size and mtime match; if only the mtime moved (the file was copied or touched),
+    the content hash decides. Raises OSError/UnicodeDecodeError/csv.Error when the CSV can't be read.
+    """
+    csv_path = os.path.abspath(csv_path)
+    st = os.stat(csv_path)
+    signature = (st.st_size, st.st_mtime_ns)
+
+    with _lock:
+        loaded = _indexes.get(csv_path)
+        if loaded is not None and loaded[0] == signature:
+            return loaded[1]
+
+        cache_path = cache_path_for(csv_path)
+        record = read_cache(cache_path)
+        if record is not None and record["size"] == st.st_size and record["mtime_ns"] == st.st_mtime_ns:
+            index = WwiseIdIndex.from_record(record)
+        else:
+            with open(csv_path, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha1(data).hexdigest()
+            if record is not None and record["sha1"] == digest:
+                index = WwiseIdIndex.from_record(record)
+            else:
+                index = WwiseIdIndex.from_rows(*parse_csv(data))
+            # Record the size and mtime we actually read, the file may have changed since the stat
+            st = os.stat(csv_path)
+            signature = (st.st_size, st.st_mtime_ns)
+            record = index.to_record()
+            record.update(version=CACHE_VERSION, size=st.st_size, mtime_ns=st.st_mtime_ns, sha1=digest)
+            write_cache(cache_path, record)
+
+        _indexes[csv_path] = (signature, index)
+        return index
+
+
+if __name__ == "__main__":
+    # Memory and timing check against the old dict-based loaders: python -m utils.wwise_ids [CSV ...]
+    import gc
+    import sys
+    import time
+    import tracemalloc
+
+    def old_dicts(names, ids):
+        # What the Audio tab used to build per CSV: id->name and name->id, each in original and lowercase
+        id_map, id_map_lower, name_map, name_map_lower = {}, {}, {}, {}
+        for name, file_id in zip(names, ids):
+            id_map[file_id] = name
+            id_map_lower[file_id.lower()] = name
+            if name.lower() not in name_map_lower:
+                name_map[name] = file_id
+                name_map_lower[name.lower()] = file_id
+        return id_map, id_map_lower, name_map, name_map_lower
+
+    def traced(build):
+        tracemalloc.start()
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return result, size
+
+    paths = sys.argv[1:] or [
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "WWiseAudioMedia.csv"),
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "WWiseAudioLocalizedMedia.csv")
+    ]
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        start = time.perf_counter()
+        names, ids = parse_csv(data)
+        parse_time = time.perf_counter() - start
+
+        # Both sides include the strings they hold on to, the index doesn't keep the parsed rows alive
+        _, dict_size = traced(lambda: old_dicts(*parse_csv(data)))
+        index, index_size = traced(lambda: WwiseIdIndex.from_rows(*parse_csv(data)))
+        for name, file_id in zip(names, ids):
+            assert index.name_for_id(file_id) is not None and index.id_for_name(name) is not None
+
+        load_index(path)
+        _indexes.clear()
+        start = time.perf_counter()
+        load_index(path)
+        cache_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names:
+            index.id_for_name(name)
+        lookup_time = (time.perf_counter() - start) / len(names)
+
+        print(f"{os.path.basename(path)}: {len(index)} rows")
+        print(f"  old dicts: {dict_size / 1024:.0f} KiB, packed index: {index_size / 1024:.0f} KiB "
+              f"({dict_size / index_size:.1f}x smaller)")
+        print(f"  csv parse {parse_time * 1000:.1f} ms, disk cache {cache_time * 1000:.1f} ms, "
+              f"name lookup {lookup_time * 1e6:.1f} us")
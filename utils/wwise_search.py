@@ -0,0 +1,189 @@
+# utils/wwise_search.py
+import os
+import queue
+import sqlite3
+import threading
+from utils.wwise_ids import load_index
+
+# Lives next to preferences.db
+DEFAULT_SEARCH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wwise_search.db")
+
+# Bump whenever the table layout changes, older databases are rebuilt from the CSVs
+SCHEMA_VERSION = 1
+
+# The trigram tokenizer can't match anything shorter, so shorter queries are prefix searches
+MIN_SUBSTRING_LENGTH = 3
+
+
+def like_prefix(text):
+    """Escapes text for a LIKE ... ESCAPE '\\' that matches values starting with it."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def fts_phrase(text):
+    # A quoted phrase is taken literally, so punctuation in names doesn't turn into query syntax
+    return '"' + text.replace('"', '""') + '"'
+
+
+class WwiseSearchIndex:
+    """
+    Prefix and substring search over the names and IDs of the Wwise media tables, kept in a SQLite database.
+
+    Rows are stored in case-insensitive name order, so rowid order is name order and results never need
+    sorting. Prefixes are answered from NOCASE indexes on the name and ID columns, substrings of three or
+    more characters from an FTS5 trigram index over both. SQLite builds without FTS5 (or older than 3.34)
+    fall back to scanning for substrings, which is slower but gives the same results.
+    The database is only rebuilt when one of the CSVs changes.
+    """
+    def __init__(self, db_path=DEFAULT_SEARCH_PATH):
+        self.db_path = db_path
+        self.conn = None
+        self.uses_fts = False
+
+    def connect(self):
+        """Opens the database on the calling thread, creating the tables on first use."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            for table in ("entry_text", "entries", "sources"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "kind TEXT PRIMARY KEY, csv_path TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "rowid INTEGER PRIMARY KEY, kind TEXT NOT NULL, name TEXT NOT NULL COLLATE NOCASE, wwise_id TEXT NOT NULL COLLATE NOCASE)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_name ON entries (name)")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_id ON entries (wwise_id)")
+        try:
+            # External content table, the text itself is only stored once in entries
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS entry_text USING fts5("
+                "name, wwise_id, content='entries', content_rowid='rowid', tokenize='trigram')"
+            )
+            self.uses_fts = True
+        except sqlite3.OperationalError:
+            self.uses_fts = False
+        conn.commit()
+        return conn
+
+    def sync(self, sources):
+        """
+        Makes the database match the given CSVs and opens it for searching on the calling thread.
+
+        `sources` maps a kind ("Media", "Localized") to its CSV path. Returns True if the entries were rebuilt.
+        Raises the same errors as wwise_ids.load_index().
+        """
+        conn = self.connect()
+        try:
+            stored = {kind: (csv_path, size, mtime_ns) for kind, csv_path, size, mtime_ns in conn.execute("SELECT * FROM sources")}
+            current = {}
+            for kind, csv_path in sources.items():
+                csv_path = os.path.abspath(csv_path)
+                st = os.stat(csv_path)
+                current[kind] = (csv_path, st.st_size, st.st_mtime_ns)
+
+            rebuilt = stored != current
+            if rebuilt:
+                # Everything is rewritten together to keep the rows in name order across tables
+                rows = []
+                for kind, (csv_path, _, _) in current.items():
+                    # The ID index has its own cache, so a CSV the rename actions already read isn't parsed again
+                    rows.extend((kind, name, file_id) for name, file_id in load_index(csv_path).rows())
+                rows.sort(key=lambda row: (row[1].lower(), row[0]))
+
+                conn.execute("DELETE FROM entries")
+                conn.execute("DELETE FROM sources")
+                conn.executemany("INSERT INTO entries (kind, name, wwise_id) VALUES (?, ?, ?)", rows)
+                conn.executemany("INSERT INTO sources VALUES (?, ?, ?, ?)", ((kind, *info) for kind, info in current.items()))
+                if self.uses_fts:
+                    conn.execute("INSERT INTO entry_text (entry_text) VALUES ('rebuild')")
+                conn.commit()
+        except Exception:
+            conn.close()
+            raise
+
+        self.close()
+        self.conn = conn
+        return rebuilt
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def search(self, text, kind=None):
+        """
+        Returns the rowids of the entries whose name or ID starts with text, followed by those that contain it
+        anywhere (for three or more characters), each in name order. Case is ignored.
+        """
+        text = text.strip()
+        if not text:
+            return []
+        kind_filter = " AND kind = ?" if kind else ""
+        kind_params = [kind] if kind else []
+
+        pattern = like_prefix(text)
+        prefix_rowids = [
+            rowid for rowid, in self.conn.execute(
+                f"SELECT rowid FROM entries WHERE name LIKE ? ESCAPE '\\'{kind_filter} "
+                f"UNION SELECT rowid FROM entries WHERE wwise_id LIKE ? ESCAPE '\\'{kind_filter} ORDER BY rowid",
+                [pattern, *kind_params, pattern, *kind_params]
+            )
+        ]
+        if len(text) < MIN_SUBSTRING_LENGTH:
+            return prefix_rowids
+
+        if self.uses_fts and not kind:
+            sql = "SELECT rowid AS entry FROM entry_text WHERE entry_text MATCH ?"
+            params = [fts_phrase(text)]
+        elif self.uses_fts:
+            sql = "SELECT entries.rowid AS entry FROM entry_text JOIN entries ON entries.rowid = entry_text.rowid WHERE entry_text MATCH ?"
+            params = [fts_phrase(text)]
+        else:
+            pattern = "%" + pattern
+            sql = "SELECT rowid AS entry FROM entries WHERE (name LIKE ? ESCAPE '\\' OR wwise_id LIKE ? ESCAPE '\\')"
+            params = [pattern, pattern]
+        sql += f"{kind_filter} ORDER BY entry"
+        params += kind_params
+        prefixed = set(prefix_rowids)
+        return prefix_rowids + [rowid for rowid, in self.conn.execute(sql, params) if rowid not in prefixed]
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def fetch(self, rowids):
+        """Returns {rowid: (kind, name, wwise_id)} for the given rowids, used to fill the visible rows of a result list."""
+        rowids = list(rowids)
+        if not rowids:
+            return {}
+        placeholders = ",".join("?" * len(rowids))
+        rows = self.conn.execute(f"SELECT rowid, kind, name, wwise_id FROM entries WHERE rowid IN ({placeholders})", rowids)
+        return {rowid: (kind, name, wwise_id) for rowid, kind, name, wwise_id in rows}
+
+
+class SearchIndexWorker(threading.Thread):
+    """
+    Brings the search database up to date on a background thread, since a rebuild takes about half a second.
+
+    Messages are ("done", rebuilt) or ("error", message). The caller then calls sync() on its own
+    WwiseSearchIndex, which finds the database current and only opens it.
+    """
+    def __init__(self, sources, db_path=DEFAULT_SEARCH_PATH):
+        super().__init__(daemon=True)
+        self.sources = dict(sources)
+        self.db_path = db_path
+        self.queue = queue.Queue()
+
+    def run(self):
+        index = WwiseSearchIndex(self.db_path)
+        try:
+            rebuilt = index.sync(self.sources)
+        except Exception as e:
+            self.queue.put(("error", str(e)))
+            return
+        finally:
+            index.close()
+        self.queue.put(("done", rebuilt))
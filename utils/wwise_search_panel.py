@@ -0,0 +1,191 @@
+# utils/wwise_search_panel.py
+import time
+import queue
+import logging
+import tkinter as tk
+from tkinter import ttk
+from utils.tooltip import ToolTip
+from utils.virtual_list import VirtualList
+from utils.wwise_search import WwiseSearchIndex, SearchIndexWorker
+
+ALL_TABLES = "All"
+
+
+class WwiseSearchPanel(ttk.Frame):
+    """
+    Search-as-you-type over the names and IDs of the Wwise media tables.
+
+    A search only returns rowids from the WwiseSearchIndex; the names and IDs are fetched for the rows in
+    view as the result list scrolls. `on_rename(entry, to_id)` is called by the rename buttons with the
+    selected (kind, name, wwise_id) entry, since the tab owns the work folder and the rename journal.
+    """
+    def __init__(self, parent, on_rename=None, **kwargs):
+        super().__init__(parent, style='TFrame', **kwargs)
+        self.on_rename = on_rename
+        self.search_index = WwiseSearchIndex()
+        self.sources = {}
+        self.worker = None
+        # Sources asked for while a rebuild was already running
+        self.pending_sources = None
+        self.results = []
+        # rowid -> (kind, name, wwise_id) for the rows fetched since the last search
+        self.entries = {}
+
+        self.query_var = tk.StringVar()
+        self.table_var = tk.StringVar(value=ALL_TABLES)
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        toolbar = ttk.Frame(self, style='TFrame')
+        toolbar.pack(fill='x', pady=(0, 5))
+
+        ttk.Label(toolbar, text="Search:", style='TLabel').pack(side='left', padx=(0, 5))
+        self.search_entry = ttk.Entry(toolbar, textvariable=self.query_var, width=30, style='TEntry')
+        self.search_entry.pack(side='left', padx=(0, 10))
+        self.search_entry.bind("<Down>", self.focus_results)
+        ToolTip(self.search_entry, "Type part of a name or Wwise ID. Names starting with the text are listed first.")
+
+        ttk.Label(toolbar, text="Table:", style='TLabel').pack(side='left', padx=(0, 5))
+        table_combobox = ttk.Combobox(toolbar, textvariable=self.table_var, state='readonly', width=10, style='TCombobox')
+        table_combobox['values'] = (ALL_TABLES, "Media", "Localized")
+        table_combobox.pack(side='left', padx=(0, 10))
+        table_combobox.bind("<<ComboboxSelected>>", lambda e: self.run_search())
+
+        self.match_label = ttk.Label(toolbar, text="", style='TLabel', foreground="#999999")
+        self.match_label.pack(side='left')
+
+        self.results_list = VirtualList(self, columns=(
+            ("name", "Name", 260, 'w', True),
+            ("wwise_id", "Wwise Id", 100, 'w', False),
+            ("kind", "Table", 80, 'w', False)
+        ), fetch_rows=self.fetch_rows)
+        self.results_list.pack(fill='both', expand=True)
+        self.results_list.bind("<<VirtualListSelect>>", lambda e: self.update_buttons())
+        self.results_list.bind("<<VirtualListActivate>>", lambda e: self.copy_field(2))
+
+        button_frame = ttk.Frame(self, style='TFrame')
+        button_frame.pack(fill='x', pady=(5, 0))
+
+        self.copy_name_button = ttk.Button(button_frame, text="Copy Name", command=lambda: self.copy_field(1), style='TButton', state='disabled')
+        self.copy_name_button.pack(side='left', padx=(0, 5))
+        self.copy_id_button = ttk.Button(button_frame, text="Copy ID", command=lambda: self.copy_field(2), style='TButton', state='disabled')
+        self.copy_id_button.pack(side='left', padx=(0, 5))
+        ToolTip(self.copy_id_button, "Copy the Wwise ID of the selected entry. Double-clicking a result does the same.")
+
+        self.rename_to_name_button = ttk.Button(button_frame, text="Rename File to Name...", command=lambda: self.rename_selected(False), style='TButton', state='disabled')
+        self.rename_to_name_button.pack(side='left', padx=(0, 5))
+        self.rename_to_id_button = ttk.Button(button_frame, text="Rename File to ID...", command=lambda: self.rename_selected(True), style='TButton', state='disabled')
+        self.rename_to_id_button.pack(side='left')
+        ToolTip(self.rename_to_id_button, "Pick an audio file and give it, and its .uasset/.uexp/.ubulk siblings, the ID of the selected entry.")
+
+        self.query_var.trace_add("write", lambda *args: self.run_search())
+
+    # --- Index ---
+
+    def load(self, sources):
+        """Brings the search index up to date for {kind: csv_path} in the background, then searches again."""
+        if self.worker is not None:
+            self.pending_sources = dict(sources)
+            return
+        self.sources = dict(sources)
+        if not self.sources:
+            self.search_index.close()
+            self.results = []
+            self.results_list.set_count(0)
+            self.match_label.config(text="No CSV selected.")
+            return
+        self.match_label.config(text="Building search index...")
+        self.worker = SearchIndexWorker(self.sources, self.search_index.db_path)
+        self.worker.start()
+        self.after(100, self.poll_worker)
+
+    def poll_worker(self):
+        try:
+            message = self.worker.queue.get_nowait()
+        except queue.Empty:
+            self.after(100, self.poll_worker)
+            return
+        self.worker = None
+
+        try:
+            if message[0] == "error":
+                raise RuntimeError(message[1])
+            # Already current, this only opens the database on the Tk thread
+            self.search_index.sync(self.sources)
+        except Exception as e:
+            self.search_index.close()
+            self.match_label.config(text="Search index unavailable.")
+            logging.error(f"Could not build the Wwise search index: {e}")
+        else:
+            self.run_search()
+
+        if self.pending_sources is not None:
+            sources, self.pending_sources = self.pending_sources, None
+            self.load(sources)
+
+    # --- Searching ---
+
+    def run_search(self):
+        if self.search_index.conn is None:
+            return
+        query = self.query_var.get()
+        table = self.table_var.get()
+        start = time.perf_counter()
+        self.results = self.search_index.search(query, None if table == ALL_TABLES else table)
+        elapsed = time.perf_counter() - start
+
+        self.entries = {}
+        self.results_list.set_count(len(self.results))
+        if query.strip():
+            self.match_label.config(text=f"{len(self.results)} matches ({elapsed * 1000:.1f} ms)")
+        else:
+            self.match_label.config(text=f"{self.search_index.count()} entries")
+        self.update_buttons()
+
+    def fetch_rows(self, start, stop):
+        rowids = self.results[start:stop]
+        missing = [rowid for rowid in rowids if rowid not in self.entries]
+        if missing:
+            self.entries.update(self.search_index.fetch(missing))
+        return [(name, wwise_id, kind) for kind, name, wwise_id in (self.entries[rowid] for rowid in rowids)]
+
+    def selected_entry(self):
+        """Returns the selected (kind, name, wwise_id) entry, or None."""
+        index = self.results_list.selected_index()
+        if index is None or index >= len(self.results):
+            return None
+        rowid = self.results[index]
+        if rowid not in self.entries:
+            self.entries.update(self.search_index.fetch([rowid]))
+        return self.entries[rowid]
+
+    # --- Actions ---
+
+    def focus_results(self, event=None):
+        if self.results:
+            self.results_list.tree.focus_set()
+            self.results_list.move_selection(0)
+        return "break"
+
+    def update_buttons(self):
+        state = 'normal' if self.selected_entry() else 'disabled'
+        for button in (self.copy_name_button, self.copy_id_button):
+            button.config(state=state)
+        rename_state = state if self.on_rename else 'disabled'
+        for button in (self.rename_to_name_button, self.rename_to_id_button):
+            button.config(state=rename_state)
+
+    def copy_field(self, field):
+        """Copies the name (1) or Wwise ID (2) of the selected entry to the clipboard."""
+        entry = self.selected_entry()
+        if entry is None:
+            return
+        self.clipboard_clear()
+        self.clipboard_append(entry[field])
+        self.match_label.config(text=f"Copied {entry[field]}")
+
+    def rename_selected(self, to_id):
+        entry = self.selected_entry()
+        if entry is not None and self.on_rename:
+            self.on_rename(entry, to_id)